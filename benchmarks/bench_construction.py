@@ -0,0 +1,32 @@
+""" `Kronos.__init__` from strings, datetimes and named ranges. """
+from datetime import datetime
+
+import pytest
+
+from kronos import Kronos, ISO_FMT
+from kronos.utilities import make_timezone, localize
+
+pytestmark = pytest.mark.benchmark(group='construction')
+
+
+def bench_init_from_strings(benchmark, zone, backend):
+    benchmark(Kronos, '2022-03-01', '2022-11-30', timezone=zone, backend=backend)
+
+
+def bench_init_from_strings_with_time(benchmark):
+    benchmark(Kronos, '2022-03-01 06:30:00', '2022-11-30 18:00:00', timezone='America/New_York', date_format=ISO_FMT)
+
+
+def bench_init_from_naive_datetimes(benchmark, zone, backend):
+    benchmark(Kronos, datetime(2022, 3, 1), datetime(2022, 11, 30), timezone=zone, backend=backend)
+
+
+def bench_init_from_aware_datetimes(benchmark, backend):
+    tz = make_timezone('America/New_York', backend=backend)
+    start, end = localize(datetime(2022, 3, 1), tz), localize(datetime(2022, 11, 30), tz)
+    benchmark(Kronos, start, end)
+
+
+@pytest.mark.parametrize('named_range', ['LATEST', 'LAST_30_DAYS', 'MTD', 'LAST_MONTH', 'THIS_WEEK__MON'])
+def bench_init_from_named_range(benchmark, named_range):
+    benchmark(Kronos, named_range=named_range, timezone='America/New_York')
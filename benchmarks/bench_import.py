@@ -0,0 +1,33 @@
+""" Import cost of `from kronos import Kronos`, for short-lived processes that pay it on every start. """
+import subprocess
+import sys
+
+import pytest
+
+pytestmark = pytest.mark.benchmark(group='import')
+
+# cumulative `python -X importtime` budget, in microseconds, for everything `from kronos import Kronos` imports
+IMPORT_BUDGET_US = 60000
+
+# modules that must stay out of a plain `from kronos import Kronos` -- loaded only by the features that use them
+LAZY_MODULES = ['asyncio', 'concurrent.futures', 'sqlite3', 'dateutil.rrule', 'dateutil.relativedelta', 'numpy', 'zoneinfo']
+
+_SCRIPT = 'import sys; from kronos import Kronos; print(",".join(sorted(sys.modules)))'
+
+
+def _import_kronos():
+    """ Import kronos in a fresh interpreter. Returns (cumulative import time in microseconds, loaded module names). """
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', _SCRIPT], capture_output=True, text=True, check=True)
+    lines = [line for line in result.stderr.splitlines() if line.startswith('import time:') and '|' in line]
+    # everything after interpreter startup (which ends with `site`), counting only top-level imports
+    start = max(i for i, line in enumerate(lines) if line.rsplit('|', 1)[1].strip() == 'site') + 1
+    total = sum(int(line.split('|')[1]) for line in lines[start:] if not line.rsplit('|', 1)[1].startswith('  '))
+    return total, set(result.stdout.strip().split(','))
+
+
+def bench_import_kronos(benchmark):
+    results = benchmark.pedantic(_import_kronos, rounds=5)
+    total, modules = results
+
+    assert total < IMPORT_BUDGET_US, f'importing kronos took {total}us (budget {IMPORT_BUDGET_US}us)'
+    assert not modules.intersection(LAZY_MODULES)
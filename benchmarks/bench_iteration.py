@@ -0,0 +1,58 @@
+""" Partition generators and `list_date_range` over 1-10 years, with the pre-0.0.15 `day_range` as a baseline. """
+import pytest
+from dateutil.rrule import rrule, DAILY
+
+from kronos import Kronos
+
+pytestmark = pytest.mark.benchmark(group='iteration')
+
+
+def legacy_day_range(kronos: Kronos):
+    """ The pre-0.0.15 `day_range`: strftime every day, then re-parse it through `Kronos.__init__`. """
+    for day in rrule(DAILY, dtstart=kronos._start_date, until=kronos._end_date):
+        day = day.replace(tzinfo=kronos.tz)
+        if day.date() > kronos._end_date.date():
+            continue
+        if day.strftime(kronos.date_format) == kronos.start_date:
+            ed = day.replace(hour=23, minute=59, second=59, microsecond=999999)
+            yield kronos.__class__(day.strftime(kronos.date_format), ed.strftime(kronos.date_format), date_format=kronos.date_format, timezone=kronos.tz)
+        elif day.strftime('%Y-%m-%d') == kronos.format_end('%Y-%m-%d'):
+            sd = day.replace(hour=0, minute=0, second=0, microsecond=0)
+            ed = day.replace(hour=kronos._end_date.hour, minute=kronos._end_date.minute, second=kronos._end_date.second, microsecond=kronos._end_date.microsecond)
+            yield kronos.__class__(sd.strftime(kronos.date_format), ed.strftime(kronos.date_format), date_format=kronos.date_format, timezone=kronos.tz)
+        else:
+            sd = day.replace(hour=0, minute=0, second=0, microsecond=0)
+            ed = day.replace(hour=23, minute=59, second=59, microsecond=999999)
+            yield kronos.__class__(sd.strftime(kronos.date_format), ed.strftime(kronos.date_format), date_format=kronos.date_format, timezone=kronos.tz)
+
+
+def _consume(iterable):
+    for _ in iterable:
+        pass
+
+
+def bench_day_range(benchmark, multi_year_range):
+    benchmark(lambda: _consume(multi_year_range.day_range()))
+
+
+def bench_day_range_legacy(benchmark, multi_year_range):
+    benchmark.pedantic(lambda: _consume(legacy_day_range(multi_year_range)), rounds=3)
+
+
+def bench_list_date_range(benchmark, multi_year_range):
+    benchmark(multi_year_range.list_date_range)
+
+
+@pytest.mark.parametrize('granularity', ['week', 'month'])
+def bench_coarse_partitions(benchmark, multi_year_range, granularity):
+    benchmark(lambda: _consume(multi_year_range._iter_partitions(granularity)))
+
+
+def bench_hour_range_one_year(benchmark):
+    kronos = Kronos('2022-01-01', '2022-12-31', timezone='America/New_York')
+    benchmark(lambda: _consume(kronos.hour_range()))
+
+
+def bench_boundaries(benchmark, multi_year_range):
+    pytest.importorskip('numpy')
+    benchmark(multi_year_range.boundaries)
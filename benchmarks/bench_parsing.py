@@ -0,0 +1,59 @@
+""" String and timestamp conversion: `parse_and_localize`, `convert_date`, `from_timestamp` and their bulk versions. """
+from datetime import datetime, timedelta
+
+import pytest
+import pytz
+
+from kronos import Kronos
+
+pytestmark = pytest.mark.benchmark(group='parsing')
+
+ISO_MICROS = '%Y-%m-%dT%H:%M:%S.%fZ'
+VALUES = [(datetime(2023, 1, 1) + timedelta(seconds=37 * i)).strftime(ISO_MICROS) for i in range(10000)]
+TIMESTAMPS = [1672531200 + 37 * i for i in range(10000)]
+
+
+@pytest.mark.parametrize('date_format', ['%Y-%m-%d', '%Y-%m-%d %H:%M:%S', ISO_MICROS, '%d %b %Y'])
+def bench_parse_and_localize(benchmark, date_format):
+    value = datetime(2023, 3, 12, 6, 30).strftime(date_format)
+    kronos = Kronos('2023-01-01', '2023-01-01', timezone='UTC')
+    benchmark(kronos.parse_and_localize, value, date_format, in_tz='UTC', out_tz='America/New_York')
+
+
+def bench_convert_date(benchmark):
+    benchmark(Kronos.convert_date, '2023-03-12 06:30:00', '%Y-%m-%d %H:%M:%S', '%m/%d/%Y %I:%M %p')
+
+
+def bench_from_timestamp(benchmark, zone):
+    benchmark(Kronos.from_timestamp, 1678602600, in_timezone='UTC', out_timezone=zone)
+
+
+def bench_parse_many(benchmark):
+    benchmark(Kronos.parse_many, VALUES, ISO_MICROS, in_tz='UTC', out_tz='America/New_York')
+
+
+def bench_convert_dates(benchmark):
+    benchmark(lambda: list(Kronos.convert_dates(VALUES, ISO_MICROS, '%Y-%m-%d')))
+
+
+def bench_from_timestamps(benchmark, zone):
+    pytest.importorskip('numpy')
+    benchmark(Kronos.from_timestamps, TIMESTAMPS, tz=zone)
+
+
+@pytest.mark.parametrize('date_format', ['%Y-%m-%d', '%Y-%m-%d %H:%M:%S', ISO_MICROS, '%d %b %Y'])
+def bench_compiled_formatter(benchmark, date_format):
+    from kronos.formats import compile_formatter
+
+    value = datetime(2023, 3, 12, 6, 30)
+    benchmark(compile_formatter(date_format).format, value)
+
+
+@pytest.mark.parametrize('date_format', ['%Y-%m-%d %H:%M:%S', ISO_MICROS, '%d %b %Y %I:%M %p'])
+def bench_format_many(benchmark, zone, date_format):
+    benchmark(Kronos.format_many, TIMESTAMPS, date_format, tz=zone)
+
+
+def bench_format_many_strftime(benchmark, zone):
+    tz = pytz.timezone(zone)
+    benchmark(lambda: [datetime.fromtimestamp(ts, tz).strftime('%Y-%m-%d %H:%M:%S') for ts in TIMESTAMPS])
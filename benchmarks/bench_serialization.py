@@ -0,0 +1,32 @@
+""" Shipping ranges between processes: the `encode_ranges` wire format against pickle, for a year of day partitions. """
+import pickle
+
+import pytest
+
+from kronos import Kronos, encode_ranges, decode_ranges
+
+pytestmark = pytest.mark.benchmark(group='serialization')
+
+DAYS = list(Kronos('2023-01-01', '2023-12-31', timezone='America/New_York').day_range())
+PAYLOAD = encode_ranges(DAYS)
+PICKLED = pickle.dumps(DAYS)
+
+
+def bench_encode_ranges(benchmark):
+    benchmark(encode_ranges, DAYS)
+
+
+def bench_decode_ranges(benchmark):
+    benchmark(decode_ranges, PAYLOAD)
+
+
+def bench_decode_as_ranges(benchmark):
+    benchmark(decode_ranges, PAYLOAD, as_ranges=True)
+
+
+def bench_pickle_dumps(benchmark):
+    benchmark(pickle.dumps, DAYS)
+
+
+def bench_pickle_loads(benchmark):
+    benchmark(pickle.loads, PICKLED)
@@ -0,0 +1,39 @@
+""" Timezone paths across DST-heavy zones: shifting bounds, changing and converting timezones. """
+from datetime import datetime, timedelta
+
+import pytest
+
+from kronos import Kronos, convert_timezone, convert_timezone_many
+from kronos.utilities import make_timezone
+
+pytestmark = pytest.mark.benchmark(group='timezones')
+
+WALL_TIMES = [datetime(2023, 1, 1) + timedelta(minutes=17 * i) for i in range(10000)]
+
+
+@pytest.fixture
+def dst_day(zone, backend):
+    """ A range spanning the 2023 spring-forward transition of each zone (or an ordinary day for UTC). """
+    return Kronos('2023-03-11', '2023-04-02', timezone=zone, backend=backend)
+
+
+def bench_shift_start_tz(benchmark, dst_day):
+    benchmark(dst_day.shift_start_tz, 'Asia/Kolkata')
+
+
+def bench_shift_end_tz(benchmark, dst_day):
+    benchmark(dst_day.shift_end_tz, 'Asia/Kolkata')
+
+
+def bench_change_timezone(benchmark, dst_day):
+    benchmark(dst_day.change_timezone, 'Europe/Berlin')
+
+
+def bench_convert_timezone(benchmark, zone, backend):
+    in_tz, out_tz = make_timezone(zone, backend=backend), make_timezone('UTC', backend=backend)
+    benchmark(convert_timezone, datetime(2023, 3, 26, 1, 30), in_tz=in_tz, out_tz=out_tz)
+
+
+def bench_convert_timezone_many(benchmark, zone, backend):
+    in_tz, out_tz = make_timezone(zone, backend=backend), make_timezone('UTC', backend=backend)
+    benchmark(convert_timezone_many, WALL_TIMES, in_tz, out_tz)
@@ -0,0 +1,26 @@
+""" Shared inputs for the benchmark suite. Run it with `nox -s benchmarks` or `inv benchmarks`. """
+import pytest
+
+from kronos import Kronos
+
+# zones with frequent or unusual DST transitions, plus a fixed-offset baseline
+DST_ZONES = ['UTC', 'America/New_York', 'Europe/London', 'Australia/Lord_Howe', 'America/Sao_Paulo']
+YEARS = [1, 5, 10]
+BACKENDS = ['pytz', 'zoneinfo']
+
+
+@pytest.fixture(params=BACKENDS)
+def backend(request):
+    """ Each timezone backend, so both go through the same benchmarks. """
+    return request.param
+
+
+@pytest.fixture(params=YEARS, ids=lambda years: f'{years}y')
+def multi_year_range(request, backend):
+    """ A range of 1, 5 or 10 years in America/New_York. """
+    return Kronos('2013-01-01', f'{2012 + request.param}-12-31', timezone='America/New_York', backend=backend)
+
+
+@pytest.fixture(params=DST_ZONES)
+def zone(request):
+    return request.param
@@ -74,6 +74,14 @@ def mypy(session: Session) -> None:
     session.run("inv", "mypy")
 
 
+@nox.session(python="3.10")
+def benchmarks(session: Session) -> None:
+    """Run the benchmark suite, saving results as JSON under .benchmarks/."""
+    session.install(".[numpy]")
+    install_with_constraints(session, "invoke", "pytest", "pytest-benchmark")
+    session.run("inv", "benchmarks", *session.posargs)
+
+
 @nox.session(python="3.10")
 def safety(session: Session) -> None:
     """Scan dependencies for insecure packages."""
@@ -4,5 +4,41 @@ __author__ = """Nick Tulli"""
 __email__ = "ntulli.dev@gmail.com"
 __version__ = "0.0.14"
 
-from .kronos import Kronos, DEFAULT_FORMAT, DEFAULT_TZ, ISO_FMT
-from .utilities import convert_timezone
+from importlib import import_module
+
+# public names and the submodules they live in. imported on first access (PEP 562), so `import kronos` stays cheap
+# and e.g. sqlite3 is only loaded by code that uses `Backfill`
+_EXPORTS = {
+    'Kronos': '.kronos',
+    'DEFAULT_FORMAT': '.kronos',
+    'DEFAULT_TZ': '.kronos',
+    'ISO_FMT': '.kronos',
+    'DateRange': '.ranges',
+    'DateRangeSet': '.ranges',
+    'HolidayCalendar': '.calendars',
+    'Backfill': '.backfill',
+    'convert_timezone': '.utilities',
+    'convert_timezone_many': '.utilities',
+    'register_named_range': '.utilities',
+    'set_default_backend': '.backends',
+    'encode_ranges': '.serialization',
+    'decode_ranges': '.serialization',
+    'FrozenClock': '.clock',
+    'set_clock': '.clock',
+    'snapshot': '.clock',
+    'use_clock': '.clock',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        value = getattr(import_module(_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,24 @@
+""" Helpers for optional dependencies. """
+
+
+def import_numpy():
+    """ Import numpy, an optional dependency needed by the array-based APIs. """
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError('This feature requires numpy. Install it with `pip install kronos-daterange[numpy]`.') from None
+    return numpy
+
+
+def import_zoneinfo():
+    """ Import zoneinfo (standard library from Python 3.9, `backports.zoneinfo` before), for the zoneinfo timezone
+    backend. """
+    try:
+        import zoneinfo
+    except ImportError:
+        try:
+            from backports import zoneinfo
+        except ImportError:
+            raise ImportError('The zoneinfo backend requires Python 3.9+ or backports.zoneinfo. Install it with '
+                              '`pip install kronos-daterange[zoneinfo]`.') from None
+    return zoneinfo
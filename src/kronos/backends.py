@@ -0,0 +1,179 @@
+""" Timezone backends: where timezone objects come from and how naive wall times are attached to them. `pytz` is the
+default; `zoneinfo` (the standard library's, or `backports.zoneinfo` before Python 3.9) is the alternative. Pick one
+per call (`make_timezone(name, backend='zoneinfo')`, `Kronos(..., backend='zoneinfo')`) or globally with
+`set_default_backend` / the `KRONOS_TZ_BACKEND` environment variable. """
+from __future__ import annotations
+
+import os
+from datetime import datetime, tzinfo
+from functools import lru_cache
+from typing import Dict, Optional
+
+import pytz
+from pytz.exceptions import AmbiguousTimeError
+
+from ._compat import import_zoneinfo
+from .transitions import transition_table
+
+TIMEZONE_CACHE_SIZE = 128
+
+
+class TimezoneBackend(object):
+    """ A source of timezone objects. The base class also serves tzinfo objects no backend owns (`datetime.timezone`,
+    dateutil zones, ...): they are localized through their transition tables and cannot be created from a name.
+    """
+
+    name: Optional[str] = None
+
+    def timezone(self, name: str) -> tzinfo:
+        """ Get the timezone called `name` (an IANA name such as "America/New_York").
+
+        :raises KeyError: if the zone does not exist
+        :raises TypeError: for the generic backend, which cannot create timezones from a name
+        """
+        raise TypeError(f'{type(self).__name__} cannot create timezones from a name')
+
+    def owns(self, tz: tzinfo) -> bool:
+        """ Whether `tz` was made by this backend. """
+        return False
+
+    def iana_name(self, tz: tzinfo) -> Optional[str]:
+        """ IANA name of a timezone made by this backend, or None if it has none (e.g. `pytz.FixedOffset(60)`). """
+        return None
+
+    def zone_name(self, tz: tzinfo) -> str:
+        """ Name of a timezone made by this backend: its IANA name, else `str(tz)`. """
+        name = self.iana_name(tz)
+        return name if name is not None else str(tz)
+
+    def localize(self, naive: datetime, tz: tzinfo, ambiguous: str = 'latest') -> datetime:
+        """ Attach `tz` to a naive wall time. Wall times that fall into a DST gap are shifted forward by the length of
+        the gap; repeated wall times resolve according to `ambiguous` ("earliest", "latest" or "raise").
+
+        :param naive: a timezone-unaware datetime object
+        :type naive: datetime
+        :param tz: a timezone made by this backend
+        :type tz: tzinfo
+        :param ambiguous: which occurrence of a repeated wall time to use, defaults to "latest"
+        :type ambiguous: str, optional
+        :return: a localized datetime object
+        :rtype: datetime
+        """
+        return transition_table(tz).localize(naive, ambiguous=ambiguous)
+
+
+class PytzBackend(TimezoneBackend):
+    """ pytz zones. Each UTC offset of a zone is its own tzinfo object, so localized datetimes carry their offset and
+    aware arithmetic must go through `normalize`. """
+
+    name = 'pytz'
+
+    def timezone(self, name: str) -> pytz.BaseTzInfo:
+        return _resolve_timezone(name)
+
+    def owns(self, tz: tzinfo) -> bool:
+        return isinstance(tz, pytz.BaseTzInfo)
+
+    def iana_name(self, tz: pytz.BaseTzInfo) -> Optional[str]:
+        return tz.zone
+
+    def localize(self, naive: datetime, tz: pytz.BaseTzInfo, ambiguous: str = 'latest') -> datetime:
+        if isinstance(tz, pytz.tzinfo.DstTzInfo):
+            return transition_table(tz).localize(naive, ambiguous=ambiguous)
+        return naive.replace(tzinfo=tz)
+
+
+class ZoneInfoBackend(TimezoneBackend):
+    """ PEP 615 zones. One tzinfo object per zone (cached by the `ZoneInfo` constructor itself), with the second
+    occurrence of a repeated wall time told apart by `fold=1` rather than by a different tzinfo. Needs Python 3.9+ or
+    `backports.zoneinfo`. """
+
+    name = 'zoneinfo'
+
+    def timezone(self, name: str) -> tzinfo:
+        return import_zoneinfo().ZoneInfo(name)
+
+    def owns(self, tz: tzinfo) -> bool:
+        try:
+            return isinstance(tz, import_zoneinfo().ZoneInfo)
+        except ImportError:
+            return False
+
+    def iana_name(self, tz: tzinfo) -> Optional[str]:
+        # None for zones read with `ZoneInfo.from_file`
+        return getattr(tz, 'key', None)
+
+    def localize(self, naive: datetime, tz: tzinfo, ambiguous: str = 'latest') -> datetime:
+        earliest = naive.replace(tzinfo=tz)
+        latest = naive.replace(tzinfo=tz, fold=1)
+        offset, later_offset = earliest.utcoffset(), latest.utcoffset()
+        if offset is None or later_offset is None or offset == later_offset:
+            return earliest
+        if offset < later_offset:
+            # in a DST gap, where fold=0 reads the wall time with the offset from before the transition
+            return (naive + (later_offset - offset)).replace(tzinfo=tz)
+        if ambiguous == 'raise':
+            raise AmbiguousTimeError(f'{naive} is ambiguous')
+        return earliest if ambiguous == 'earliest' else latest
+
+
+@lru_cache(maxsize=TIMEZONE_CACHE_SIZE)
+def _resolve_timezone(name: str) -> pytz.BaseTzInfo:
+    """ Cached `pytz.timezone(name)`. Unknown names raise (and are not cached). """
+    return pytz.timezone(name)
+
+
+BACKENDS: Dict[str, TimezoneBackend] = {backend.name: backend for backend in (PytzBackend(), ZoneInfoBackend())}
+
+# tzinfo objects no backend owns
+GENERIC_BACKEND = TimezoneBackend()
+
+_default_backend = os.environ.get('KRONOS_TZ_BACKEND', 'pytz')
+
+# tzinfo type -> backend that owns it, filled in by `backend_of` (pytz has a class per zone, so this stays small)
+_backends_by_type: Dict[type, TimezoneBackend] = {}
+
+
+def get_backend(name: str = None) -> TimezoneBackend:
+    """ Get a backend by name.
+
+    :param name: "pytz" or "zoneinfo", defaults to the default backend (see `set_default_backend`)
+    :type name: str, optional
+    :raises ValueError: if the backend is not recognized
+    :return: the backend
+    :rtype: TimezoneBackend
+    """
+    name = name or _default_backend
+    try:
+        return BACKENDS[name]
+    except KeyError:
+        raise ValueError(f'`backend` must be one of {list(BACKENDS)}. You sent: `{name}`') from None
+
+
+def set_default_backend(name: str):
+    """ Set the backend used when none is given. Initially read from `KRONOS_TZ_BACKEND` (defaults to "pytz").
+
+    :param name: "pytz" or "zoneinfo"
+    :type name: str
+    :raises ValueError: if the backend is not recognized
+    """
+    global _default_backend
+    get_backend(name)
+    _default_backend = name
+
+
+def backend_of(tz: tzinfo) -> TimezoneBackend:
+    """ Get the backend that made a timezone object, or `GENERIC_BACKEND` for tzinfo objects no backend owns. Cached by
+    type. """
+    try:
+        return _backends_by_type[type(tz)]
+    except KeyError:
+        pass
+    backend = next((backend for backend in BACKENDS.values() if backend.owns(tz)), GENERIC_BACKEND)
+    _backends_by_type[type(tz)] = backend
+    return backend
+
+
+def zone_name(tz: tzinfo) -> str:
+    """ Name of a timezone object: the IANA name for pytz and zoneinfo zones, `str(tz)` for anything else. """
+    return backend_of(tz).zone_name(tz)
@@ -0,0 +1,207 @@
+""" Resumable backfills: the partitions of a Kronos range tracked in a local SQLite file, so a crashed run picks up
+where it left off and several workers can share one backfill without doing a partition twice. """
+from __future__ import annotations
+
+import os
+import socket
+import sqlite3
+import time
+from typing import Union, Generator, Tuple, Optional
+
+from .kronos import Kronos
+from .partitions import iter_bounds
+from .ranges import DateRange, timezone_key
+from .utilities import to_epoch_us
+
+# a claimed partition whose worker has not finished it within this many seconds is up for grabs again
+DEFAULT_LEASE_SECONDS = 600
+# how often a worker waiting for partitions claimed elsewhere looks at the store again, in seconds
+POLL_SECONDS = 1.0
+
+_SCHEMA = (
+    '''CREATE TABLE IF NOT EXISTS partitions (
+        job TEXT NOT NULL,
+        start_us INTEGER NOT NULL,
+        end_us INTEGER NOT NULL,
+        status TEXT NOT NULL DEFAULT 'pending',
+        worker TEXT,
+        claimed_at REAL,
+        PRIMARY KEY (job, start_us)
+    )''',
+    'CREATE INDEX IF NOT EXISTS partitions_by_status ON partitions (job, status, start_us)',
+)
+
+
+class Backfill(object):
+    """ Iterate the partitions of a Kronos range, recording each one as it completes in a SQLite file. Re-creating a
+    backfill for the same range (same bounds, timezone and granularity) and store resumes it: finished partitions are
+    skipped without being looked at.
+
+    Partitions are handed out by atomically claiming the earliest pending one, so any number of processes can work
+    through the same backfill at once::
+
+        backfill = Backfill(Kronos('2023-01-01', '2023-01-31'), store='progress.db')
+        for day in backfill:
+            export(day)  # `day` is marked done when the loop comes back for the next one
+
+    A partition is only marked done once the loop body finishes with it; if the body raises or the loop is left early,
+    the partition is released for the next run. If the process dies instead, its partition becomes available again
+    after `lease_seconds`. Only the worker holding a claim can complete or release it, so a worker whose lease ran out
+    cannot overwrite the one that took over. Iteration ends once every partition is done, waiting for partitions other
+    workers hold if need be.
+    """
+
+    def __init__(self, kronos: Kronos, store: str = 'progress.db', granularity: str = 'day',
+                 week_start: Union[int, str] = 'MON', job: str = None, worker: str = None,
+                 lease_seconds: float = DEFAULT_LEASE_SECONDS):
+        """ Open (or create) the progress store and register the range's partitions.
+
+        :param kronos: the range to backfill
+        :type kronos: Kronos
+        :param store: path of the SQLite file, defaults to 'progress.db'
+        :type store: str, optional
+        :param granularity: one of "hour", "day", "week", "month" or "quarter", defaults to "day"
+        :type granularity: str, optional
+        :param week_start: first day of the week for "week", as an int (Monday is 0) or abbreviation. defaults to "MON"
+        :type week_start: Union[int, str], optional
+        :param job: name the backfill's progress is stored under. defaults to one derived from the range and granularity
+        :type job: str, optional
+        :param worker: name recorded against claimed partitions, defaults to "<hostname>:<pid>"
+        :type worker: str, optional
+        :param lease_seconds: seconds after which an unfinished claim can be taken over, defaults to 600
+        :type lease_seconds: float, optional
+        """
+        self.kronos = kronos
+        self.granularity = granularity
+        self.tz = timezone_key(kronos.tz)
+        self.job = job or f'{self.tz}:{to_epoch_us(kronos._start_date)}:{to_epoch_us(kronos._end_date)}:{granularity}'
+        self.worker = worker or f'{socket.gethostname()}:{os.getpid()}'
+        self.lease_seconds = lease_seconds
+
+        # autocommit mode -- transactions are opened explicitly where they matter
+        self._connection = sqlite3.connect(store, timeout=30, isolation_level=None)
+        for statement in _SCHEMA:
+            self._connection.execute(statement)
+        bounds = ((self.job, to_epoch_us(start), to_epoch_us(end))
+                  for start, end in iter_bounds(kronos._start_date, kronos._end_date, kronos.tz, granularity, week_start))
+        with self._transaction():
+            self._connection.executemany('INSERT OR IGNORE INTO partitions (job, start_us, end_us) VALUES (?, ?, ?)', bounds)
+
+    def _transaction(self):
+        """ Context manager for a write transaction that takes the database lock up front. """
+        return _Transaction(self._connection)
+
+    def _partition(self, start_us: int, end_us: int) -> Kronos:
+        return Kronos.from_range(DateRange(start_us, end_us, self.tz), self.kronos.date_format)
+
+    def claim(self, timeout: float = None) -> Optional[Kronos]:
+        """ Atomically claim the earliest partition that is neither done nor claimed by a live worker. If every partition
+        left is claimed, wait until one is released or its lease runs out.
+
+        :param timeout: seconds to wait for a claimed partition to become available, defaults to None (no limit)
+        :type timeout: float, optional
+        :raises TimeoutError: if partitions are left but all of them are still claimed after `timeout` seconds
+        :return: the claimed partition, or None if every partition is done
+        :rtype: Optional[Kronos]
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            now = time.time()
+            with self._transaction():
+                row = self._connection.execute(
+                    '''SELECT start_us, end_us FROM partitions
+                       WHERE job = ? AND (status = 'pending' OR (status = 'claimed' AND claimed_at < ?))
+                       ORDER BY start_us LIMIT 1''',
+                    (self.job, now - self.lease_seconds),
+                ).fetchone()
+                if row is not None:
+                    self._connection.execute(
+                        "UPDATE partitions SET status = 'claimed', worker = ?, claimed_at = ? "
+                        'WHERE job = ? AND start_us = ?',
+                        (self.worker, now, self.job, row[0]),
+                    )
+                    return self._partition(*row)
+                oldest_claim, = self._connection.execute(
+                    "SELECT MIN(claimed_at) FROM partitions WHERE job = ? AND status = 'claimed'", (self.job,)
+                ).fetchone()
+            if oldest_claim is None:
+                return None
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                raise TimeoutError(f'Every partition left in `{self.job}` is claimed by a worker.')
+            # check again once the oldest lease has run out, or sooner in case a partition is released
+            time.sleep(max(0, min(POLL_SECONDS, oldest_claim + self.lease_seconds - now,
+                                  POLL_SECONDS if remaining is None else remaining)))
+
+    def complete(self, partition: Union[Kronos, DateRange]) -> bool:
+        """ Mark a partition this worker has claimed done.
+
+        :return: False if the claim was lost -- the lease expired and another worker took the partition over, or it
+            was never claimed by this worker -- in which case nothing is recorded
+        :rtype: bool
+        """
+        return self._set_status(partition, 'done')
+
+    def release(self, partition: Union[Kronos, DateRange]) -> bool:
+        """ Give up a partition this worker has claimed, making it available again straight away.
+
+        :return: False if the claim was already lost (see `complete`), in which case nothing changes
+        :rtype: bool
+        """
+        return self._set_status(partition, 'pending')
+
+    def _set_status(self, partition: Union[Kronos, DateRange], status: str) -> bool:
+        if isinstance(partition, Kronos):
+            partition = partition.to_range()
+        with self._transaction():
+            cursor = self._connection.execute(
+                """UPDATE partitions SET status = ?, worker = NULL, claimed_at = NULL
+                   WHERE job = ? AND start_us = ? AND worker = ? AND status = 'claimed'""",
+                (status, self.job, partition.start_us, self.worker),
+            )
+        return cursor.rowcount == 1
+
+    def __iter__(self) -> Generator[Kronos]:
+        while True:
+            partition = self.claim()
+            if partition is None:
+                return
+            try:
+                yield partition
+            except (GeneratorExit, Exception):
+                # the loop body raised or the caller stopped early: hand the partition back rather than leave it
+                # claimed under a worker name the next run won't have
+                self.release(partition)
+                raise
+            self.complete(partition)
+
+    def progress(self) -> Tuple[int, int]:
+        """ Get (partitions done, total partitions). """
+        done, total = self._connection.execute(
+            "SELECT COUNT(CASE WHEN status = 'done' THEN 1 END), COUNT(*) FROM partitions WHERE job = ?", (self.job,)
+        ).fetchone()
+        return done, total
+
+    def close(self):
+        """ Close the connection to the progress store. """
+        self._connection.close()
+
+    def __enter__(self) -> Backfill:
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class _Transaction(object):
+    """ `BEGIN IMMEDIATE` ... `COMMIT` (or `ROLLBACK` on error) on an autocommit connection. """
+
+    def __init__(self, connection: sqlite3.Connection):
+        self.connection = connection
+
+    def __enter__(self):
+        self.connection.execute('BEGIN IMMEDIATE')
+        return self.connection
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.connection.execute('ROLLBACK' if exc_type else 'COMMIT')
@@ -0,0 +1,181 @@
+""" Business-day calendars. A `HolidayCalendar` compiles each year it is asked about into a bitmap of business days
+(bit `i` is day `i` of the year), so counting and offsetting business days are popcounts over whole years rather
+than day-by-day loops. """
+from __future__ import annotations
+
+from datetime import date, timedelta
+from typing import Union, Iterable, Callable, Dict, Generator
+
+from .partitions import resolve_weekday
+
+# a holiday rule takes a year and returns that year's holidays
+HolidayRule = Callable[[int], Iterable[date]]
+
+
+def _popcount(bits: int) -> int:
+    return bin(bits).count('1')
+
+
+class HolidayCalendar(object):
+    """ Business days: every day that is neither a weekend day nor a holiday. Holidays are given as fixed dates and/or
+    rules -- callables that take a year and return that year's holidays, e.g. "fourth Thursday of November" -- so a
+    calendar can cover any year without listing every date up front.
+
+    Each year is compiled into an integer bitmap on first use and cached until holidays or rules change.
+    """
+
+    def __init__(self, holidays: Iterable[date] = (), rules: Iterable[HolidayRule] = (),
+                 weekend: Iterable[Union[int, str]] = ('SAT', 'SUN')):
+        """ Build a calendar.
+
+        :param holidays: fixed holiday dates
+        :type holidays: Iterable[date], optional
+        :param rules: callables taking a year and returning that year's holidays
+        :type rules: Iterable[HolidayRule], optional
+        :param weekend: non-business weekdays as ints (Monday is 0) or abbreviations, defaults to ('SAT', 'SUN')
+        :type weekend: Iterable[Union[int, str]], optional
+        :raises ValueError: if every weekday is a weekend day
+        """
+        self.weekend = frozenset(resolve_weekday(day) for day in weekend)
+        if len(self.weekend) == 7:
+            raise ValueError('`weekend` cannot include every day of the week.')
+        self._holidays = set(holidays)
+        self._rules = list(rules)
+        self._years: Dict[int, int] = {}
+        self._counts: Dict[int, int] = {}
+
+    def add_holidays(self, holidays: Iterable[date]):
+        """ Add fixed holiday dates. Return `self`. """
+        self._holidays.update(holidays)
+        self._years.clear()
+        self._counts.clear()
+        return self
+
+    def add_rule(self, rule: HolidayRule):
+        """ Add a holiday rule (a callable taking a year and returning that year's holidays). Return `self`. """
+        self._rules.append(rule)
+        self._years.clear()
+        self._counts.clear()
+        return self
+
+    def year_bits(self, year: int) -> int:
+        """ Get the (cached) business-day bitmap for a year: bit `i` is set if day `i` (January 1st is 0) is a business
+        day.
+
+        :param year: the year
+        :type year: int
+        :return: the year's bitmap
+        :rtype: int
+        """
+        bits = self._years.get(year)
+        if bits is None:
+            first = date(year, 1, 1)
+            holidays = {day for day in self._holidays if day.year == year}
+            for rule in self._rules:
+                holidays.update(day for day in rule(year) if day.year == year)
+            bits = 0
+            for i in range((date(year + 1, 1, 1) - first).days):
+                day = first + timedelta(days=i)
+                if day.weekday() not in self.weekend and day not in holidays:
+                    bits |= 1 << i
+            self._years[year] = bits
+            self._counts[year] = _popcount(bits)
+        return bits
+
+    def _year_count(self, year: int) -> int:
+        self.year_bits(year)
+        return self._counts[year]
+
+    def is_business_day(self, day: date) -> bool:
+        """ Whether `day` is a business day. """
+        return bool(self.year_bits(day.year) >> (day.timetuple().tm_yday - 1) & 1)
+
+    def count(self, start: date, end: date) -> int:
+        """ Count business days from `start` to `end`, both included. Whole years in between cost one lookup each.
+
+        :param start: first date
+        :type start: date
+        :param end: last date
+        :type end: date
+        :return: number of business days (0 if `end` comes before `start`)
+        :rtype: int
+        """
+        if end < start:
+            return 0
+        first, last = start.timetuple().tm_yday - 1, end.timetuple().tm_yday - 1
+        if start.year == end.year:
+            return _popcount(self.year_bits(start.year) >> first & ((1 << (last - first + 1)) - 1))
+        total = _popcount(self.year_bits(start.year) >> first)
+        total += sum(self._year_count(year) for year in range(start.year + 1, end.year))
+        return total + _popcount(self.year_bits(end.year) & ((1 << (last + 1)) - 1))
+
+    def add(self, day: date, n: int) -> date:
+        """ Move `n` business days from `day` (backward if `n` is negative). Like `numpy.busday_offset`, a `day` that is
+        not a business day first rolls to the next business day (or the previous one when going backward).
+
+        :param day: the date to start from
+        :type day: date
+        :param n: number of business days to move
+        :type n: int
+        :return: the resulting business day
+        :rtype: date
+        """
+        if not self.is_business_day(day):
+            day = self.roll(day, forward=n >= 0)
+        year, index = day.year, day.timetuple().tm_yday - 1
+        if n >= 0:
+            bits = self.year_bits(year) >> (index + 1) << (index + 1)
+            while n > _popcount(bits):
+                n -= _popcount(bits)
+                year += 1
+                bits = self.year_bits(year)
+            if n:
+                for _ in range(n - 1):
+                    bits &= bits - 1  # drop the lowest business day
+                index = (bits & -bits).bit_length() - 1
+        else:
+            n = -n
+            bits = self.year_bits(year) & ((1 << index) - 1)
+            while n > _popcount(bits):
+                n -= _popcount(bits)
+                year -= 1
+                bits = self.year_bits(year)
+            for _ in range(n - 1):
+                bits ^= 1 << (bits.bit_length() - 1)  # drop the highest business day
+            index = bits.bit_length() - 1
+        return date(year, 1, 1) + timedelta(days=index)
+
+    def roll(self, day: date, forward: bool = True) -> date:
+        """ Get `day` if it is a business day, else the next business day (or the previous one if not `forward`). """
+        year, index = day.year, day.timetuple().tm_yday - 1
+        if forward:
+            bits = self.year_bits(year) >> index << index
+            while not bits:
+                year += 1
+                bits = self.year_bits(year)
+            index = (bits & -bits).bit_length() - 1
+        else:
+            bits = self.year_bits(year) & ((1 << (index + 1)) - 1)
+            while not bits:
+                year -= 1
+                bits = self.year_bits(year)
+            index = bits.bit_length() - 1
+        return date(year, 1, 1) + timedelta(days=index)
+
+    def business_days(self, start: date, end: date) -> Generator[date]:
+        """ Yield every business day from `start` to `end`, both included. """
+        day = start
+        while day <= end:
+            bits = self.year_bits(day.year) >> (day.timetuple().tm_yday - 1)
+            last = min(end, date(day.year, 12, 31))
+            offset = 0
+            while bits and day + timedelta(days=offset) <= last:
+                if bits & 1:
+                    yield day + timedelta(days=offset)
+                bits >>= 1
+                offset += 1
+            day = date(day.year + 1, 1, 1)
+
+
+# weekends only, no holidays -- used when no calendar is given
+WEEKDAYS = HolidayCalendar()
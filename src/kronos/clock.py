@@ -0,0 +1,111 @@
+""" Where kronos gets the current time. Every "now" -- default ranges, named ranges, `Kronos.today`, ... -- goes through
+the active `Clock`, which is the system clock unless one is installed globally (`set_clock`) or for a scope
+(`use_clock`, `snapshot`). Scoped clocks live in a context variable, so concurrent requests, threads and asyncio
+tasks each see their own. """
+from __future__ import annotations
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, tzinfo
+from typing import Dict, Generator
+
+import pytz
+
+
+class Clock(object):
+    """ The system clock: every call reads the current time. """
+
+    def now(self, tz: tzinfo) -> datetime:
+        """ The current time, localized to `tz`.
+
+        :param tz: a timezone object
+        :type tz: tzinfo
+        :return: a timezone-aware datetime
+        :rtype: datetime
+        """
+        return datetime.now(tz=tz)
+
+
+class FrozenClock(Clock):
+    """ A clock stopped at one instant. Localized values are cached per timezone, so asking for "now" (and through
+    it, "today") in the same timezone again is a dict lookup. """
+
+    def __init__(self, instant: datetime = None):
+        """ Stop the clock.
+
+        :param instant: the instant to stop at, defaults to the current time. naive datetimes are read as UTC
+        :type instant: datetime, optional
+        """
+        if instant is None:
+            instant = datetime.now(tz=pytz.utc)
+        elif instant.tzinfo is None:
+            instant = pytz.utc.localize(instant)
+        self.instant = instant
+        self._localized: Dict[tzinfo, datetime] = {}
+
+    def now(self, tz: tzinfo) -> datetime:
+        try:
+            return self._localized[tz]
+        except KeyError:
+            localized = self._localized[tz] = self.instant.astimezone(tz)
+            return localized
+        except TypeError:
+            # unhashable tzinfo (e.g. dateutil's tzfile)
+            return self.instant.astimezone(tz)
+
+
+SYSTEM_CLOCK = Clock()
+
+_global_clock: Clock = SYSTEM_CLOCK
+_scoped_clock: ContextVar = ContextVar('kronos_clock', default=None)
+
+
+def get_clock() -> Clock:
+    """ The active clock: the one installed for the current scope, else the global one. """
+    return _scoped_clock.get() or _global_clock
+
+
+def set_clock(clock: Clock = None):
+    """ Install a clock globally, e.g. `set_clock(FrozenClock(datetime(2023, 1, 1)))`. Scoped clocks still take
+    precedence.
+
+    :param clock: the clock to install, defaults to the system clock
+    :type clock: Clock, optional
+    """
+    global _global_clock
+    _global_clock = clock or SYSTEM_CLOCK
+
+
+@contextmanager
+def use_clock(clock: Clock) -> Generator[Clock]:
+    """ Install a clock for the duration of a `with` block (in the current context only).
+
+    :param clock: the clock to install
+    :type clock: Clock
+    :yield: the clock
+    :rtype: Generator[Clock]
+    """
+    token = _scoped_clock.set(clock)
+    try:
+        yield clock
+    finally:
+        _scoped_clock.reset(token)
+
+
+def snapshot(instant: datetime = None):
+    """ Freeze "now" for the duration of a `with` block, so every Kronos object and named range built inside it agrees
+    on the current time -- even across midnight -- and the time is read once::
+
+        with snapshot():
+            handle(request)
+
+    :param instant: the instant to freeze at, defaults to the current time. naive datetimes are read as UTC
+    :type instant: datetime, optional
+    :return: a context manager yielding the `FrozenClock`
+    """
+    return use_clock(FrozenClock(instant))
+
+
+def now(tz: tzinfo) -> datetime:
+    """ The active clock's current time, localized to `tz`. """
+    return get_clock().now(tz)
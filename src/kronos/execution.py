@@ -0,0 +1,171 @@
+""" Running a function over the partitions of a range concurrently: in a process pool, where partitions travel to
+workers as (start, end) epoch microsecond pairs plus a timezone (its name where it has one) and are rebuilt into Kronos objects on the worker
+side, or as asyncio coroutines with a bounded number in flight. """
+from __future__ import annotations
+
+import asyncio
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from datetime import tzinfo
+from typing import Callable, Deque, Dict, Iterable, List, Tuple, Any, Generator, AsyncGenerator, Awaitable, Union
+
+from .ranges import DateRange, resolve_timezone_key
+
+# (start_us, end_us) of each partition in a chunk
+Bounds = List[Tuple[int, int]]
+
+# chunks `map_partitions` keeps submitted per worker process
+IN_FLIGHT_PER_WORKER = 2
+# in order, `amap_partitions` starts at most this many times `concurrency` partitions past the earliest one not yet
+# yielded, which bounds the results held back behind a slow partition
+ORDERED_WINDOW = 2
+
+
+def _run_chunk(func: Callable, tz: Union[str, tzinfo], date_format: str, bounds: Bounds) -> List[Any]:
+    """ Worker side of `map_partitions`: rebuild each partition and call `func` on it. """
+    from .kronos import Kronos
+
+    timezone = resolve_timezone_key(tz) if isinstance(tz, str) else tz
+    return [func(Kronos.from_range(DateRange(start, end, timezone), date_format)) for start, end in bounds]
+
+
+def _chunks(bounds: Iterable[Tuple[int, int]], chunksize: int) -> Generator[Bounds]:
+    chunk = []
+    for pair in bounds:
+        chunk.append(pair)
+        if len(chunk) == chunksize:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def map_partitions(func: Callable, bounds: Iterable[Tuple[int, int]], tz: Union[str, tzinfo], date_format: str,
+                   workers: int = None, chunksize: int = 1, ordered: bool = True) -> Generator[Any]:
+    """ Call `func` on every partition in a `ProcessPoolExecutor` and yield the results. `bounds` is consumed lazily:
+    only about two chunks per worker are submitted at any time, and the next ones as earlier results are handed over.
+
+    :param func: a picklable function taking a Kronos object
+    :type func: Callable
+    :param bounds: (start, end) of each partition as epoch microseconds
+    :type bounds: Iterable[Tuple[int, int]]
+    :param tz: timezone of the partitions: a key another process can resolve (see `ranges.timezone_key`), or a
+        picklable tzinfo for timezones without a name (see `serialization.portable_timezone`)
+    :type tz: Union[str, tzinfo]
+    :param date_format: date format of the Kronos objects handed to `func`
+    :type date_format: str
+    :param workers: number of worker processes, defaults to the number of CPUs
+    :type workers: int, optional
+    :param chunksize: number of partitions sent to a worker per task, defaults to 1
+    :type chunksize: int, optional
+    :param ordered: yield results in partition order (True) or as soon as they complete (False), defaults to True
+    :type ordered: bool, optional
+    :raises ValueError: if `chunksize` is not positive
+    :yield: the result of `func` for each partition
+    :rtype: Generator[Any]
+    """
+    if chunksize < 1:
+        raise ValueError(f'`chunksize` must be a positive integer. You sent: `{chunksize}`')
+    workers = workers or os.cpu_count() or 1
+    chunks = _chunks(bounds, chunksize)
+    # chunks submitted and not yet yielded, at most `IN_FLIGHT_PER_WORKER` per worker so partitions keep being
+    # generated lazily and finished results do not pile up
+    pending: Deque[Future] = deque()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+
+        def fill():
+            while len(pending) < IN_FLIGHT_PER_WORKER * workers:
+                chunk = next(chunks, None)
+                if chunk is None:
+                    return
+                pending.append(executor.submit(_run_chunk, func, tz, date_format, chunk))
+
+        try:
+            fill()
+            while pending:
+                if ordered:
+                    future = pending.popleft()
+                else:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    future = next(iter(done))
+                    pending.remove(future)
+                results = future.result()
+                fill()
+                yield from results
+        finally:
+            # the caller stopped early (or a task failed): don't run what is still queued
+            for future in pending:
+                future.cancel()
+
+
+async def aiter_partitions(partitions: Iterable[Any]) -> AsyncGenerator[Any]:
+    """ Async iteration over a partition generator, yielding control to the event loop between partitions. """
+    for partition in partitions:
+        yield partition
+        await asyncio.sleep(0)
+
+
+async def amap_partitions(coro_fn: Callable[[Any], Awaitable], partitions: Iterable[Any], concurrency: int = 8,
+                          ordered: bool = True) -> AsyncGenerator[Any]:
+    """ Await `coro_fn(partition)` for every partition with at most `concurrency` coroutines in flight, and yield the
+    results. Partitions are pulled lazily and a new coroutine starts as soon as any running one finishes, so only the
+    tasks in flight exist at any time. If a coroutine raises, the others still running are cancelled and the exception
+    propagates straight away (in either mode); the same happens if the caller stops iterating.
+
+    :param coro_fn: coroutine function taking a partition
+    :type coro_fn: Callable[[Any], Awaitable]
+    :param partitions: the partitions, e.g. `Kronos.day_range()`
+    :type partitions: Iterable[Any]
+    :param concurrency: maximum number of coroutines running at once, defaults to 8
+    :type concurrency: int, optional
+    :param ordered: yield results in partition order (True) or as soon as they complete (False), defaults to True.
+        in order, results that finish ahead of an earlier partition are held until it completes, and no partition more
+        than `ORDERED_WINDOW * concurrency` places past it is started in the meantime
+    :type ordered: bool, optional
+    :raises ValueError: if `concurrency` is not positive
+    :yield: the result of `coro_fn` for each partition
+    :rtype: AsyncGenerator[Any]
+    """
+    if concurrency < 1:
+        raise ValueError(f'`concurrency` must be a positive integer. You sent: `{concurrency}`')
+    partitions = iter(partitions)
+    # running task -> index of its partition
+    pending: Dict[asyncio.Future, int] = {}
+    # finished results waiting for an earlier partition (ordered mode only)
+    finished: Dict[int, Any] = {}
+    started = 0
+    next_index = 0
+
+    def fill():
+        nonlocal started
+        while len(pending) < concurrency and (not ordered or started - next_index < ORDERED_WINDOW * concurrency):
+            partition = next(partitions, None)
+            if partition is None:
+                return
+            pending[asyncio.ensure_future(coro_fn(partition))] = started
+            started += 1
+
+    try:
+        fill()
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            results = []
+            for task in sorted(done, key=pending.__getitem__):
+                index = pending.pop(task)
+                # raises the first failure, cancelling the rest in `finally`
+                results.append((index, task.result()))
+            if ordered:
+                finished.update(results)
+                results = []
+                while next_index in finished:
+                    results.append((next_index, finished.pop(next_index)))
+                    next_index += 1
+            fill()
+            for _, result in results:
+                yield result
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
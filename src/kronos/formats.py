@@ -0,0 +1,551 @@
+""" Compiled date parsers and formatters for bulk work. `compile_parser(fmt)` turns a strftime format into a
+`DateParser` that slices fixed-width fields instead of running `strptime`, and memoizes the date portion of each string
+it has seen; `compile_formatter(fmt)` turns it into a `DateFormatter` that fills a %-template instead of running
+`strftime`. `format_many` renders many instants in one timezone, formatting the date portion once per local day. """
+from __future__ import annotations
+
+import re
+from collections.abc import Mapping
+from datetime import datetime, date, timedelta, timezone, tzinfo
+from functools import lru_cache
+from itertools import islice
+from operator import attrgetter, itemgetter
+from typing import TYPE_CHECKING, Optional, Tuple, Iterable, List, Union, Generator, Any, Dict
+
+import pytz
+
+from ._compat import import_numpy
+from .timestamps import epoch_to_us, to_epoch_us_array, unit_of, UNITS
+from .transitions import transition_table, check_policies
+from .utilities import make_timezone, to_epoch_us, NAIVE_EPOCH, ONE_MICROSECOND
+
+if TYPE_CHECKING:
+    import numpy
+
+PARSER_CACHE_SIZE = 64
+FORMATTER_CACHE_SIZE = 64
+DATE_MEMO_SIZE = 4096
+CONVERT_CHUNK_SIZE = 1024
+CONVERT_CACHE_SIZE = 4096
+
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+DAY_US = 86400 * 10 ** 6
+
+_DIRECTIVE = re.compile(r'%.')
+_FIELD_WIDTHS = {'%Y': 4, '%m': 2, '%d': 2, '%H': 2, '%M': 2, '%S': 2}
+_DATE_FIELDS = ('%Y', '%m', '%d')
+_TIME_FIELDS = ('%H', '%M', '%S')
+_UTC = timezone.utc
+
+# formats `datetime.fromisoformat` parses exactly like `strptime` would (given the shape checks in `DateParser`)
+_ISO_FORMATS = ('%Y-%m-%d', '%Y-%m-%d %H:%M:%S', '%Y-%m-%dT%H:%M:%S')
+
+# strftime directives `DateFormatter` renders itself: datetime attribute and %-conversion
+_FORMAT_FIELDS = {
+    '%Y': ('year', '%04d'),
+    '%m': ('month', '%02d'),
+    '%d': ('day', '%02d'),
+    '%H': ('hour', '%02d'),
+    '%M': ('minute', '%02d'),
+    '%S': ('second', '%02d'),
+    '%f': ('microsecond', '%06d'),
+}
+
+# directives that depend on the date alone, and the time-of-day fields `DayFormatter` renders arithmetically
+_DAY_DIRECTIVES = frozenset('%' + char for char in 'aAbBCdeGgjmUuVWwYy%')
+_CLOCK_FIELDS = {'%H': (0, '%02d'), '%M': (1, '%02d'), '%S': (2, '%02d'), '%f': (3, '%06d')}
+
+
+@lru_cache(maxsize=PARSER_CACHE_SIZE)
+def compile_parser(fmt: str) -> DateParser:
+    """ Get the (cached) compiled parser for a strptime format.
+
+    :param fmt: strptime format string
+    :type fmt: str
+    :return: a parser for strings in `fmt`
+    :rtype: DateParser
+    """
+    return DateParser(fmt)
+
+
+class DateParser(object):
+    """ A strptime format compiled for repeated use. Formats made of fixed-width numeric fields (`%Y %m %d %H %M %S`)
+    and literals, optionally ending in `%f` and/or `%z`, are parsed by slicing. Anything else -- and any string the
+    fast path does not accept -- goes through `datetime.strptime`, so results and errors always match `strptime`.
+    """
+
+    def __init__(self, fmt: str):
+        self.fmt = fmt
+        self.fast = False
+        self.iso = fmt in _ISO_FORMATS
+        self._dates: Dict[str, Tuple[int, int, int, int]] = {}
+        self._compile()
+
+    def _compile(self):
+        """ Lay out the slice positions of each field. Leaves `self.fast` False for unsupported formats. """
+        fields, literals, tail = {}, [], []
+        suffix = ''
+        position = 0
+        for piece in re.split(r'(%.)', self.fmt):
+            if not piece:
+                continue
+            if tail:
+                # %f / %z are variable-width, so only literals (after %f) and %z may follow them
+                if piece == '%z' and '%z' not in tail:
+                    tail.append(piece)
+                elif tail == ['%f'] and not _DIRECTIVE.search(piece.replace('%%', '')):
+                    suffix += piece.replace('%%', '%')
+                else:
+                    return
+                continue
+            if piece in _FIELD_WIDTHS:
+                if piece in fields:
+                    return
+                fields[piece] = (position, position + _FIELD_WIDTHS[piece])
+                position += _FIELD_WIDTHS[piece]
+            elif piece in ('%f', '%z'):
+                tail.append(piece)
+            elif _DIRECTIVE.fullmatch(piece) and piece != '%%':
+                return
+            else:
+                text = piece.replace('%%', '%')
+                literals.append((position, text))
+                position += len(text)
+        if '%Y' not in fields or suffix[:1].isdigit():
+            return
+
+        self._fields = fields
+        self._literals = literals
+        self._length = position
+        self._fraction = '%f' in tail
+        self._offset = '%z' in tail
+        self._suffix = suffix
+        spans = [fields[f] for f in _DATE_FIELDS if f in fields]
+        self._date_span = (min(s[0] for s in spans), max(s[1] for s in spans))
+        self._date_slices = [fields.get(f) for f in _DATE_FIELDS]
+        self._time_slices = [fields.get(f) for f in _TIME_FIELDS]
+        self.fast = True
+
+    def _split(self, value: str) -> Optional[tuple]:
+        """ Slice `value` into ((year, month, day, ordinal), hour, minute, second, microsecond, utc offset in seconds or
+        None). Returns None if the fast path cannot vouch for the result. """
+        if len(value) < self._length or (len(value) != self._length and not (self._fraction or self._offset)):
+            return None
+        for position, text in self._literals:
+            if not value.startswith(text, position):
+                return None
+
+        key = value[self._date_span[0]:self._date_span[1]]
+        ymd = self._dates.get(key)
+        if ymd is None:
+            ymd = self._parse_date(value)
+            if ymd is None:
+                return None
+            if len(self._dates) >= DATE_MEMO_SIZE:
+                self._dates.clear()
+            self._dates[key] = ymd
+
+        hms = [0, 0, 0]
+        for i, span in enumerate(self._time_slices):
+            if span is not None:
+                digits = value[span[0]:span[1]]
+                if not (digits.isdigit() and digits.isascii()):
+                    return None
+                hms[i] = int(digits)
+        if hms[0] > 23 or hms[1] > 59 or hms[2] > 59:
+            return None
+
+        rest = value[self._length:]
+        microsecond = 0
+        if self._fraction:
+            digits = rest[:6]
+            end = len(digits)
+            for i, char in enumerate(digits):
+                if not ('0' <= char <= '9'):
+                    end = i
+                    break
+            if not end:
+                return None
+            microsecond = int(digits[:end].ljust(6, '0'))
+            rest = rest[end:]
+            if not rest.startswith(self._suffix):
+                return None
+            rest = rest[len(self._suffix):]
+        offset = None
+        if self._offset:
+            offset = _parse_offset(rest)
+            if offset is None:
+                return None
+        elif rest:
+            return None
+        return ymd, hms[0], hms[1], hms[2], microsecond, offset
+
+    def _parse_date(self, value: str) -> Optional[Tuple[int, int, int, int]]:
+        """ (year, month, day, ordinal) for the date fields of `value`, or None if they are not a valid date. """
+        parts: List[int] = []
+        # the year is always there (see `_compile`); month and day default to 1
+        for span, default in zip(self._date_slices, (1, 1, 1)):
+            if span is None:
+                parts.append(default)
+                continue
+            digits = value[span[0]:span[1]]
+            if not (digits.isdigit() and digits.isascii()):
+                return None
+            parts.append(int(digits))
+        try:
+            ordinal = date(*parts).toordinal()
+        except ValueError:
+            return None
+        return parts[0], parts[1], parts[2], ordinal
+
+    def parse(self, value: str) -> datetime:
+        """ Parse a string, equivalent to `datetime.strptime(value, fmt)`.
+
+        :param value: a string-represented date in this parser's format
+        :type value: str
+        :raises ValueError: if `value` does not match the format
+        :return: a datetime (timezone-aware with a fixed offset if the format has `%z`)
+        :rtype: datetime
+        """
+        if self.iso and len(value) == len(self.fmt) + 2 and value[4] == '-' and value[7] == '-' and \
+                (len(value) == 10 or (value[10] == self.fmt[8] and value[13] == ':' and value[16] == ':')):
+            try:
+                return datetime.fromisoformat(value)
+            except ValueError:
+                pass
+        if self.fast:
+            parts = self._split(value)
+            if parts is not None:
+                (year, month, day, _), hour, minute, second, microsecond, offset = parts
+                tz = None
+                if offset is not None:
+                    tz = _UTC if not offset else timezone(timedelta(seconds=offset))
+                return datetime(year, month, day, hour, minute, second, microsecond, tz)
+        return datetime.strptime(value, self.fmt)
+
+    def to_wall_us(self, value: str) -> Tuple[int, Optional[int]]:
+        """ Parse a string straight to microseconds since the epoch of its wall-clock time, without building a datetime.
+
+        :param value: a string-represented date in this parser's format
+        :type value: str
+        :raises ValueError: if `value` does not match the format
+        :return: (wall time as epoch microseconds, utc offset in microseconds if the format has `%z` else None)
+        :rtype: Tuple[int, Optional[int]]
+        """
+        parts = self._split(value) if self.fast else None
+        if parts is None:
+            dt = datetime.strptime(value, self.fmt)
+            offset = dt.utcoffset()
+            wall = (dt.replace(tzinfo=None) - datetime(1970, 1, 1)) // timedelta(microseconds=1)
+            return wall, (None if offset is None else offset // timedelta(microseconds=1))
+        ymd, hour, minute, second, microsecond, offset = parts
+        wall = (ymd[3] - EPOCH_ORDINAL) * DAY_US + ((hour * 60 + minute) * 60 + second) * 10 ** 6 + microsecond
+        return wall, (None if offset is None else offset * 10 ** 6)
+
+
+@lru_cache(maxsize=FORMATTER_CACHE_SIZE)
+def compile_formatter(fmt: str) -> DateFormatter:
+    """ Get the (cached) compiled formatter for a strftime format.
+
+    :param fmt: strftime format string
+    :type fmt: str
+    :return: a formatter producing strings in `fmt`
+    :rtype: DateFormatter
+    """
+    return DateFormatter(fmt)
+
+
+class DateFormatter(object):
+    """ A strftime format compiled for repeated use. Formats made of numeric fields (`%Y %m %d %H %M %S %f`) and
+    literals -- `%Y-%m-%d`, `%Y%m%d`, `%Y-%m-%d %H:%M:%S`, ISO-8601 without an offset, ... -- are rendered with one
+    %-template over the datetime's fields; `%Y-%m-%d` is `date.isoformat`. Anything else goes through `strftime`, as do
+    years before 1000, which `strftime` does not zero-pad on every platform.
+    """
+
+    def __init__(self, fmt: str):
+        self.fmt = fmt
+        self.fast = False
+        self._iso_date = fmt == '%Y-%m-%d'
+        template, attributes = [], []
+        for piece in re.split(r'(%.)', fmt):
+            if piece in _FORMAT_FIELDS:
+                attribute, conversion = _FORMAT_FIELDS[piece]
+                attributes.append(attribute)
+                template.append(conversion)
+            elif piece == '%%':
+                template.append('%%')
+            elif _DIRECTIVE.fullmatch(piece) or piece.endswith('%'):
+                return
+            else:
+                template.append(piece)
+        if not attributes:
+            return
+        self._template = ''.join(template)
+        self._fields = attrgetter(*attributes)
+        self.fast = True
+
+    def format(self, dt: Union[datetime, date]) -> str:
+        """ Format a datetime, equivalent to `dt.strftime(fmt)`.
+
+        :param dt: the datetime (or date) to format
+        :type dt: Union[datetime, date]
+        :return: `dt` in this formatter's format
+        :rtype: str
+        """
+        if not self.fast or dt.year < 1000:
+            return dt.strftime(self.fmt)
+        if self._iso_date:
+            return date.isoformat(dt)
+        try:
+            return self._template % self._fields(dt)
+        except AttributeError:
+            # a `date` given a format with time fields
+            return dt.strftime(self.fmt)
+
+
+@lru_cache(maxsize=FORMATTER_CACHE_SIZE)
+def _day_formatter(fmt: str) -> DayFormatter:
+    """ Cached `DayFormatter(fmt)`, so its memo of formatted days carries over between `format_many` calls. """
+    return DayFormatter(fmt)
+
+
+class DayFormatter(object):
+    """ A strftime format split into a date prefix and a time-of-day suffix, for rendering many local wall times: the
+    prefix is formatted once per distinct day and memoized, the suffix is filled in from the time of day with integer
+    arithmetic. Formats qualify when every directive before the first of `%H %M %S %f` depends on the date alone and
+    nothing after it but those fields and literals -- `%Y-%m-%d %H:%M:%S`, ISO-8601 without an offset, `%d %b %Y %H:%M`,
+    date-only formats, ... -- otherwise `fast` is False.
+    """
+
+    def __init__(self, fmt: str):
+        self.fmt = fmt
+        self.fast = False
+        self._days: Dict[int, str] = {}
+        pieces = [piece for piece in re.split(r'(%.)', fmt) if piece]
+        split = next((i for i, piece in enumerate(pieces) if piece in _CLOCK_FIELDS), len(pieces))
+        for piece in pieces[:split]:
+            if (_DIRECTIVE.fullmatch(piece) and piece not in _DAY_DIRECTIVES) or piece.endswith('%'):
+                return
+        template, indices = [], []
+        for piece in pieces[split:]:
+            if piece in _CLOCK_FIELDS:
+                index, conversion = _CLOCK_FIELDS[piece]
+                indices.append(index)
+                template.append(conversion)
+            elif piece == '%%':
+                template.append('%%')
+            elif _DIRECTIVE.fullmatch(piece) or piece.endswith('%'):
+                return
+            else:
+                template.append(piece)
+        self._prefix = compile_formatter(''.join(pieces[:split])).format
+        self._clock = ''.join(template)
+        self._pick = itemgetter(*indices) if indices else None
+        self.fast = True
+
+    def format_wall_us(self, wall_us: int) -> str:
+        """ Format a local wall time given as epoch microseconds (as if the wall time were UTC).
+
+        :param wall_us: local wall time as epoch microseconds
+        :type wall_us: int
+        :return: the wall time in this formatter's format
+        :rtype: str
+        """
+        day, time_us = divmod(wall_us, DAY_US)
+        prefix = self._days.get(day)
+        if prefix is None:
+            prefix = self._prefix(date.fromordinal(EPOCH_ORDINAL + day))
+            if len(self._days) >= DATE_MEMO_SIZE:
+                self._days.clear()
+            self._days[day] = prefix
+        if self._pick is None:
+            return prefix
+        seconds, microsecond = divmod(time_us, 10 ** 6)
+        minutes, second = divmod(seconds, 60)
+        hour, minute = divmod(minutes, 60)
+        return prefix + self._clock % self._pick((hour, minute, second, microsecond))
+
+
+def _parse_offset(text: str) -> Optional[int]:
+    """ UTC offset in seconds for a `%z` value ("Z", "+HHMM" or "+HH:MM"), or None if it is not one of those. """
+    if text == 'Z':
+        return 0
+    if len(text) == 6 and text[3] == ':':
+        text = text[:3] + text[4:]
+    if len(text) != 5 or text[0] not in '+-' or not (text[1:].isdigit() and text[1:].isascii()):
+        return None
+    if int(text[3:5]) > 59:
+        return None
+    minutes = int(text[1:3]) * 60 + int(text[3:5])
+    return -minutes * 60 if text[0] == '-' else minutes * 60
+
+
+def parse_many(values: Iterable[str], date_format: str, in_tz: Union[pytz.BaseTzInfo, str] = 'UTC',
+               out_tz: Union[pytz.BaseTzInfo, str] = 'UTC', as_epoch: bool = False, ambiguous: str = 'latest',
+               nonexistent: str = 'shift_forward') -> Union[List[datetime], 'numpy.ndarray']:
+    """ Parse many date strings in one format and localize them, equivalent to `convert_timezone(datetime.strptime(value,
+    date_format), in_tz, out_tz)` per value. The format is compiled once (see `compile_parser`) and both timezones are
+    resolved once; localizing is a binary search over the zone's transition table.
+
+    :param values: date strings, or a numpy array of strings (str or bytes)
+    :type values: Iterable[str]
+    :param date_format: strptime format of every value
+    :type date_format: str
+    :param in_tz: timezone of values that carry no UTC offset of their own, defaults to 'UTC'
+    :type in_tz: Union[pytz.BaseTzInfo, str], optional
+    :param out_tz: timezone of the returned datetimes, defaults to 'UTC'. ignored if `as_epoch`
+    :type out_tz: Union[pytz.BaseTzInfo, str], optional
+    :param as_epoch: return an int64 numpy array of UTC epoch microseconds instead of datetimes. defaults to False
+    :type as_epoch: bool, optional
+    :param ambiguous: policy for wall times that occur twice in `in_tz`: "earliest", "latest" or "raise"
+    :type ambiguous: str, optional
+    :param nonexistent: policy for wall times skipped in `in_tz`: "shift_forward" or "raise"
+    :type nonexistent: str, optional
+    :return: a list of localized datetimes, or an int64 numpy array if `as_epoch`
+    :rtype: Union[List[datetime], numpy.ndarray]
+    """
+    check_policies(ambiguous, nonexistent)
+    parser = compile_parser(date_format)
+    in_table = transition_table(make_timezone(in_tz))
+    if hasattr(values, 'tolist'):
+        values = values.tolist()
+
+    utc = []
+    for value in values:
+        if isinstance(value, bytes):
+            value = value.decode()
+        wall, offset = parser.to_wall_us(value)
+        utc.append(in_table.wall_to_utc(wall, ambiguous, nonexistent) if offset is None else wall - offset)
+
+    if as_epoch:
+        np = import_numpy()
+        return np.array(utc, dtype=np.int64)
+    out_table = transition_table(make_timezone(out_tz))
+    return [out_table.from_utc_us(instant) for instant in utc]
+
+
+def convert_many(rows: Iterable[Any], in_format: str, out_format: str, columns: Iterable[Union[int, str]] = None,
+                 chunk_size: int = CONVERT_CHUNK_SIZE, cache_size: int = CONVERT_CACHE_SIZE) -> Generator[Any]:
+    """ Reformat date strings from `in_format` to `out_format` in a stream of values or rows. Rows are pulled
+    `chunk_size` at a time, so memory stays bounded however long the stream is, and each distinct input string is
+    converted once while it stays in a cache of the last `cache_size` distinct inputs. Empty strings and None pass
+    through unchanged.
+
+    :param rows: date strings, or rows (sequences or mappings) holding date strings in `columns`
+    :type rows: Iterable[Any]
+    :param in_format: strptime format of the input dates
+    :type in_format: str
+    :param out_format: strftime format of the output dates
+    :type out_format: str
+    :param columns: indices or keys of the date fields in each row. if None, each item of `rows` is itself a date string
+    :type columns: Iterable[Union[int, str]], optional
+    :param chunk_size: number of rows read from `rows` at a time, defaults to `CONVERT_CHUNK_SIZE`
+    :type chunk_size: int, optional
+    :param cache_size: number of distinct input strings remembered, defaults to `CONVERT_CACHE_SIZE`
+    :type cache_size: int, optional
+    :raises ValueError: if a date does not match `in_format`
+    :yield: converted date strings, or copies of each row (same type for lists, tuples and dicts) with `columns` converted
+    :rtype: Generator[Any]
+    """
+    if chunk_size < 1:
+        raise ValueError(f'`chunk_size` must be a positive integer. You sent: `{chunk_size}`')
+    parse = compile_parser(in_format).parse
+    render = compile_formatter(out_format).format
+    cache: Dict[str, str] = {}
+
+    def convert(value):
+        if not value:
+            return value
+        result = cache.get(value)
+        if result is None:
+            result = render(parse(value))
+            if len(cache) >= cache_size:
+                cache.clear()
+            cache[value] = result
+        return result
+
+    if columns is not None:
+        columns = list(columns)
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        if columns is None:
+            yield from [convert(value) for value in chunk]
+        else:
+            yield from [_convert_row(row, columns, convert) for row in chunk]
+
+
+def _convert_row(row: Any, columns: List[Union[int, str]], convert) -> Any:
+    """ Copy of `row` with `convert` applied to the fields in `columns`. """
+    converted: Any = dict(row) if isinstance(row, Mapping) else list(row)
+    for column in columns:
+        converted[column] = convert(converted[column])
+    return tuple(converted) if isinstance(row, tuple) else converted
+
+
+def format_many(values: Iterable[Any], fmt: str, tz: Union[tzinfo, str] = 'UTC', unit: str = 'auto') -> List[Optional[str]]:
+    """ Format many instants as strings in `fmt`, in timezone `tz` -- the bulk version of `to_timezone(tz).strftime(fmt)`.
+    For formats `DayFormatter` supports, each distinct local day's date portion is rendered once and the time of day
+    is filled in arithmetically; UTC offsets come from the zone's transition table, looked up again only when a value
+    leaves the period of the previous one. Other formats build a localized datetime per value and format it with
+    `compile_formatter`.
+
+    :param values: timezone-aware datetimes, naive datetimes (wall times in `tz`, localized like `table.localize`: a
+        wall time in a DST gap moves forward by the gap, a repeated one reads as the first occurrence), unix
+        timestamps, or a numpy array of timestamps or datetime64 values (read as UTC). None and NaT come back as None
+    :type values: Iterable[Any]
+    :param fmt: strftime format of the output strings
+    :type fmt: str
+    :param tz: timezone to render the instants in, defaults to 'UTC'
+    :type tz: Union[tzinfo, str], optional
+    :param unit: unit of numeric timestamps: "s", "ms", "us", "ns", or "auto" to detect it once from the magnitude of
+        the first timestamp (of the largest, for a numpy array), defaults to "auto"
+    :type unit: str, optional
+    :raises ValueError: if `unit` is not recognized
+    :return: the formatted values
+    :rtype: List[Optional[str]]
+    """
+    table = transition_table(make_timezone(tz))
+    if hasattr(values, 'dtype') and values.dtype.kind in 'iufM':
+        missing = import_numpy().isnat(values) if values.dtype.kind == 'M' else None
+        values = to_epoch_us_array(values, unit).tolist()
+        if missing is not None and missing.any():
+            values = [None if nat else us for us, nat in zip(values, missing.tolist())]
+        unit = 'us'
+    elif hasattr(values, 'tolist'):
+        values = values.tolist()
+
+    formatter = _day_formatter(fmt)
+    if not formatter.fast:
+        render = compile_formatter(fmt).format
+    # bounds and offset of the transition period the previous value fell in
+    start = end = offset = 0
+    result: List[Optional[str]] = []
+    for value in values:
+        if value is None:
+            result.append(None)
+            continue
+        if isinstance(value, datetime):
+            if value.tzinfo is None:
+                # through UTC like the other values, so gap times are shifted the same way whatever the format
+                utc_us = table.wall_to_utc((value - NAIVE_EPOCH) // ONE_MICROSECOND)
+            else:
+                utc_us = to_epoch_us(value)
+        else:
+            if unit == 'auto':
+                # one unit for the whole call, detected from the first timestamp
+                unit = unit_of(value)
+            scale = UNITS.get(unit)
+            utc_us = value * scale if scale and isinstance(value, int) else epoch_to_us(value, unit)
+        if not formatter.fast:
+            result.append(render(table.from_utc_us(utc_us)))
+            continue
+        if not start <= utc_us < end:
+            i = table.period_at_utc(utc_us)
+            start = table.utc[i]
+            end = table.utc[i + 1] if i + 1 < len(table.utc) else 2 ** 63
+            offset = table.offsets[i]
+        result.append(formatter.format_wall_us(utc_us + offset))
+    return result
@@ -3,27 +3,49 @@ from __future__ import annotations
 
 import os
 import warnings
-from typing import Union, List, Generator, Tuple
+from typing import TYPE_CHECKING, Optional, Union, List, Generator, Tuple, Iterable, Any, Callable, Sequence, AsyncGenerator, Awaitable, Dict
 
 import pytz
-from dateutil.rrule import rrule, DAILY
-from datetime import datetime, timedelta
-
-from .utilities import get_default_daterange, make_timezone, convert_timezone, _get_named_daterange, handle_ambiguous_datetime
+from datetime import datetime, timedelta, time, tzinfo
+
+from . import clock
+from ._compat import import_numpy
+from .utilities import get_default_daterange, make_timezone, convert_timezone, _get_named_daterange, handle_ambiguous_datetime, localize, to_epoch_us, NAIVE_EPOCH, ONE_MICROSECOND
+from .formats import compile_parser, compile_formatter, parse_many, convert_many, format_many, CONVERT_CHUNK_SIZE, CONVERT_CACHE_SIZE
+from .partitions import iter_bounds, boundary_arrays, bucket_indices, balanced_cuts
+from .transitions import transition_table
+from .timestamps import from_timestamps, to_epoch_us_array, epoch_to_us
+from .ranges import DateRange
+from .calendars import HolidayCalendar, WEEKDAYS
+from .backends import backend_of, zone_name
+from . import serialization
+
+if TYPE_CHECKING:
+    import numpy
 
 ISO_FMT = '%Y-%m-%d %H:%M:%S'
 DEFAULT_TZ = os.environ.get('KRONOS_TIMEZONE', 'UTC')  # Defaults to UTC if not set
 DEFAULT_FORMAT = os.environ.get('KRONOS_FORMAT', '%Y-%m-%d')
 
+NAIVE_POLICIES = ('localize', 'utc', 'raise')
+
+# instance attributes `__reduce__` rebuilds from the bounds; anything else a subclass sets is pickled as is
+_CORE_ATTRIBUTES = frozenset(('tz', 'date_format', '_start_date', '_end_date', '_formatted'))
+
 
 class Kronos(object):
 
+    # how membership tests (`in`, `contains_mask`) and `bucketize` read naive datetimes and datetime64 values: as wall
+    # times in the range's timezone ("localize"), as UTC ("utc"), or not at all ("raise")
+    naive_policy = 'localize'
+
     def __init__(self, 
                 start_date: Union[datetime, str] = None, 
                 end_date: Union[datetime, str] = None, 
                 timezone: Union[pytz.BaseTzInfo, str] = DEFAULT_TZ,
                 date_format: str = DEFAULT_FORMAT,
-                named_range: str = None):
+                named_range: str = None,
+                backend: str = None):
         """ Generate a Kronos date range given a start date and end date (given as strings). Optionally
         provide a timezone (defaults to UTC). If you provide an `end_date`, you must also provide a 
         `start_date`. If `end_date` is omitted, it will default to today.
@@ -38,10 +60,12 @@ class Kronos(object):
         :type date_format: str
         :param named_range: (optional) a valid `KRONOS_DATERANGE` environment variable value -- this will take full precedence if set
         :type named_daterange: str 
+        :param backend: (optional) timezone backend ("pytz" or "zoneinfo") used to create `timezone` from a name. defaults to `KRONOS_TZ_BACKEND`, "pytz" if not set.
+        :type backend: str
         """
 
         # initialize timezone
-        self.tz = None
+        tz: Optional[tzinfo] = None
 
         if isinstance(start_date, datetime) and isinstance(end_date, datetime):
             # both args are datetimes
@@ -52,26 +76,27 @@ class Kronos(object):
                     warnings.warn('Your start date and end date have different timezones. Converting to value provided in `timezone` (or default): {}'.format(timezone))
                 else:
                     # they have the same timezone! it's settled.
-                    self.tz = start_date.tzinfo
+                    tz = start_date.tzinfo
             elif bool(start_date.tzinfo) ^ bool(end_date.tzinfo):  # this is a logical XOR. bool is just a subclass of int (1 or 0). bitwise check works here.
                 # one of these is timezone-aware. use it
-                self.tz = start_date.tzinfo or end_date.tzinfo
+                tz = start_date.tzinfo or end_date.tzinfo
             else:
                 # neither are timezone-aware. fall back to default.
-                self.tz = make_timezone(timezone=timezone)
+                tz = make_timezone(timezone=timezone, backend=backend)
         elif isinstance(start_date, datetime) or isinstance(end_date, datetime):  # no logical XOR required here
             # one of them is a datetime object
             if timezone:
                 # user specified gave us a timezone to convert to. use it
-                self.tz = make_timezone(timezone=timezone)
+                tz = make_timezone(timezone=timezone, backend=backend)
             else:
                 # use the one they gave us on the dt object
-                self.tz = start_date.tzinfo or end_date.tzinfo
+                tz = start_date.tzinfo or end_date.tzinfo
         
-        if self.tz is None:
+        if tz is None:
             if not timezone:
                 timezone = DEFAULT_TZ
-            self.tz = make_timezone(timezone=timezone)
+            tz = make_timezone(timezone=timezone, backend=backend)
+        self.tz: tzinfo = tz
 
         self.date_format = date_format
 
@@ -95,52 +120,153 @@ class Kronos(object):
                     start_date = handle_ambiguous_datetime(start_date, self.tz, self.date_format)
                 else:
                     # default to yesterday
-                    start_date = (datetime.now(tz=self.tz) - timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=999999)
+                    start_date = (clock.now(self.tz) - timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=999999)
 
                 if end_date:
                     # handle ene date as either string or datetime object (and localize)
                     end_date = handle_ambiguous_datetime(end_date, self.tz, self.date_format)
                 else:
                     # default to today
-                    end_date = datetime.now(tz=self.tz).replace(hour=23, minute=59, second=59, microsecond=999999)
+                    end_date = clock.now(self.tz).replace(hour=23, minute=59, second=59, microsecond=999999)
 
-        # set start and end times to midnight if not given in input string
-        if not any([start_date.hour, start_date.minute, start_date.second, start_date.microsecond]):
-            start_date = start_date.replace(hour=0, minute=0, second=0, microsecond=0)
+        # set end time to 23:59:59.999999 if not given in input string (start time is already midnight).
+        # re-localize rather than `replace` so the UTC offset is correct on DST transition days
         if not any([end_date.hour, end_date.minute, end_date.second, end_date.microsecond]):
-            end_date = end_date.replace(hour=23, minute=59, second=59, microsecond=999999)
+            end_date = localize(datetime.combine(end_date.date(), time.max), self.tz)
 
         if start_date > end_date:
             raise ValueError('`start_date` cannot come after `end_date`.')
         
         self._start_date = start_date
         self._end_date = end_date
+        self._formatted: Dict[Tuple[str, str], str] = {}
+
+    @classmethod
+    def _from_bounds(cls, start_date: datetime, end_date: datetime, tz: pytz.BaseTzInfo, date_format: str) -> Kronos:
+        """ Build a Kronos object from bounds that are already localized to `tz`, skipping the parsing in `__init__`.
+
+        :param start_date: timezone-aware start datetime
+        :type start_date: datetime
+        :param end_date: timezone-aware end datetime
+        :type end_date: datetime
+        :param tz: the timezone both bounds are localized to
+        :type tz: pytz.BaseTzInfo
+        :param date_format: strftime format string for the new object
+        :type date_format: str
+        :return: a new Kronos object (of the calling class)
+        :rtype: Kronos
+        """
+        kronos = cls.__new__(cls)
+        kronos.tz = tz
+        kronos.date_format = date_format
+        kronos._start_date = start_date
+        kronos._end_date = end_date
+        kronos._formatted = {}
+        return kronos
+
+    def to_range(self) -> DateRange:
+        """ Get this range as a compact, immutable and hashable `DateRange` (two epoch integers and a timezone key).
+
+        :return: the equivalent DateRange
+        :rtype: DateRange
+        """
+        return DateRange(to_epoch_us(self._start_date), to_epoch_us(self._end_date), self.tz)
+
+    @classmethod
+    def from_range(cls, date_range: DateRange, date_format: str = DEFAULT_FORMAT) -> Kronos:
+        """ Build a Kronos object from a `DateRange`.
+
+        :param date_range: the range to convert
+        :type date_range: DateRange
+        :param date_format: strftime format string for the new object, defaults to DEFAULT_FORMAT
+        :type date_format: str, optional
+        :return: a new Kronos object
+        :rtype: Kronos
+        """
+        return cls._from_bounds(date_range.start, date_range.end, date_range.timezone, date_format)
+
+    def to_dict(self) -> dict:
+        """ Get this range as a JSON-friendly dict: bounds as epoch microseconds, timezone key and date format.
+
+        :raises ValueError: if the timezone has no name (see `ranges.timezone_key`)
+        :return: {"start_us": int, "end_us": int, "timezone": str, "date_format": str}
+        :rtype: dict
+        """
+        return serialization.to_dict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> Kronos:
+        """ Build a Kronos object from the output of `to_dict`, skipping the parsing in `__init__`.
+
+        :param data: a dict from `to_dict`
+        :type data: dict
+        :return: a new Kronos object
+        :rtype: Kronos
+        """
+        return serialization.from_dict(cls, data)
+
+    def __reduce__(self):
+        # pickle as two epoch integers, a timezone key and the format rather than two pytz datetimes and a tzinfo --
+        # unless a bound's offset is not the one its zone has at that instant, which only the datetime itself keeps
+        state = {name: value for name, value in vars(self).items() if name not in _CORE_ATTRIBUTES}
+        table = transition_table(self.tz)
+        start_us = serialization.exact_epoch_us(self._start_date, table)
+        end_us = serialization.exact_epoch_us(self._end_date, table)
+        if start_us is None or end_us is None:
+            restore, args = type(self)._from_bounds, (self._start_date, self._end_date, self.tz, self.date_format)
+        else:
+            restore = serialization.restore_kronos
+            args = (type(self), start_us, end_us, serialization.portable_timezone(self.tz), self.date_format)
+        return (restore, args, state) if state else (restore, args)
 
     @property
     def start_date(self) -> str:
-        return self._start_date.strftime(self.date_format)
+        return self._format_bound('start')
 
     @property
     def end_date(self) -> str:
-        return self._end_date.strftime(self.date_format)
+        return self._format_bound('end')
+
+    def _format_bound(self, bound: str) -> str:
+        """ The start or end date in `date_format`. Cached per format until `set_start_time`, `set_end_time` or
+        `change_timezone` moves the bounds.
+
+        :param bound: "start" or "end"
+        :type bound: str
+        :return: the formatted bound
+        :rtype: str
+        """
+        key = (bound, self.date_format)
+        try:
+            return self._formatted[key]
+        except KeyError:
+            dt = self._start_date if bound == 'start' else self._end_date
+            formatted = self._formatted[key] = compile_formatter(self.date_format).format(dt)
+            return formatted
     
     @property
     def timezone(self) -> str:
         """ Timezone name set at self.tz """
-        return self.tz.zone
+        return zone_name(self.tz)
+
+    @property
+    def backend(self) -> Optional[str]:
+        """ Name of the timezone backend that made self.tz ("pytz" or "zoneinfo"), or None for other tzinfo objects.
+        Timezone names given to this object's methods are resolved with the same backend. """
+        return backend_of(self.tz).name
 
     @property
     def current_date(self) -> datetime:
-        """ Return the current local date as a datetime object. """
-        return datetime.now(tz=self.tz)
+        """ Return the current local date as a datetime object (see `clock` to control what "current" means). """
+        return clock.now(self.tz)
 
     @property
     def today(self) -> str:
-        return self.current_date.strftime(self.date_format)
+        return compile_formatter(self.date_format).format(self.current_date)
 
     @property
     def yesterday(self):
-        return (self.current_date - timedelta(days=1)).strftime(self.date_format)
+        return compile_formatter(self.date_format).format(self.current_date - timedelta(days=1))
 
     @property
     def start_ts(self) -> float:
@@ -170,29 +296,96 @@ class Kronos(object):
         """ End date formatted as ISO-8601. """
         return self._end_date.isoformat()
 
+    def __contains__(self, item: Union[datetime, int, float]) -> bool:
+        """ Whether an instant falls inside the range (bounds included). Naive datetimes are read according to
+        `naive_policy`.
+
+        :param item: a datetime, or a unix timestamp in seconds, milliseconds, microseconds or nanoseconds (detected
+            from magnitude, see `from_timestamps`)
+        :type item: Union[datetime, int, float]
+        :raises TypeError: for a naive datetime when `naive_policy` is "raise", or an unsupported type
+        :rtype: bool
+        """
+        return to_epoch_us(self._start_date) <= self._instant_us(item) <= to_epoch_us(self._end_date)
+
+    def _instant_us(self, item: Union[datetime, int, float]) -> int:
+        """ A datetime or unix timestamp as UTC epoch microseconds, reading naive datetimes according to `naive_policy`. """
+        if isinstance(item, datetime):
+            if item.tzinfo is None:
+                self._check_naive_policy()
+                wall_us = (item - NAIVE_EPOCH) // ONE_MICROSECOND
+                if self.naive_policy == 'utc':
+                    return wall_us
+                return transition_table(self.tz).wall_to_utc(wall_us, ambiguous='latest')
+            return to_epoch_us(item)
+        if isinstance(item, (int, float)) and not isinstance(item, bool):
+            return epoch_to_us(item)
+        raise TypeError(f'Expected a datetime or unix timestamp, got `{type(item).__name__}`')
+
+    def _instants_us(self, values, unit: str = 'auto'):
+        """ Array version of `_instant_us`: int64 UTC epoch microseconds for timestamps, datetimes or a datetime64 array,
+        reading naive datetime64 values and naive datetimes according to `naive_policy`. """
+        np = import_numpy()
+        values = np.asarray(values)
+        if values.dtype.kind == 'O':
+            return np.fromiter((self._instant_us(value) for value in values.tolist()), dtype=np.int64, count=len(values))
+        instants = to_epoch_us_array(values, unit)
+        if values.dtype.kind == 'M':
+            self._check_naive_policy()
+            if self.naive_policy == 'localize':
+                instants = transition_table(self.tz).wall_to_utc_array(instants, ambiguous='latest')
+        return instants
+
+    def contains_mask(self, values, unit: str = 'auto'):
+        """ Vectorized `in`: a boolean mask of which values fall inside the range (bounds included). Requires numpy.
+
+        :param values: unix timestamps (see `from_timestamps` for units), a datetime64 array or datetimes. datetime64
+            values and naive datetimes are read according to `naive_policy` (as wall times in the range's timezone by
+            default), the same way `bucketize` reads them
+        :param unit: unit of numeric timestamps: "s", "ms", "us", "ns" or "auto" to detect it, defaults to "auto"
+        :type unit: str, optional
+        :raises TypeError: for naive values when `naive_policy` is "raise"
+        :return: boolean mask, one entry per value
+        :rtype: numpy.ndarray
+        """
+        instants = self._instants_us(values, unit)
+        return (instants >= to_epoch_us(self._start_date)) & (instants <= to_epoch_us(self._end_date))
+
+    def _check_naive_policy(self):
+        """ Validate `naive_policy` before reading a naive value, raising TypeError under "raise". """
+        if self.naive_policy not in NAIVE_POLICIES:
+            raise ValueError(f'`naive_policy` must be one of {NAIVE_POLICIES}. You sent: `{self.naive_policy}`')
+        if self.naive_policy == 'raise':
+            raise TypeError('Naive datetimes are not accepted (`naive_policy` is "raise"). Localize them first.')
+
     def set_start_time(self, hour: int = None, minute: int = None, second: int = None, microsecond: int = None):
         """ Set the time component for the start date late. Return `self`. """
         kwargs = {'hour': hour, 'minute': minute, 'second': second, 'microsecond': microsecond}
         self._start_date = self._start_date.replace(**{k: v for k, v in kwargs.items() if v})
+        self._formatted.clear()
         return self
     
     def set_end_time(self, hour: int = None, minute: int = None, second: int = None, microsecond: int = None):
         """ Set the time component for the end date late. Return `self`. """
         kwargs = {'hour': hour, 'minute': minute, 'second': second, 'microsecond': microsecond}
         self._end_date = self._end_date.replace(**{k: v for k, v in kwargs.items() if v})
+        self._formatted.clear()
         return self
 
     def change_timezone(self, tz: Union[pytz.BaseTzInfo, str]) -> Kronos:
-        """ Switch the timezone of the Kronos object without adjusting the time.
+        """ Switch the timezone of the Kronos object without adjusting the time. Wall times that do not exist in the new
+        timezone are shifted forward, as in `utilities.localize`.
 
         :param tz: either a pre-built BaseTzInfo object or a timezone name as string
         :type tz: Union[pytz.BaseTzInfo, str]
         :returns: self
         """
-        timezone = make_timezone(tz)
-        self._start_date = self._start_date.replace(tzinfo=timezone)
-        self._end_date = self._end_date.replace(tzinfo=timezone)
+        timezone = make_timezone(tz, backend=self.backend)
+        # localize the wall times again: `replace(tzinfo=...)` would attach a pytz zone's first (LMT) offset
+        self._start_date = localize(self._start_date.replace(tzinfo=None), timezone)
+        self._end_date = localize(self._end_date.replace(tzinfo=None), timezone)
         self.tz = timezone
+        self._formatted.clear()
         return self
     
     def parse_and_localize(self, dt_str: str, date_format: str, in_tz: Union[pytz.BaseTzInfo, str] = 'UTC', out_tz: Union[pytz.BaseTzInfo, str] = DEFAULT_TZ) -> datetime:
@@ -209,7 +402,35 @@ class Kronos(object):
         :return: original date string as a datetime object in the new timezone, `out_tz`.
         :rtype: datetime
         """
-        return convert_timezone(datetime.strptime(dt_str, date_format), in_tz=in_tz, out_tz=out_tz)
+        return convert_timezone(compile_parser(date_format).parse(dt_str), in_tz=in_tz, out_tz=out_tz)
+
+    @staticmethod
+    def parse_many(values: Iterable[str], date_format: str, in_tz: Union[pytz.BaseTzInfo, str] = 'UTC',
+                   out_tz: Union[pytz.BaseTzInfo, str] = DEFAULT_TZ, as_epoch: bool = False, ambiguous: str = 'latest',
+                   nonexistent: str = 'shift_forward') -> Union[List[datetime], 'numpy.ndarray']:
+        """ Batch version of `parse_and_localize`: parse many date strings in `date_format` and convert them from `in_tz`
+        to `out_tz`. ISO-8601 and other fixed-width formats are parsed by slicing rather than `strptime`, with the date
+        portion of each string memoized, and both timezones are resolved once for the whole batch.
+
+        :param values: date strings, or a numpy array of strings
+        :type values: Iterable[str]
+        :param date_format: the datetime format of every value
+        :type date_format: str
+        :param in_tz: input timezone, defaults to 'UTC'. values whose format includes `%z` carry their own offset
+        :type in_tz: Union[pytz.BaseTzInfo, str], optional
+        :param out_tz: output timezone, defaults to DEFAULT_TZ
+        :type out_tz: Union[pytz.BaseTzInfo, str], optional
+        :param as_epoch: return an int64 numpy array of UTC epoch microseconds instead of datetimes, defaults to False
+        :type as_epoch: bool, optional
+        :param ambiguous: "earliest", "latest" or "raise" for wall times that occur twice in `in_tz`, defaults to "latest"
+        :type ambiguous: str, optional
+        :param nonexistent: "shift_forward" or "raise" for wall times skipped in `in_tz`, defaults to "shift_forward"
+        :type nonexistent: str, optional
+        :return: datetimes in `out_tz`, or an int64 numpy array if `as_epoch`
+        :rtype: Union[List[datetime], numpy.ndarray]
+        """
+        return parse_many(values, date_format, in_tz=in_tz, out_tz=out_tz, as_epoch=as_epoch, ambiguous=ambiguous,
+                          nonexistent=nonexistent)
 
     @staticmethod
     def convert_date(dt_str: str, in_format: str, out_format: str) -> str:
@@ -224,8 +445,54 @@ class Kronos(object):
         :return: string-represented date in specified format
         :rtype: str
         """
-        parsed_date = datetime.strptime(dt_str, in_format)
-        return parsed_date.strftime(out_format)
+        parsed_date = compile_parser(in_format).parse(dt_str)
+        return compile_formatter(out_format).format(parsed_date)
+
+    @staticmethod
+    def convert_dates(rows: Iterable[Any], in_format: str, out_format: str, columns: Iterable[Union[int, str]] = None,
+                      chunk_size: int = CONVERT_CHUNK_SIZE, cache_size: int = CONVERT_CACHE_SIZE) -> Generator[Any]:
+        """ Streaming version of `convert_date`. Takes date strings -- or rows from a reader such as `csv.reader` /
+        `csv.DictReader` along with the `columns` holding dates -- and lazily yields them reformatted. Rows are read
+        `chunk_size` at a time and recently seen input strings are cached, so repetitive data is parsed once per
+        distinct value.
+
+        :param rows: date strings, or rows (sequences or mappings) holding date strings in `columns`
+        :type rows: Iterable[Any]
+        :param in_format: the input date format
+        :type in_format: str
+        :param out_format: the desired output date format
+        :type out_format: str
+        :param columns: indices or keys of the date fields in each row. if None, `rows` yields date strings
+        :type columns: Iterable[Union[int, str]], optional
+        :param chunk_size: number of rows read at a time, defaults to 1024
+        :type chunk_size: int, optional
+        :param cache_size: number of distinct input strings remembered, defaults to 4096
+        :type cache_size: int, optional
+        :yield: converted date strings, or rows with `columns` converted
+        :rtype: Generator[Any]
+        """
+        return convert_many(rows, in_format, out_format, columns=columns, chunk_size=chunk_size, cache_size=cache_size)
+
+    @staticmethod
+    def format_many(values: Iterable[Any], date_format: str, tz: Union[pytz.BaseTzInfo, str] = DEFAULT_TZ,
+                    unit: str = 'auto') -> List[Optional[str]]:
+        """ Batch counterpart to `format_start` / `format_end`: render many instants as strings in `date_format`, in
+        timezone `tz`. The date portion is formatted once per distinct local day and the time of day is filled in
+        arithmetically, so a column of timestamps spanning a few hundred days costs a few hundred `strftime` calls.
+
+        :param values: timezone-aware datetimes, naive datetimes (wall times in `tz`), unix timestamps, or a numpy
+            array of timestamps or datetime64 values. None and NaT come back as None
+        :type values: Iterable[Any]
+        :param date_format: the desired output date format
+        :type date_format: str
+        :param tz: output timezone, defaults to DEFAULT_TZ
+        :type tz: Union[pytz.BaseTzInfo, str], optional
+        :param unit: one of "s", "ms", "us", "ns", or "auto" to detect it, defaults to "auto"
+        :type unit: str, optional
+        :return: the formatted values
+        :rtype: List[Optional[str]]
+        """
+        return format_many(values, date_format, tz=tz, unit=unit)
 
     @staticmethod
     def from_timestamp(unix_timestamp: Union[int, float], in_timezone: Union[pytz.BaseTzInfo, str] = None, out_timezone: Union[pytz.BaseTzInfo, str] = None) -> datetime:
@@ -249,32 +516,232 @@ class Kronos(object):
 
         return dt
 
+    @staticmethod
+    def from_timestamps(timestamps, unit: str = 'auto', tz: Union[pytz.BaseTzInfo, str] = DEFAULT_TZ,
+                        output: str = 'datetime64') -> Union['numpy.ndarray', dict, List[datetime]]:
+        """ Vectorized counterpart to `from_timestamp`. Converts a whole array of unix timestamps to wall-clock time in
+        `tz` in one pass, with the unit detected from the values' magnitude unless given. Unlike `from_timestamp`,
+        timestamps are always read as UTC instants, never through the host's local timezone.
+
+        :param timestamps: unix timestamps as a numpy array, or any sequence of numbers
+        :param unit: one of "s", "ms", "us", "ns", or "auto" to detect it, defaults to "auto"
+        :type unit: str, optional
+        :param tz: output timezone, defaults to DEFAULT_TZ
+        :type tz: Union[pytz.BaseTzInfo, str], optional
+        :param output: "datetime64" (local wall times), "components" (dict of int64 arrays: year, month, day, hour,
+            minute, second, microsecond, utc_offset) or "datetime" (list of localized datetimes), defaults to "datetime64"
+        :type output: str, optional
+        :return: the converted timestamps
+        :rtype: Union[numpy.ndarray, dict, List[datetime]]
+        """
+        return from_timestamps(timestamps, unit=unit, tz=tz, output=output)
+
     def day_range(self) -> Generator[Kronos]:
         """ Yield one-day Kronos objects for each date between object's start and end date.
 
+        The first and last days are clamped to the object's own start and end times; every other day runs
+        from 00:00:00 to 23:59:59.999999 local time (23 or 25 hours long across a DST transition).
+
         :yield: a one-day Kronos object for each date between self's start and end date
         :rtype: Generator[Kronos]
         """
-        for day in rrule(DAILY, dtstart=self._start_date, until=self._end_date):
-            day = day.replace(tzinfo=self.tz)
-            if day.date() > self._end_date.date():
-                # I have no idea why this would be true, but it was...Kronos(start_date='2022-11-03', end_date='2022-11-08' ... ).day_range() was yielding a record for 2022-11-09. TODO: investigate this further
-                continue
-            if day.strftime(self.date_format) == self.start_date:
-                # change _end_date time to 29:59:59
-                ed = day.replace(hour=23, minute=59, second=59, microsecond=999999)
-                yield self.__class__(day.strftime(self.date_format), ed.strftime(self.date_format), date_format=self.date_format, timezone=self.tz)
-            elif day.strftime('%Y-%m-%d') == self.format_end('%Y-%m-%d'):
-                # change _start_date time to 00:00:00
-                # rrule uses the value of dtstart to carry over time parameters to each entry in the iterable. must ovveride with _end_date
-                sd = day.replace(hour=0, minute=0, second=0, microsecond=0)
-                ed = day.replace(hour=self._end_date.hour, minute=self._end_date.minute, second=self._end_date.second, microsecond=self._end_date.microsecond)
-                yield self.__class__(sd.strftime(self.date_format), ed.strftime(self.date_format), date_format=self.date_format, timezone=self.tz)
-            else:
-                # set new object's _start_date time to 00:00:00, and 23:59:59 for _end_date
-                sd = day.replace(hour=0, minute=0, second=0, microsecond=0)
-                ed = day.replace(hour=23, minute=59, second=59, microsecond=999999)
-                yield self.__class__(sd.strftime(self.date_format), ed.strftime(self.date_format), date_format=self.date_format, timezone=self.tz)
+        return self._iter_partitions('day')
+
+    def hour_range(self) -> Generator[Kronos]:
+        """ Yield one-hour Kronos objects for each local hour between object's start and end date. DST transitions
+        are respected, i.e. a fall-back day yields 25 hours and a spring-forward day yields 23.
+
+        :yield: a one-hour Kronos object for each hour between self's start and end date
+        :rtype: Generator[Kronos]
+        """
+        return self._iter_partitions('hour')
+
+    def week_range(self, week_start: Union[int, str] = 'MON') -> Generator[Kronos]:
+        """ Yield one-week Kronos objects for each week between object's start and end date.
+
+        :param week_start: first day of the week, either an int (Monday is 0) or an abbreviation like "SUN". defaults to "MON"
+        :type week_start: Union[int, str], optional
+        :yield: a one-week Kronos object for each week between self's start and end date
+        :rtype: Generator[Kronos]
+        """
+        return self._iter_partitions('week', week_start=week_start)
+
+    def month_range(self) -> Generator[Kronos]:
+        """ Yield one-month Kronos objects for each calendar month between object's start and end date.
+
+        :yield: a one-month Kronos object for each month between self's start and end date
+        :rtype: Generator[Kronos]
+        """
+        return self._iter_partitions('month')
+
+    def quarter_range(self) -> Generator[Kronos]:
+        """ Yield one-quarter Kronos objects for each calendar quarter between object's start and end date.
+
+        :yield: a one-quarter Kronos object for each quarter between self's start and end date
+        :rtype: Generator[Kronos]
+        """
+        return self._iter_partitions('quarter')
+
+    def business_day_range(self, calendar: HolidayCalendar = None) -> Generator[Kronos]:
+        """ Generator of Kronos objects for each business day in the range (see `day_range`), skipping weekends and the
+        calendar's holidays.
+
+        :param calendar: business-day calendar, defaults to weekends only (no holidays)
+        :type calendar: HolidayCalendar, optional
+        :yield: a Kronos object per business day
+        :rtype: Generator[Kronos]
+        """
+        calendar = calendar or WEEKDAYS
+        for start, end in iter_bounds(self._start_date, self._end_date, self.tz, 'day'):
+            if calendar.is_business_day(start.date()):
+                yield self._from_bounds(start, end, self.tz, self.date_format)
+
+    def count_business_days(self, calendar: HolidayCalendar = None) -> int:
+        """ Count the business days in the range, start and end dates included.
+
+        :param calendar: business-day calendar, defaults to weekends only (no holidays)
+        :type calendar: HolidayCalendar, optional
+        :return: number of business days
+        :rtype: int
+        """
+        return (calendar or WEEKDAYS).count(self._start_date.date(), self._end_date.date())
+
+    def add_business_days(self, n: int, calendar: HolidayCalendar = None) -> Kronos:
+        """ Shift both ends of the range by `n` business days (backward if `n` is negative), keeping their times of day.
+        A start or end date that is not a business day first rolls to the nearest business day in the direction of the
+        shift, like `numpy.busday_offset`.
+
+        :param n: number of business days to shift by
+        :type n: int
+        :param calendar: business-day calendar, defaults to weekends only (no holidays)
+        :type calendar: HolidayCalendar, optional
+        :return: the shifted Kronos object
+        :rtype: Kronos
+        """
+        calendar = calendar or WEEKDAYS
+        start, end = (
+            localize(datetime.combine(calendar.add(bound.date(), n), bound.time()), self.tz)
+            for bound in (self._start_date, self._end_date)
+        )
+        return self._from_bounds(start, end, self.tz, self.date_format)
+
+    def boundaries(self, granularity: str = 'day', week_start: Union[int, str] = 'MON', as_datetime64: bool = False) -> tuple:
+        """ Get the start and end of every `granularity` partition in the range as contiguous numpy arrays, computed in
+        bulk from the timezone's UTC offset transitions. Partitions match those yielded by `day_range`, `hour_range`,
+        etc. Requires numpy.
+
+        Epoch arrays are ready for vectorized bucketing, e.g. `numpy.searchsorted(starts, event_us, side='right') - 1`.
+
+        :param granularity: one of "hour", "day", "week", "month" or "quarter", defaults to "day"
+        :type granularity: str, optional
+        :param week_start: first day of the week for "week", as an int (Monday is 0) or abbreviation. defaults to "MON"
+        :type week_start: Union[int, str], optional
+        :param as_datetime64: return `datetime64[us]` arrays (UTC) plus the local UTC offset, in seconds, at each partition
+            start, instead of epoch microseconds. defaults to False
+        :type as_datetime64: bool, optional
+        :return: (starts, ends) as int64 microseconds since the epoch, or (starts, ends, offsets) if `as_datetime64`
+        :rtype: tuple
+        """
+        starts, ends = boundary_arrays(self._start_date, self._end_date, self.tz, granularity, week_start)
+        if not as_datetime64:
+            return starts, ends
+        offsets = transition_table(self.tz).offsets_at_utc_array(starts) // 10 ** 6
+        return starts.astype('datetime64[us]'), ends.astype('datetime64[us]'), offsets
+
+    def bucketize(self, timestamps, granularity: str = 'day', week_start: Union[int, str] = 'MON', unit: str = 'auto'):
+        """ Assign every timestamp to the `granularity` partition of the range it falls in, with one binary search over
+        the partition boundaries (see `boundaries`) for the whole array. Indices count partitions in the order
+        `day_range`, `hour_range`, etc. yield them. Requires numpy.
+
+        :param timestamps: unix timestamps (see `from_timestamps` for units), a datetime64 array or datetimes. datetime64
+            values and naive datetimes are read according to `naive_policy` (as wall times in the range's timezone by
+            default), the same way `contains_mask` reads them
+        :param granularity: one of "hour", "day", "week", "month" or "quarter", defaults to "day"
+        :type granularity: str, optional
+        :param week_start: first day of the week for "week", as an int (Monday is 0) or abbreviation. defaults to "MON"
+        :type week_start: Union[int, str], optional
+        :param unit: unit of numeric timestamps: "s", "ms", "us", "ns" or "auto" to detect it, defaults to "auto"
+        :type unit: str, optional
+        :raises TypeError: for naive values when `naive_policy` is "raise"
+        :return: int64 array of partition indices, -1 for timestamps outside the range
+        :rtype: numpy.ndarray
+        """
+        starts, ends = boundary_arrays(self._start_date, self._end_date, self.tz, granularity, week_start)
+        return bucket_indices(starts, int(ends[-1]), self._instants_us(timestamps, unit))
+
+    def map_parallel(self, func: Callable[[Kronos], Any], granularity: str = 'day', workers: int = None,
+                     chunksize: int = 1, ordered: bool = True, week_start: Union[int, str] = 'MON') -> Generator[Any]:
+        """ Run `func` over every `granularity` partition of the range (see `day_range`, etc.) in a process pool.
+        Partitions are shipped to the workers as epoch integer pairs and rebuilt there, rather than pickled as Kronos
+        objects.
+
+        :param func: a picklable (module-level) function taking a Kronos object
+        :type func: Callable[[Kronos], Any]
+        :param granularity: one of "hour", "day", "week", "month" or "quarter", defaults to "day"
+        :type granularity: str, optional
+        :param workers: number of worker processes, defaults to the number of CPUs
+        :type workers: int, optional
+        :param chunksize: number of partitions sent to a worker per task, defaults to 1
+        :type chunksize: int, optional
+        :param ordered: yield results in partition order (True) or as soon as they complete (False), defaults to True
+        :type ordered: bool, optional
+        :param week_start: first day of the week for "week", as an int (Monday is 0) or abbreviation. defaults to "MON"
+        :type week_start: Union[int, str], optional
+        :yield: the result of `func` for each partition
+        :rtype: Generator[Any]
+        """
+        from .execution import map_partitions
+
+        bounds = ((to_epoch_us(start), to_epoch_us(end))
+                  for start, end in iter_bounds(self._start_date, self._end_date, self.tz, granularity, week_start))
+        return map_partitions(func, bounds, serialization.portable_timezone(self.tz), self.date_format, workers=workers,
+                              chunksize=chunksize, ordered=ordered)
+
+    def aiter_range(self, granularity: str = 'day', week_start: Union[int, str] = 'MON') -> AsyncGenerator[Kronos]:
+        """ Async version of `day_range`, `hour_range`, etc. for use with `async for`. `async for day in kronos` is
+        short for `async for day in kronos.aiter_range('day')`.
+
+        :param granularity: one of "hour", "day", "week", "month" or "quarter", defaults to "day"
+        :type granularity: str, optional
+        :param week_start: first day of the week for "week", as an int (Monday is 0) or abbreviation. defaults to "MON"
+        :type week_start: Union[int, str], optional
+        :yield: a Kronos object per partition
+        :rtype: AsyncGenerator[Kronos]
+        """
+        from .execution import aiter_partitions
+
+        return aiter_partitions(self._iter_partitions(granularity, week_start))
+
+    def __aiter__(self) -> AsyncGenerator[Kronos]:
+        return self.aiter_range('day')
+
+    def amap(self, coro_fn: Callable[[Kronos], Awaitable], granularity: str = 'day', concurrency: int = 8,
+             ordered: bool = True, week_start: Union[int, str] = 'MON') -> AsyncGenerator[Any]:
+        """ Await `coro_fn` for every `granularity` partition of the range, with at most `concurrency` coroutines in
+        flight. Use with `async for`. The first exception cancels the coroutines still running and propagates.
+
+        :param coro_fn: coroutine function taking a Kronos object
+        :type coro_fn: Callable[[Kronos], Awaitable]
+        :param granularity: one of "hour", "day", "week", "month" or "quarter", defaults to "day"
+        :type granularity: str, optional
+        :param concurrency: maximum number of coroutines running at once, defaults to 8
+        :type concurrency: int, optional
+        :param ordered: yield results in partition order (True) or as soon as they complete (False), defaults to True
+        :type ordered: bool, optional
+        :param week_start: first day of the week for "week", as an int (Monday is 0) or abbreviation. defaults to "MON"
+        :type week_start: Union[int, str], optional
+        :yield: the result of `coro_fn` for each partition
+        :rtype: AsyncGenerator[Any]
+        """
+        from .execution import amap_partitions
+
+        return amap_partitions(coro_fn, self._iter_partitions(granularity, week_start), concurrency=concurrency,
+                               ordered=ordered)
+
+    def _iter_partitions(self, granularity: str, week_start: Union[int, str] = 'MON') -> Generator[Kronos]:
+        """ Yield a Kronos object (of the calling class) for each `granularity` partition of the range. """
+        for start_date, end_date in iter_bounds(self._start_date, self._end_date, self.tz, granularity, week_start):
+            yield self._from_bounds(start_date, end_date, self.tz, self.date_format)
 
     def now(self, timezone: Union[pytz.BaseTzInfo, str] = None) -> datetime:
         """ Convenience func to return current local time specified by `timezone`. 
@@ -283,11 +750,11 @@ class Kronos(object):
         :return: datetime object
         """
         if timezone:
-            tz = make_timezone(timezone=timezone)
+            tz = make_timezone(timezone=timezone, backend=self.backend)
         else:
             tz = self.tz
 
-        return datetime.now(tz=tz)
+        return clock.now(tz)
 
     def last_x_days(self, x: int = 30) -> Kronos:
         """ Get the last `x` days since today.
@@ -295,8 +762,9 @@ class Kronos(object):
         :param x: number of days to go back, defaults to 30
         :type x: int, optional
         """
-        start_date = self.now() - timedelta(days=x)
-        return self.__class__(start_date=start_date.strftime('%Y-%m-%d'), end_date=self.now().strftime('%Y-%m-%d'))
+        end_date = self.now()
+        start_date = end_date - timedelta(days=x)
+        return self.__class__(start_date=start_date.strftime('%Y-%m-%d'), end_date=end_date.strftime('%Y-%m-%d'))
     
     def list_date_range(self) -> List[datetime]:
         """ List all dates in the Kronos daterange as datetime objects.
@@ -304,6 +772,8 @@ class Kronos(object):
         :return: a list of each day in the range
         :rtype: List[datetime]
         """
+        from dateutil.rrule import rrule, DAILY
+
         return list(rrule(freq=DAILY, dtstart=self._start_date, until=self._end_date))
 
     def format_start(self, out_format: str) -> str:
@@ -312,7 +782,7 @@ class Kronos(object):
         :param out_format: a valid strftime format
         :return: start date string in out_format
         """
-        return self._start_date.strftime(out_format)
+        return compile_formatter(out_format).format(self._start_date)
 
     def format_end(self, out_format: str) -> str:
         """ Return end date in specified format.
@@ -320,7 +790,7 @@ class Kronos(object):
         :param out_format: a valid strftime format
         :return: end date string in out_format
         """
-        return self._end_date.strftime(out_format)
+        return compile_formatter(out_format).format(self._end_date)
 
     def shift_start_tz(self, target_tz: Union[pytz.BaseTzInfo, str] = 'UTC') -> datetime:
         """ Shift the start_date timezone from self.tz to a timezone specified by `target_tz`
@@ -329,7 +799,7 @@ class Kronos(object):
         :type target_tz: Union[pytz.BaseTzInfo, str]
         :return: timezone-aware datetime object
         """
-        return self._start_date.astimezone(tz=make_timezone(target_tz))
+        return self._start_date.astimezone(tz=make_timezone(target_tz, backend=self.backend))
 
     def shift_end_tz(self, target_tz: Union[pytz.BaseTzInfo, str] = 'UTC') -> datetime:
         """ Shift the end_date timezone from self.tz to a timezone specified by `target_tz`
@@ -338,7 +808,7 @@ class Kronos(object):
         :type target_tz: Union[pytz.BaseTzInfo, str]
         :return: timezone-aware datetime object
         """
-        return self._end_date.astimezone(tz=make_timezone(target_tz))
+        return self._end_date.astimezone(tz=make_timezone(target_tz, backend=self.backend))
     
     def shift_range(self, **kwargs) -> Kronos:
         """ Shift a Kronos daterange back with relative kwargs. Basically this is a convenience 
@@ -354,6 +824,40 @@ class Kronos(object):
         new_end = (self._end_date + timedelta(**kwargs)).strftime(self.date_format)
         return self.__class__(new_start, new_end)
     
+    def partition(self, n: int, granularity: str = 'day', weights: Union[Sequence[float], Callable[[datetime], float]] = None,
+                  week_start: Union[int, str] = 'MON') -> List[Kronos]:
+        """ Split the range into `n` contiguous sub-ranges along `granularity` partitions (see `day_range`, etc.), with
+        an equal number of partitions each or, given `weights`, an equal total weight each -- e.g. to hand balanced
+        chunks of a backfill to a pool of workers.
+
+        :param n: number of sub-ranges. fewer are returned if the range has fewer than `n` partitions
+        :type n: int
+        :param granularity: one of "hour", "day", "week", "month" or "quarter", defaults to "day"
+        :type granularity: str, optional
+        :param weights: cost of each partition: a sequence with one weight per partition, or a function called with each
+            partition's start datetime. defaults to equal weights
+        :type weights: Union[Sequence[float], Callable[[datetime], float]], optional
+        :param week_start: first day of the week for "week", as an int (Monday is 0) or abbreviation. defaults to "MON"
+        :type week_start: Union[int, str], optional
+        :raises ValueError: if `weights` does not have one weight per partition, or `n` is not positive
+        :return: the sub-ranges, in order
+        :rtype: List[Kronos]
+        """
+        bounds = list(iter_bounds(self._start_date, self._end_date, self.tz, granularity, week_start))
+        if weights is None:
+            weights = [1] * len(bounds)
+        elif callable(weights):
+            weights = [weights(start) for start, _ in bounds]
+        elif len(weights) != len(bounds):
+            raise ValueError(f'Expected {len(bounds)} weights (one per {granularity}), got {len(weights)}.')
+
+        chunks = []
+        first = 0
+        for cut in balanced_cuts(weights, n):
+            chunks.append(self._from_bounds(bounds[first][0], bounds[cut - 1][1], self.tz, self.date_format))
+            first = cut
+        return chunks
+
     def splice(self, in_dt: Union[datetime, str], fmt: str = DEFAULT_FORMAT) -> Tuple[Kronos, Kronos]:
         """ Bisect a Kronos daterange, returning two Kronos objects: one that starts at the original start date and ends at the input datetime, 
         and another that starts at the input datetime and ends at the original end date, i.e.:
@@ -373,5 +877,5 @@ class Kronos(object):
 
     def __repr__(self):
         return "{}(start_date='{}', end_date='{}', date_format='{}', timezone='{}')".format(
-            self.__class__.__name__, self.start_date, self.end_date, self.date_format, self.tz.zone
+            self.__class__.__name__, self.start_date, self.end_date, self.date_format, self.timezone
         )
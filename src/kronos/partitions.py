@@ -0,0 +1,237 @@
+""" Partition boundaries for splitting a localized date range into hours, days, weeks, months or quarters. """
+from __future__ import annotations
+
+from bisect import bisect_left
+from itertools import accumulate
+from typing import Union, Generator, Tuple, List, Sequence
+from datetime import datetime, timedelta, time, date
+
+import pytz
+
+from ._compat import import_numpy
+from .utilities import localize, shift_instant, to_epoch_us, WEEKDAY_NUMBERS
+from .transitions import transition_table
+
+GRANULARITIES = ('hour', 'day', 'week', 'month', 'quarter')
+
+ONE_HOUR = timedelta(hours=1)
+ONE_DAY = timedelta(days=1)
+ONE_MICROSECOND = timedelta(microseconds=1)
+HOUR_US = 3600 * 10 ** 6
+
+
+def resolve_weekday(weekday: Union[int, str]) -> int:
+    """ Resolve a weekday given as an int (Monday is 0, like `date.weekday()`) or an abbreviation such as "SUN".
+
+    :param weekday: weekday number or abbreviation (see `WEEKDAY_NUMBERS` for accepted abbreviations)
+    :type weekday: Union[int, str]
+    :raises ValueError: if the weekday is not recognized
+    :return: weekday number, 0-6
+    :rtype: int
+    """
+    if isinstance(weekday, int) and 0 <= weekday <= 6:
+        return weekday
+    if isinstance(weekday, str) and weekday.upper() in WEEKDAY_NUMBERS:
+        return WEEKDAY_NUMBERS[weekday.upper()]
+    raise ValueError(f'Weekday "{weekday}" is not accepted. Provide an int 0-6 (Monday is 0) or one of: {list(WEEKDAY_NUMBERS)}')
+
+
+def floor_date(day: date, granularity: str, week_start: int = 0) -> date:
+    """ Get the first date of the partition containing `day`.
+
+    :param day: any date
+    :type day: date
+    :param granularity: one of "day", "week", "month" or "quarter"
+    :type granularity: str
+    :param week_start: first day of the week, Monday is 0. only used for "week"
+    :type week_start: int
+    :return: the partition's first date
+    :rtype: date
+    """
+    if granularity == 'day':
+        return day
+    if granularity == 'week':
+        return day - timedelta(days=(day.weekday() - week_start) % 7)
+    if granularity == 'month':
+        return day.replace(day=1)
+    if granularity == 'quarter':
+        return day.replace(month=(day.month - 1) // 3 * 3 + 1, day=1)
+    raise ValueError(f'`granularity` must be one of {GRANULARITIES}. You sent: `{granularity}`')
+
+
+def next_date(day: date, granularity: str) -> date:
+    """ Get the first date of the partition following the one that starts on `day`.
+
+    :param day: the first date of a partition (see `floor_date`)
+    :type day: date
+    :param granularity: one of "day", "week", "month" or "quarter"
+    :type granularity: str
+    :return: the next partition's first date
+    :rtype: date
+    """
+    if granularity == 'day':
+        return day + ONE_DAY
+    if granularity == 'week':
+        return day + timedelta(days=7)
+    months = 1 if granularity == 'month' else 3
+    month = day.month - 1 + months
+    return day.replace(year=day.year + month // 12, month=month % 12 + 1)
+
+
+def iter_bounds(start: datetime, end: datetime, tz: pytz.BaseTzInfo, granularity: str = 'day',
+                week_start: Union[int, str] = 0) -> Generator[Tuple[datetime, datetime]]:
+    """ Yield (start, end) localized datetimes for every partition between `start` and `end`.
+
+    Each local boundary is computed once and used as both one partition's start and, less a microsecond, the previous
+    partition's end, so partitions are contiguous and DST-correct (a fall-back day in `America/New_York` spans 25
+    hours). The first and last partitions are clamped to `start` and `end`.
+
+    :param start: range start, localized to `tz`
+    :type start: datetime
+    :param end: range end, localized to `tz`
+    :type end: datetime
+    :param tz: timezone the boundaries are computed in
+    :type tz: pytz.BaseTzInfo
+    :param granularity: one of `GRANULARITIES`, defaults to "day"
+    :type granularity: str
+    :param week_start: first day of the week as an int (Monday is 0) or abbreviation. only used for "week"
+    :type week_start: Union[int, str]
+    :yield: (partition start, partition end)
+    :rtype: Generator[Tuple[datetime, datetime]]
+    """
+    if granularity == 'hour':
+        yield from _iter_hour_bounds(start, end, tz)
+        return
+
+    boundary = floor_date(start.date(), granularity, resolve_weekday(week_start))
+    last_day = end.date()
+    part_start = start
+    while True:
+        boundary = next_date(boundary, granularity)
+        if boundary > last_day:
+            break
+        midnight = localize(datetime.combine(boundary, time.min), tz, ambiguous='earliest')
+        yield part_start, shift_instant(midnight, -ONE_MICROSECOND, tz)
+        part_start = midnight
+    yield part_start, end
+
+
+def _iter_hour_bounds(start: datetime, end: datetime, tz: pytz.BaseTzInfo) -> Generator[Tuple[datetime, datetime]]:
+    """ Hourly flavor of `iter_bounds`. Hours are stepped in absolute time, so a 25-hour day yields 25 partitions. """
+    part_start = start
+    boundary = shift_instant(start, -timedelta(minutes=start.minute, seconds=start.second, microseconds=start.microsecond), tz)
+    while True:
+        boundary = shift_instant(boundary, ONE_HOUR, tz)
+        if boundary.minute or boundary.second or boundary.microsecond:
+            # a transition moved the clock by less than an hour (e.g. Australia/Lord_Howe) -- realign to the hour
+            aligned = shift_instant(boundary, -timedelta(minutes=boundary.minute, seconds=boundary.second, microseconds=boundary.microsecond), tz)
+            if aligned > part_start:
+                boundary = aligned
+        if boundary > end:
+            break
+        yield part_start, shift_instant(boundary, -ONE_MICROSECOND, tz)
+        part_start = boundary
+    yield part_start, end
+
+
+def boundary_arrays(start: datetime, end: datetime, tz: pytz.BaseTzInfo, granularity: str = 'day',
+                    week_start: Union[int, str] = 0):
+    """ Vectorized `iter_bounds`: the start and end of every partition as int64 arrays of UTC epoch microseconds.
+
+    Local boundaries are laid out with numpy date arithmetic and converted to UTC in bulk through the timezone's
+    transition table, so no per-partition datetime objects are created.
+
+    :param start: range start, localized to `tz`
+    :type start: datetime
+    :param end: range end, localized to `tz`
+    :type end: datetime
+    :param tz: timezone the boundaries are computed in
+    :type tz: pytz.BaseTzInfo
+    :param granularity: one of `GRANULARITIES`, defaults to "day"
+    :type granularity: str
+    :param week_start: first day of the week as an int (Monday is 0) or abbreviation. only used for "week"
+    :type week_start: Union[int, str]
+    :return: (starts, ends) as int64 numpy arrays
+    :rtype: Tuple[numpy.ndarray, numpy.ndarray]
+    """
+    np = import_numpy()
+    table = transition_table(tz)
+    start_us, end_us = to_epoch_us(start), to_epoch_us(end)
+
+    if granularity == 'hour':
+        # step through UTC hours, then snap each to the local hour (only moves anything for non-whole-hour offsets)
+        first_hour = start_us - start_us % HOUR_US
+        grid = np.arange(first_hour, end_us + HOUR_US, HOUR_US, dtype=np.int64)
+        boundaries = np.unique(grid - (grid + table.offsets_at_utc_array(grid)) % HOUR_US)
+    else:
+        first = floor_date(start.date(), granularity, resolve_weekday(week_start))
+        last = end.date()
+        if granularity in ('day', 'week'):
+            step = 1 if granularity == 'day' else 7
+            dates = np.arange(np.datetime64(first, 'D'), np.datetime64(last, 'D') + 1, step)
+        else:
+            step = 1 if granularity == 'month' else 3
+            dates = np.arange(np.datetime64(first, 'M'), np.datetime64(last, 'M') + 1, step).astype('datetime64[D]')
+        wall = dates.astype('datetime64[us]').astype(np.int64)
+        boundaries = table.wall_to_utc_array(wall, ambiguous='earliest', nonexistent='shift_forward')
+    boundaries = boundaries[(boundaries > start_us) & (boundaries <= end_us)]
+
+    starts = np.concatenate(([start_us], boundaries)).astype(np.int64)
+    ends = np.concatenate((boundaries - 1, [end_us])).astype(np.int64)
+    return starts, ends
+
+
+def bucket_indices(starts, end_us: int, instants):
+    """ Index of the partition containing each instant, by binary search over the sorted partition starts.
+
+    :param starts: int64 array of partition starts (see `boundary_arrays`)
+    :type starts: numpy.ndarray
+    :param end_us: end of the last partition (inclusive), epoch microseconds
+    :type end_us: int
+    :param instants: int64 array of UTC epoch microseconds
+    :type instants: numpy.ndarray
+    :return: int64 array of partition indices, -1 for instants outside the partitions
+    :rtype: numpy.ndarray
+    """
+    np = import_numpy()
+    indices = np.searchsorted(starts, instants, side='right').astype(np.int64) - 1
+    indices[instants > end_us] = -1
+    return indices
+
+
+def balanced_cuts(weights: Sequence[float], n: int) -> List[int]:
+    """ Split a sequence of weighted items into `n` contiguous, non-empty groups of (as near as possible) equal total
+    weight. Each cut is placed at the item boundary closest to the next multiple of `total / n` of the running total.
+
+    :param weights: non-negative weight of each item
+    :type weights: Sequence[float]
+    :param n: number of groups. capped at the number of items
+    :type n: int
+    :raises ValueError: if `n` is not positive or a weight is negative
+    :return: the index one past the last item of each group (the last one is `len(weights)`)
+    :rtype: List[int]
+    """
+    if n < 1:
+        raise ValueError(f'`n` must be a positive integer. You sent: `{n}`')
+    if any(weight < 0 for weight in weights):
+        raise ValueError('`weights` cannot be negative.')
+    count = len(weights)
+    n = min(n, count)
+    cumulative = list(accumulate(weights))
+    total = cumulative[-1] if cumulative else 0
+    if not total:
+        # nothing to balance -- split by item count instead
+        cumulative, total = list(range(1, count + 1)), count
+
+    cuts = []
+    previous = 0
+    for k in range(1, n):
+        target = total * k / n
+        cut = bisect_left(cumulative, target) + 1
+        if cut > 1 and target - cumulative[cut - 2] < cumulative[cut - 1] - target:
+            cut -= 1
+        # every group keeps at least one item
+        cut = min(max(cut, previous + 1), count - (n - k))
+        cuts.append(cut)
+        previous = cut
+    return cuts + [count] if count else []
@@ -0,0 +1,320 @@
+""" Compact, immutable date ranges stored as integer epoch microseconds, for holding very many of them at once. """
+from __future__ import annotations
+
+import sys
+from bisect import bisect_right
+from numbers import Integral
+from datetime import datetime, tzinfo
+from functools import total_ordering
+from typing import TYPE_CHECKING, Union, Dict, Tuple, Iterable, Iterator, List
+
+import pytz
+
+from .backends import BACKENDS, backend_of
+from .transitions import transition_table
+from .utilities import make_timezone, to_epoch_us
+
+if TYPE_CHECKING:
+    from .kronos import Kronos
+
+# tzinfo objects without a pytz zone name, by the key `timezone_key` made up for them
+_UNNAMED_TIMEZONES: Dict[str, tzinfo] = {}
+
+
+def timezone_key(tz: Union[pytz.BaseTzInfo, tzinfo, str]) -> str:
+    """ Get the interned string key a timezone is stored under in a `DateRange`. pytz zones (in any of their localized
+    flavors) are keyed by zone name and zones of other backends by "<backend>:<zone name>", e.g.
+    "zoneinfo:America/New_York"; other tzinfo objects are remembered so `resolve_timezone_key` can return them.
+
+    :param tz: a timezone object, a valid pytz timezone name or a key returned by this function
+    :type tz: Union[pytz.BaseTzInfo, tzinfo, str]
+    :return: the timezone's key
+    :rtype: str
+    """
+    if isinstance(tz, str):
+        prefix, separator, _ = tz.partition(':')
+        if tz in _UNNAMED_TIMEZONES or (separator and prefix in BACKENDS):
+            return sys.intern(tz)
+        # a pytz zone name, whatever the default backend is (see `resolve_timezone_key`)
+        return timezone_key(make_timezone(tz, backend='pytz'))
+    zone = getattr(tz, 'zone', None)
+    if zone is not None:
+        return sys.intern(zone)
+    backend = backend_of(tz)
+    name = backend.iana_name(tz)
+    if name is not None:
+        return sys.intern(f'{backend.name}:{name}')
+    key = sys.intern(f'{type(tz).__name__}:{tz!r}')
+    _UNNAMED_TIMEZONES.setdefault(key, tz)
+    return key
+
+
+def resolve_timezone_key(key: str) -> tzinfo:
+    """ The timezone a key from `timezone_key` stands for. """
+    tz = _UNNAMED_TIMEZONES.get(key)
+    if tz is not None:
+        return tz
+    backend, separator, name = key.partition(':')
+    if separator and backend in BACKENDS:
+        return make_timezone(name, backend=backend)
+    # unprefixed keys are pytz zone names, whatever the default backend is
+    return make_timezone(key, backend='pytz')
+
+
+@total_ordering
+class DateRange(object):
+    """ An immutable, hashable date range: inclusive start and end instants as integer microseconds since the epoch,
+    plus the interned key of the timezone they are shown in. Ranges sort by (start, end, timezone) and compare equal
+    only if all three match, so they can be dict keys and live in sorted containers. Use `Kronos.to_range` and
+    `Kronos.from_range` to go back and forth.
+    """
+
+    __slots__ = ('start_us', 'end_us', 'tz')
+    start_us: int
+    end_us: int
+    tz: str
+
+    def __init__(self, start_us: int, end_us: int, tz: Union[pytz.BaseTzInfo, tzinfo, str] = 'UTC'):
+        """ Build a range from epoch microseconds.
+
+        :param start_us: range start, microseconds since 1970-01-01 00:00:00 UTC
+        :type start_us: int
+        :param end_us: range end (inclusive), microseconds since 1970-01-01 00:00:00 UTC
+        :type end_us: int
+        :param tz: timezone the range is shown in, defaults to 'UTC'
+        :type tz: Union[pytz.BaseTzInfo, tzinfo, str], optional
+        :raises ValueError: if `start_us` comes after `end_us`
+        """
+        start_us, end_us = int(start_us), int(end_us)
+        if start_us > end_us:
+            raise ValueError('`start_us` cannot come after `end_us`.')
+        object.__setattr__(self, 'start_us', start_us)
+        object.__setattr__(self, 'end_us', end_us)
+        object.__setattr__(self, 'tz', timezone_key(tz))
+
+    @classmethod
+    def from_datetimes(cls, start: datetime, end: datetime, tz: Union[pytz.BaseTzInfo, tzinfo, str] = None) -> DateRange:
+        """ Build a range from two timezone-aware datetimes.
+
+        :param start: timezone-aware range start
+        :type start: datetime
+        :param end: timezone-aware range end (inclusive)
+        :type end: datetime
+        :param tz: timezone the range is shown in, defaults to `start`'s timezone
+        :type tz: Union[pytz.BaseTzInfo, tzinfo, str], optional
+        :return: a new range
+        :rtype: DateRange
+        """
+        return cls(to_epoch_us(start), to_epoch_us(end), tz if tz is not None else start.tzinfo)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f'{type(self).__name__} is immutable')
+
+    def __delattr__(self, name):
+        raise AttributeError(f'{type(self).__name__} is immutable')
+
+    def __reduce__(self):
+        return type(self), (self.start_us, self.end_us, resolve_timezone_key(self.tz))
+
+    def _key(self) -> Tuple[int, int, str]:
+        return self.start_us, self.end_us, self.tz
+
+    def __eq__(self, other):
+        if not isinstance(other, DateRange):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __lt__(self, other):
+        if not isinstance(other, DateRange):
+            return NotImplemented
+        return self._key() < other._key()
+
+    def __hash__(self):
+        return hash(self._key())
+
+    def __repr__(self):
+        return f'{type(self).__name__}({self.start.isoformat()!r}, {self.end.isoformat()!r}, {self.tz!r})'
+
+    @property
+    def timezone(self) -> tzinfo:
+        """ The range's timezone object. """
+        return resolve_timezone_key(self.tz)
+
+    @property
+    def start(self) -> datetime:
+        """ Range start as a datetime localized to the range's timezone. """
+        return transition_table(self.timezone).from_utc_us(self.start_us)
+
+    @property
+    def end(self) -> datetime:
+        """ Range end as a datetime localized to the range's timezone. """
+        return transition_table(self.timezone).from_utc_us(self.end_us)
+
+    @property
+    def duration_us(self) -> int:
+        """ Microseconds from start to end, counting the end (a whole day is 86400 * 10 ** 6). """
+        return self.end_us - self.start_us + 1
+
+
+class DateRangeSet(object):
+    """ A set of instants, kept as sorted, disjoint and non-adjacent intervals -- overlapping or touching ranges are
+    coalesced as they are added. Set operations are linear merges of the sorted intervals (O(n log n) counting the
+    initial sort) and containment queries are binary searches.
+
+    Ranges go in and come out as `DateRange` objects (or anything with a `to_range()` method, like `Kronos`), with
+    inclusive ends; internally each interval is half-open, `[start_us, end_us + 1)`.
+    """
+
+    __slots__ = ('_starts', '_stops', 'tz')
+    _starts: List[int]
+    _stops: List[int]
+    tz: str
+
+    def __init__(self, ranges: Iterable[Union[DateRange, 'Kronos']] = (), tz: Union[pytz.BaseTzInfo, tzinfo, str] = None):
+        """ Build a set from ranges.
+
+        :param ranges: DateRange objects, or objects with a `to_range()` method such as Kronos
+        :type ranges: Iterable[Union[DateRange, Kronos]]
+        :param tz: timezone the set's ranges are shown in. defaults to the timezone of the first range, or UTC
+        :type tz: Union[pytz.BaseTzInfo, tzinfo, str], optional
+        """
+        intervals = []
+        for date_range in ranges:
+            if not isinstance(date_range, DateRange):
+                date_range = date_range.to_range()
+            if tz is None:
+                tz = date_range.tz
+            intervals.append((date_range.start_us, date_range.end_us + 1))
+        self._starts, self._stops = _coalesce(intervals)
+        self.tz = timezone_key(tz if tz is not None else 'UTC')
+
+    @classmethod
+    def _from_intervals(cls, starts: List[int], stops: List[int], tz: str) -> DateRangeSet:
+        """ Wrap intervals that are already sorted and coalesced. """
+        range_set = cls.__new__(cls)
+        range_set._starts = starts
+        range_set._stops = stops
+        range_set.tz = tz
+        return range_set
+
+    def __iter__(self) -> Iterator[DateRange]:
+        for start, stop in zip(self._starts, self._stops):
+            yield DateRange(start, stop - 1, self.tz)
+
+    def __len__(self) -> int:
+        """ Number of disjoint ranges in the set. """
+        return len(self._starts)
+
+    def __bool__(self) -> bool:
+        return bool(self._starts)
+
+    def __eq__(self, other):
+        if not isinstance(other, DateRangeSet):
+            return NotImplemented
+        return self._starts == other._starts and self._stops == other._stops
+
+    def __repr__(self):
+        return f'{type(self).__name__}({list(self)!r})'
+
+    @property
+    def duration_us(self) -> int:
+        """ Total microseconds covered by the set. """
+        return sum(self._stops) - sum(self._starts)
+
+    def union(self, other: DateRangeSet) -> DateRangeSet:
+        """ Instants in either set. Also available as `self | other`. """
+        starts, stops = _coalesce(sorted(zip(self._starts + other._starts, self._stops + other._stops)), presorted=True)
+        return self._from_intervals(starts, stops, self.tz)
+
+    def intersection(self, other: DateRangeSet) -> DateRangeSet:
+        """ Instants in both sets. Also available as `self & other`. """
+        starts, stops = [], []
+        i = j = 0
+        while i < len(self._starts) and j < len(other._starts):
+            start = max(self._starts[i], other._starts[j])
+            stop = min(self._stops[i], other._stops[j])
+            if start < stop:
+                starts.append(start)
+                stops.append(stop)
+            if self._stops[i] < other._stops[j]:
+                i += 1
+            else:
+                j += 1
+        return self._from_intervals(starts, stops, self.tz)
+
+    def difference(self, other: DateRangeSet) -> DateRangeSet:
+        """ Instants in this set but not in `other`. Also available as `self - other`. """
+        starts, stops = [], []
+        j = 0
+        for start, stop in zip(self._starts, self._stops):
+            while j < len(other._starts) and other._stops[j] <= start:
+                j += 1
+            k = j
+            while k < len(other._starts) and other._starts[k] < stop:
+                if other._starts[k] > start:
+                    starts.append(start)
+                    stops.append(other._starts[k])
+                start = max(start, other._stops[k])
+                k += 1
+            if start < stop:
+                starts.append(start)
+                stops.append(stop)
+        return self._from_intervals(starts, stops, self.tz)
+
+    def complement(self, within: Union[DateRange, 'Kronos']) -> DateRangeSet:
+        """ Instants of the range `within` that are not in this set -- e.g. the parts of a job's range that still need
+        to be backfilled.
+
+        :param within: the range to complement within: a DateRange or an object with a `to_range()` method
+        :type within: Union[DateRange, Kronos]
+        :return: the uncovered parts of `within`
+        :rtype: DateRangeSet
+        """
+        return DateRangeSet([within], tz=self.tz).difference(self)
+
+    __or__ = union
+    __and__ = intersection
+    __sub__ = difference
+
+    def _index(self, instant: int) -> int:
+        """ Index of the interval containing `instant` (epoch microseconds), or -1. """
+        i = bisect_right(self._starts, instant) - 1
+        return i if i >= 0 and instant < self._stops[i] else -1
+
+    def __contains__(self, item: Union[int, datetime, DateRange, 'Kronos']) -> bool:
+        """ Whether an instant (epoch microseconds as any integer, numpy's included, or a timezone-aware datetime) is in
+        the set, or a range (DateRange or Kronos) lies entirely inside it.
+
+        :raises TypeError: for any other kind of item
+        """
+        if isinstance(item, (int, Integral)):
+            return self._index(int(item)) >= 0
+        if isinstance(item, datetime):
+            return self._index(to_epoch_us(item)) >= 0
+        if not isinstance(item, DateRange):
+            if not hasattr(item, 'to_range'):
+                raise TypeError(f'Expected epoch microseconds, a datetime or a range. You sent: `{type(item).__name__}`')
+            item = item.to_range()
+        i = self._index(item.start_us)
+        return i >= 0 and item.end_us < self._stops[i]
+
+    def overlaps(self, date_range: Union[DateRange, 'Kronos']) -> bool:
+        """ Whether any instant of `date_range` (a DateRange or an object with a `to_range()` method) is in the set. """
+        if not isinstance(date_range, DateRange):
+            date_range = date_range.to_range()
+        i = bisect_right(self._starts, date_range.end_us) - 1
+        return i >= 0 and self._stops[i] > date_range.start_us
+
+
+def _coalesce(intervals: Iterable[Tuple[int, int]], presorted: bool = False) -> Tuple[List[int], List[int]]:
+    """ Sort half-open (start, stop) intervals and merge the ones that overlap or touch. """
+    starts: List[int] = []
+    stops: List[int] = []
+    for start, stop in (intervals if presorted else sorted(intervals)):
+        if stops and start <= stops[-1]:
+            if stop > stops[-1]:
+                stops[-1] = stop
+        else:
+            starts.append(start)
+            stops.append(stop)
+    return starts, stops
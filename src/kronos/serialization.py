@@ -0,0 +1,179 @@
+""" A compact wire format for ranges. Each range is a fixed 20-byte record -- start and end as int64 epoch
+microseconds plus a timezone id and a date format id -- and a payload carries the timezone keys and formats its records
+refer to once, so thousands of partitions travel to workers or queues as one small `bytes` object::
+
+    payload = encode_ranges(Kronos('2023-01-01', '2023-12-31').day_range())
+    days = decode_ranges(payload)  # Kronos objects again, on the other side
+
+Pickling a Kronos object uses the same representation (`Kronos.__reduce__`), as do `Kronos.to_dict` / `from_dict`. """
+from __future__ import annotations
+
+import struct
+from datetime import datetime, tzinfo
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple, Type, Union
+
+from .ranges import DateRange, timezone_key, resolve_timezone_key, _UNNAMED_TIMEZONES
+from .transitions import TransitionTable, transition_table
+from .utilities import to_epoch_us, ONE_MICROSECOND
+
+if TYPE_CHECKING:
+    from .kronos import Kronos
+
+MAGIC = b'KRN\x01'
+# format id of ranges encoded without a date format (plain `DateRange` objects)
+NO_FORMAT = 0xFFFF
+
+_HEADER = struct.Struct('<4sHHI')  # magic, timezone count, format count, record count
+_LENGTH = struct.Struct('<H')
+RECORD = struct.Struct('<qqHH')  # start_us, end_us, timezone id, format id
+
+
+def portable_timezone(tz: tzinfo) -> Union[str, tzinfo]:
+    """ What to send in place of a timezone: its key (see `ranges.timezone_key`), or the tzinfo object itself if it has
+    no name another process could resolve. """
+    key = timezone_key(tz)
+    return tz if key in _UNNAMED_TIMEZONES else key
+
+
+def exact_epoch_us(dt: datetime, table: TransitionTable) -> Optional[int]:
+    """ `dt` as epoch microseconds, or None if rebuilding it from them would not give back the same wall time and
+    offset -- a datetime whose tzinfo is not the one its zone has at that instant. """
+    us = to_epoch_us(dt)
+    offset = dt.utcoffset()
+    return us if offset is not None and offset // ONE_MICROSECOND == table.offset_at_utc(us) else None
+
+
+def restore_kronos(cls: Type[Kronos], start_us: int, end_us: int, tz: Union[str, tzinfo], date_format: str):
+    """ Rebuild a Kronos object (of class `cls`) from its bounds as epoch microseconds. Used by `Kronos.__reduce__`. """
+    if isinstance(tz, str):
+        tz = resolve_timezone_key(tz)
+    table = transition_table(tz)
+    return cls._from_bounds(table.from_utc_us(start_us), table.from_utc_us(end_us), tz, date_format)
+
+
+def _named_key(tz: Any) -> str:
+    """ Timezone key of a range, refusing timezones that only this process can resolve. """
+    key = timezone_key(tz)
+    if key in _UNNAMED_TIMEZONES:
+        raise ValueError(f'Timezone `{key}` has no name and cannot be serialized.')
+    return key
+
+
+def _intern(table: Dict[str, int], value: str) -> int:
+    """ Id of `value` in a payload's string table, adding it if new. """
+    index = table.get(value)
+    if index is None:
+        index = table[value] = len(table)
+        if index >= NO_FORMAT:
+            raise ValueError(f'A payload can hold at most {NO_FORMAT} distinct timezones or formats.')
+    return index
+
+
+def _pack_strings(values: Iterable[str]) -> bytes:
+    chunks = []
+    for value in values:
+        encoded = value.encode()
+        chunks.append(_LENGTH.pack(len(encoded)))
+        chunks.append(encoded)
+    return b''.join(chunks)
+
+
+def encode_ranges(ranges: Iterable[Any], date_format: str = None) -> bytes:
+    """ Encode many ranges into one payload.
+
+    :param ranges: Kronos objects (encoded with their own date format) and/or `DateRange` objects
+    :type ranges: Iterable[Any]
+    :param date_format: date format recorded for `DateRange` objects, defaults to None (left to the decoder)
+    :type date_format: str, optional
+    :raises ValueError: if a range's timezone has no name (see `ranges.timezone_key`)
+    :return: the encoded ranges
+    :rtype: bytes
+    """
+    zones: Dict[str, int] = {}
+    formats: Dict[str, int] = {}
+    records = bytearray()
+    count = 0
+    for item in ranges:
+        if isinstance(item, DateRange):
+            start_us, end_us, key = item.start_us, item.end_us, _named_key(item.tz)
+            fmt = date_format
+        else:
+            start_us, end_us, key = to_epoch_us(item._start_date), to_epoch_us(item._end_date), _named_key(item.tz)
+            fmt = item.date_format
+        format_id = NO_FORMAT if fmt is None else _intern(formats, fmt)
+        records += RECORD.pack(start_us, end_us, _intern(zones, key), format_id)
+        count += 1
+    return b''.join((_HEADER.pack(MAGIC, len(zones), len(formats), count), _pack_strings(zones),
+                     _pack_strings(formats), records))
+
+
+def _unpack_strings(data: memoryview, offset: int, count: int) -> Tuple[List[str], int]:
+    values = []
+    for _ in range(count):
+        length, = _LENGTH.unpack_from(data, offset)
+        offset += _LENGTH.size
+        values.append(bytes(data[offset:offset + length]).decode())
+        offset += length
+    return values, offset
+
+
+def decode_ranges(data: bytes, as_ranges: bool = False, date_format: str = None, cls: Type[Kronos] = None) -> List[Any]:
+    """ Decode a payload from `encode_ranges`. Each timezone is resolved once, and Kronos objects are built straight
+    from their bounds, skipping the parsing in `Kronos.__init__`.
+
+    :param data: the payload
+    :type data: bytes
+    :param as_ranges: return `DateRange` objects instead of Kronos objects, defaults to False
+    :type as_ranges: bool, optional
+    :param date_format: date format of ranges encoded without one, defaults to `DEFAULT_FORMAT`
+    :type date_format: str, optional
+    :param cls: class of the returned objects, defaults to Kronos. ignored if `as_ranges`
+    :type cls: type, optional
+    :raises ValueError: if `data` is not a payload from `encode_ranges`
+    :return: the decoded ranges, in the order they were encoded
+    :rtype: List[Any]
+    """
+    view = memoryview(data)
+    if len(view) < _HEADER.size:
+        raise ValueError('Not an encoded range payload.')
+    magic, zone_count, format_count, count = _HEADER.unpack_from(view)
+    if magic != MAGIC:
+        raise ValueError('Not an encoded range payload.')
+    zones, offset = _unpack_strings(view, _HEADER.size, zone_count)
+    formats, offset = _unpack_strings(view, offset, format_count)
+    if len(view) - offset != count * RECORD.size:
+        raise ValueError('Truncated range payload.')
+    records = RECORD.iter_unpack(view[offset:])
+
+    if as_ranges:
+        zones = [timezone_key(key) for key in zones]
+        return [DateRange(start_us, end_us, zones[zone]) for start_us, end_us, zone, _ in records]
+
+    if cls is None or date_format is None:
+        from .kronos import Kronos, DEFAULT_FORMAT
+
+        cls = cls or Kronos
+        date_format = date_format or DEFAULT_FORMAT
+    timezones = [resolve_timezone_key(key) for key in zones]
+    tables = [transition_table(tz) for tz in timezones]
+    decoded = []
+    for start_us, end_us, zone, format_id in records:
+        table = tables[zone]
+        decoded.append(cls._from_bounds(table.from_utc_us(start_us), table.from_utc_us(end_us), timezones[zone],
+                                        date_format if format_id == NO_FORMAT else formats[format_id]))
+    return decoded
+
+
+def to_dict(kronos: Any) -> Dict[str, Any]:
+    """ See `Kronos.to_dict`. """
+    return {
+        'start_us': to_epoch_us(kronos._start_date),
+        'end_us': to_epoch_us(kronos._end_date),
+        'timezone': _named_key(kronos.tz),
+        'date_format': kronos.date_format,
+    }
+
+
+def from_dict(cls: Type[Kronos], data: Dict[str, Any]) -> Any:
+    """ See `Kronos.from_dict`. """
+    return restore_kronos(cls, data['start_us'], data['end_us'], data['timezone'], data['date_format'])
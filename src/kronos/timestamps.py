@@ -0,0 +1,158 @@
+""" Bulk conversion of unix timestamps to localized wall-clock values, one numpy pass per step instead of a
+`datetime.fromtimestamp` call per value. """
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Union, Dict, List
+from datetime import datetime
+
+import pytz
+
+from ._compat import import_numpy
+from .transitions import transition_table
+from .utilities import make_timezone, to_epoch_us
+
+if TYPE_CHECKING:
+    import numpy
+
+# microseconds per unit
+UNITS = {'s': 10 ** 6, 'ms': 10 ** 3, 'us': 1, 'ns': None}
+OUTPUTS = ('datetime64', 'components', 'datetime')
+
+# largest magnitude read as each unit by `detect_unit` -- 1e11 seconds is the year 5138, 1e11 milliseconds is 1973
+_UNIT_LIMITS = (('s', 1e11), ('ms', 1e14), ('us', 1e17))
+
+DAY_US = 86400 * 10 ** 6
+
+
+def detect_unit(timestamps) -> str:
+    """ Guess the unit of unix timestamps from their magnitude: anything below 1e11 is seconds, below 1e14 milliseconds,
+    below 1e17 microseconds and nanoseconds above that. Unambiguous for instants from 1973 to 5138.
+
+    :param timestamps: a numpy array of timestamps
+    :type timestamps: numpy.ndarray
+    :return: one of "s", "ms", "us" or "ns"
+    :rtype: str
+    """
+    np = import_numpy()
+    if not timestamps.size:
+        return 's'
+    magnitude = float(np.abs(timestamps).max())
+    for unit, limit in _UNIT_LIMITS:
+        if magnitude < limit:
+            return unit
+    return 'ns'
+
+
+def epoch_to_us(timestamp: Union[int, float], unit: str = 'auto') -> int:
+    """ Scalar `to_epoch_us_array`: convert one unix timestamp to integer epoch microseconds. Does not need numpy.
+
+    :param timestamp: a unix timestamp
+    :type timestamp: Union[int, float]
+    :param unit: one of "s", "ms", "us", "ns", or "auto" to detect it from magnitude (see `detect_unit`)
+    :type unit: str, optional
+    :raises ValueError: if the unit is not recognized
+    :return: microseconds since the epoch
+    :rtype: int
+    """
+    if unit == 'auto':
+        unit = unit_of(timestamp)
+    if unit not in UNITS:
+        raise ValueError(f'`unit` must be "auto" or one of {list(UNITS)}. You sent: `{unit}`')
+    scale = UNITS[unit]
+    if scale is None:  # nanoseconds
+        return int(timestamp // 1000)
+    if isinstance(timestamp, float):
+        return round(timestamp * scale)
+    return int(timestamp) * scale
+
+
+def unit_of(timestamp: Union[int, float]) -> str:
+    """ `detect_unit` for a single timestamp. Does not need numpy.
+
+    :param timestamp: a unix timestamp
+    :type timestamp: Union[int, float]
+    :return: one of "s", "ms", "us" or "ns"
+    :rtype: str
+    """
+    return next((unit for unit, limit in _UNIT_LIMITS if abs(timestamp) < limit), 'ns')
+
+
+def to_epoch_us_array(timestamps, unit: str = 'auto'):
+    """ Convert unix timestamps to an int64 array of epoch microseconds. Float timestamps are rounded to the nearest
+    microsecond, nanoseconds are floored. `datetime64` arrays (read as UTC) and timezone-aware datetimes are accepted
+    too, in which case `unit` is ignored.
+
+    :param timestamps: unix timestamps as a numpy array or any sequence of numbers, a datetime64 array, or a sequence of
+        timezone-aware datetimes
+    :param unit: one of "s", "ms", "us", "ns", or "auto" to detect it with `detect_unit`, defaults to "auto"
+    :type unit: str, optional
+    :raises ValueError: if the unit is not recognized or a timestamp is not finite
+    :return: epoch microseconds
+    :rtype: numpy.ndarray
+    """
+    np = import_numpy()
+    timestamps = np.asarray(timestamps)
+    if timestamps.dtype.kind == 'M':
+        return timestamps.astype('datetime64[us]').astype(np.int64)
+    if timestamps.dtype.kind == 'O':
+        return np.array([to_epoch_us(dt) for dt in timestamps.tolist()], dtype=np.int64)
+    if unit == 'auto':
+        unit = detect_unit(timestamps)
+    if unit not in UNITS:
+        raise ValueError(f'`unit` must be "auto" or one of {list(UNITS)}. You sent: `{unit}`')
+
+    if timestamps.dtype.kind == 'f':
+        if not np.isfinite(timestamps).all():
+            raise ValueError('timestamps must be finite')
+        scale = 1e-3 if unit == 'ns' else UNITS[unit]
+        return np.round(timestamps * scale).astype(np.int64)
+    timestamps = timestamps.astype(np.int64)
+    if unit == 'ns':
+        return timestamps // 1000
+    return timestamps * UNITS[unit]
+
+
+def from_timestamps(timestamps, unit: str = 'auto', tz: Union[pytz.BaseTzInfo, str] = 'UTC',
+                    output: str = 'datetime64') -> Union['numpy.ndarray', Dict[str, 'numpy.ndarray'], List[datetime]]:
+    """ Convert unix timestamps to wall-clock time in `tz`. UTC offsets come from the zone's transition table with one
+    `searchsorted` over the whole array.
+
+    :param timestamps: unix timestamps as a numpy array, or any sequence of numbers
+    :param unit: one of "s", "ms", "us", "ns", or "auto" to detect it from magnitude, defaults to "auto"
+    :type unit: str, optional
+    :param tz: timezone of the returned wall-clock values, defaults to 'UTC'
+    :type tz: Union[pytz.BaseTzInfo, str], optional
+    :param output: "datetime64" for a datetime64[us] array of local wall times, "components" for a dict of int64 arrays
+        (year, month, day, hour, minute, second, microsecond, utc_offset in seconds), or "datetime" for a list of
+        localized datetimes. defaults to "datetime64"
+    :type output: str, optional
+    :raises ValueError: if `unit` or `output` is not recognized
+    :return: the converted timestamps
+    :rtype: Union[numpy.ndarray, Dict[str, numpy.ndarray], List[datetime]]
+    """
+    if output not in OUTPUTS:
+        raise ValueError(f'`output` must be one of {OUTPUTS}. You sent: `{output}`')
+    np = import_numpy()
+    table = transition_table(make_timezone(tz))
+    utc = to_epoch_us_array(timestamps, unit)
+
+    if output == 'datetime':
+        return [table.from_utc_us(instant) for instant in utc.tolist()]
+    offsets = table.offsets_at_utc_array(utc)
+    wall = utc + offsets
+    if output == 'datetime64':
+        return wall.astype('datetime64[us]')
+
+    days = (wall // DAY_US).astype('datetime64[D]')
+    months = days.astype('datetime64[M]')
+    time_of_day = wall % DAY_US
+    return {
+        'year': days.astype('datetime64[Y]').astype(np.int64) + 1970,
+        'month': months.astype(np.int64) % 12 + 1,
+        'day': (days - months.astype('datetime64[D]')).astype(np.int64) + 1,
+        'hour': time_of_day // (3600 * 10 ** 6),
+        'minute': time_of_day // (60 * 10 ** 6) % 60,
+        'second': time_of_day // 10 ** 6 % 60,
+        'microsecond': time_of_day % 10 ** 6,
+        'utc_offset': offsets // 10 ** 6,
+    }
@@ -0,0 +1,336 @@
+""" UTC offset transition tables: a timezone's offset history flattened into sorted arrays, so localizing and
+converting become a binary search instead of a trip through the tzinfo machinery. """
+from __future__ import annotations
+
+import os
+import struct
+from bisect import bisect_right
+from collections.abc import Hashable
+from functools import lru_cache
+from datetime import datetime, timedelta, tzinfo
+from typing import List, Optional, Tuple
+
+import pytz
+from pytz.exceptions import AmbiguousTimeError, NonExistentTimeError
+
+from ._compat import import_numpy, import_zoneinfo
+
+EPOCH = datetime(1970, 1, 1)
+ONE_MICROSECOND = timedelta(microseconds=1)
+MIN_US = -(2 ** 62)  # sentinel start of the first period ("since forever")
+
+AMBIGUOUS_POLICIES = ('earliest', 'latest', 'raise')
+NONEXISTENT_POLICIES = ('shift_forward', 'raise')
+
+TRANSITION_CACHE_SIZE = 128
+
+# counts in a TZif header: isutcnt, isstdcnt, leapcnt, timecnt, typecnt, charcnt
+_TZIF_HEADER = struct.Struct('>6l')
+
+# generic tzinfo objects do not expose their transitions -- they are found by sampling this window daily
+_SCAN_START = datetime(1900, 1, 1)
+_SCAN_END = datetime(2100, 1, 1)
+
+
+def check_policies(ambiguous: str, nonexistent: str):
+    """ Validate `ambiguous` / `nonexistent` wall time policy names.
+
+    :raises ValueError: if either policy is not recognized
+    """
+    if ambiguous not in AMBIGUOUS_POLICIES:
+        raise ValueError(f'`ambiguous` must be one of {AMBIGUOUS_POLICIES}. You sent: `{ambiguous}`')
+    if nonexistent not in NONEXISTENT_POLICIES:
+        raise ValueError(f'`nonexistent` must be one of {NONEXISTENT_POLICIES}. You sent: `{nonexistent}`')
+
+
+def transition_table(tz: tzinfo) -> TransitionTable:
+    """ Get the (cached) transition table for a timezone. pytz zones are cached by name, so every localized flavor of
+    a zone (EST, EDT, ...) shares one table.
+
+    :param tz: a pytz timezone, or any other tzinfo object
+    :type tz: tzinfo
+    :return: the timezone's transition table
+    :rtype: TransitionTable
+    """
+    zone = getattr(tz, 'zone', None)
+    if zone is not None:
+        return _zone_table(zone)
+    if not isinstance(tz, Hashable):
+        # e.g. dateutil's tzfile, which defines __eq__ but not __hash__
+        return TransitionTable.from_timezone(tz)
+    return _tzinfo_table(tz)
+
+
+@lru_cache(maxsize=TRANSITION_CACHE_SIZE)
+def _zone_table(zone: str) -> TransitionTable:
+    return TransitionTable.from_timezone(pytz.timezone(zone))
+
+
+@lru_cache(maxsize=TRANSITION_CACHE_SIZE)
+def _tzinfo_table(tz: tzinfo) -> TransitionTable:
+    return TransitionTable.from_timezone(tz)
+
+
+def _offset_at(tz: tzinfo, seconds: int) -> int:
+    """ UTC offset of `tz`, in microseconds, at a UTC instant given as seconds since the epoch. """
+    offset = tz.fromutc((EPOCH + timedelta(seconds=seconds)).replace(tzinfo=tz)).utcoffset()
+    return 0 if offset is None else offset // ONE_MICROSECOND
+
+
+def _read_tzif(key: str) -> Optional[bytes]:
+    """ Read the TZif file of a zoneinfo zone the way `zoneinfo.ZoneInfo` finds it: the first match on `TZPATH`, then
+    the `tzdata` package. Returns None if there is no such file. """
+    for root in import_zoneinfo().TZPATH:
+        path = os.path.join(root, key)
+        if os.path.isfile(path):
+            with open(path, 'rb') as tzif:
+                return tzif.read()
+    package, _, resource = f'tzdata.zoneinfo.{key.replace("/", ".")}'.rpartition('.')
+    try:
+        from importlib import resources
+
+        return resources.read_binary(package, resource)
+    except (ImportError, OSError):
+        return None
+
+
+def _parse_tzif(data: bytes) -> Tuple[List[int], List[int], List[int], bytes]:
+    """ Parse a TZif file (RFC 8536), preferring the 64-bit data block of version 2+ files.
+
+    :param data: the file's contents
+    :type data: bytes
+    :raises ValueError: if `data` is not a TZif file
+    :return: (transition instants in epoch seconds, local time type index after each transition, UTC offset in seconds
+        of each local time type, footer POSIX TZ string)
+    :rtype: Tuple[List[int], List[int], List[int], bytes]
+    """
+    if data[:4] != b'TZif':
+        raise ValueError('not a TZif file')
+    counts, position, time_size = _TZIF_HEADER.unpack_from(data, 20), 44, 4
+    if data[4:5] >= b'2':
+        # skip the legacy 32-bit block and read the 64-bit one that follows it
+        isutcnt, isstdcnt, leapcnt, timecnt, typecnt, charcnt = counts
+        position += timecnt * 5 + typecnt * 6 + charcnt + leapcnt * 8 + isstdcnt + isutcnt
+        counts, position, time_size = _TZIF_HEADER.unpack_from(data, position + 20), position + 44, 8
+    isutcnt, isstdcnt, leapcnt, timecnt, typecnt, charcnt = counts
+    times = list(struct.unpack(f'>{timecnt}{"q" if time_size == 8 else "l"}', data[position:position + timecnt * time_size]))
+    position += timecnt * time_size
+    indices = list(data[position:position + timecnt])
+    position += timecnt
+    utc_offsets = [struct.unpack('>l', data[position + 6 * i:position + 6 * i + 4])[0] for i in range(typecnt)]
+    position += typecnt * 6 + charcnt + leapcnt * (time_size + 4) + isstdcnt + isutcnt
+    footer = data[position:].strip(b'\n') if time_size == 8 else b''
+    return times, indices, utc_offsets, footer
+
+
+class TransitionTable(object):
+    """ Sorted UTC transition instants and the offset in effect from each one on, all as int microseconds. Period `i`
+    runs from `utc[i]` (inclusive) to `utc[i + 1]` (exclusive) with UTC offset `offsets[i]`.
+    """
+
+    def __init__(self, utc: List[int], offsets: List[int], tzinfos: List[tzinfo]):
+        self.utc = utc
+        self.offsets = offsets
+        self.tzinfos = tzinfos
+        # local wall time at which each period starts -- what a wall-time lookup bisects over
+        self.wall = [t + o for t, o in zip(utc, offsets)]
+        # PEP 495 zones (zoneinfo, dateutil) use one tzinfo for every period and mark the second occurrence of a
+        # repeated wall time with `fold=1`; pytz zones have a tzinfo per period instead
+        self.fold = len(tzinfos) > 1 and all(info is tzinfos[0] for info in tzinfos)
+        self._arrays = None
+
+    @classmethod
+    def from_timezone(cls, tz: tzinfo) -> TransitionTable:
+        """ Extract the transition table for a timezone.
+
+        :param tz: a pytz timezone, or any other tzinfo object
+        :type tz: tzinfo
+        :return: the timezone's transition table
+        :rtype: TransitionTable
+        """
+        if isinstance(tz, pytz.tzinfo.DstTzInfo):
+            utc = [MIN_US] + [(t - EPOCH) // ONE_MICROSECOND for t in tz._utc_transition_times[1:]]
+            offsets = [info[0] // ONE_MICROSECOND for info in tz._transition_info]
+            return cls(utc, offsets, [tz._tzinfos[info] for info in tz._transition_info])
+        key = getattr(tz, 'key', None)
+        if isinstance(key, str):
+            # zoneinfo zone: read the same tz database file zoneinfo itself uses
+            data = _read_tzif(key)
+            if data is not None:
+                return cls._from_tzif(tz, data)
+        offset = tz.utcoffset(None)
+        if offset is not None:
+            # fixed-offset zone (UTC, pytz.StaticTzInfo, datetime.timezone)
+            return cls([MIN_US], [offset // ONE_MICROSECOND], [tz])
+        return cls._scan(tz)
+
+    @classmethod
+    def _from_tzif(cls, tz: tzinfo, data: bytes) -> TransitionTable:
+        """ Build a table for `tz` from its TZif file (RFC 8536). Transitions past the last one listed in the file --
+        which "slim" files leave to the POSIX rule in their footer -- are found by scanning `tz` up to `_SCAN_END`.
+
+        :param tz: the zone the file belongs to
+        :type tz: tzinfo
+        :param data: contents of the zone's TZif file
+        :type data: bytes
+        :return: the zone's transition table
+        :rtype: TransitionTable
+        """
+        times, indices, utc_offsets, footer = _parse_tzif(data)
+        utc = [MIN_US] + [t * 10 ** 6 for t in times]
+        offsets = [utc_offsets[0] * 10 ** 6] + [utc_offsets[i] * 10 ** 6 for i in indices]
+        if b',' in footer:
+            # the footer rule has DST: continue from the last listed transition
+            start = times[-1] if times else 0
+            end = int((_SCAN_END - EPOCH).total_seconds())
+            changes = cls._find_changes(tz, start, end, 28 * 86400, offsets[-1])
+            utc.extend(instant for instant, _ in changes)
+            offsets.extend(offset for _, offset in changes)
+        return cls(utc, offsets, [tz] * len(utc))
+
+    @classmethod
+    def _scan(cls, tz: tzinfo) -> TransitionTable:
+        """ Build a table for a tzinfo that does not expose its transitions by sampling its offset once a day from
+        `_SCAN_START` to `_SCAN_END`. """
+        start, end = (int((bound - EPOCH).total_seconds()) for bound in (_SCAN_START, _SCAN_END))
+        utc, offsets = [MIN_US], [_offset_at(tz, start)]
+        for instant, offset in cls._find_changes(tz, start, end, 86400, offsets[0]):
+            utc.append(instant)
+            offsets.append(offset)
+        return cls(utc, offsets, [tz] * len(utc))
+
+    @staticmethod
+    def _find_changes(tz: tzinfo, start: int, end: int, step: int, offset: int) -> List[Tuple[int, int]]:
+        """ Sample `tz`'s offset every `step` seconds from `start` to `end` (seconds since the epoch) and bisect each
+        change down to the second. `offset` is the offset (microseconds) in effect at `start`. Changes closer together
+        than `step` can be missed.
+
+        :return: (UTC instant in epoch microseconds, new offset in microseconds) of every change found
+        :rtype: List[Tuple[int, int]]
+        """
+        changes = []
+        for instant in range(start, end, step):
+            new_offset = _offset_at(tz, instant + step)
+            if new_offset != offset:
+                # the change happened in (low, high] -- narrow it down to the second
+                low, high = instant, instant + step
+                while high - low > 1:
+                    middle = (low + high) // 2
+                    if _offset_at(tz, middle) == offset:
+                        low = middle
+                    else:
+                        high = middle
+                changes.append((high * 10 ** 6, new_offset))
+                offset = new_offset
+        return changes
+
+    def period_at_utc(self, utc_us: int) -> int:
+        """ Index of the period containing a UTC instant (epoch microseconds). """
+        return bisect_right(self.utc, utc_us) - 1
+
+    def offset_at_utc(self, utc_us: int) -> int:
+        """ UTC offset, in microseconds, in effect at a UTC instant (epoch microseconds). """
+        return self.offsets[bisect_right(self.utc, utc_us) - 1]
+
+    def period_at_wall(self, wall_us: int, ambiguous: str = 'earliest', nonexistent: str = 'shift_forward') -> int:
+        """ Index of the period whose offset maps a local wall time (epoch microseconds, as if the wall time were UTC)
+        to UTC.
+
+        :param wall_us: local wall time as epoch microseconds
+        :type wall_us: int
+        :param ambiguous: wall times that occur twice resolve to the "earliest" or "latest" occurrence, or "raise"
+        :type ambiguous: str
+        :param nonexistent: wall times skipped by a transition either "shift_forward" (by the length of the gap) or
+            "raise"
+        :type nonexistent: str
+        :raises AmbiguousTimeError: for an ambiguous wall time under the "raise" policy
+        :raises NonExistentTimeError: for a nonexistent wall time under the "raise" policy
+        :return: period index. for a nonexistent time, the period before the gap
+        :rtype: int
+        """
+        i = bisect_right(self.wall, wall_us) - 1
+        if i > 0 and wall_us - self.offsets[i - 1] < self.utc[i]:
+            # still inside the previous period too: the clock was turned back over this wall time
+            if ambiguous == 'raise':
+                raise AmbiguousTimeError(f'{EPOCH + wall_us * ONE_MICROSECOND} is ambiguous')
+            return i - 1 if ambiguous == 'earliest' else i
+        if nonexistent == 'raise' and i + 1 < len(self.utc) and wall_us - self.offsets[i] >= self.utc[i + 1]:
+            # past the end of this period but before the next one starts: the clock skipped over this wall time
+            raise NonExistentTimeError(f'{EPOCH + wall_us * ONE_MICROSECOND} does not exist')
+        return i
+
+    def wall_to_utc(self, wall_us: int, ambiguous: str = 'earliest', nonexistent: str = 'shift_forward') -> int:
+        """ Convert a local wall time to a UTC instant, both as epoch microseconds. See `period_at_wall`. """
+        return wall_us - self.offsets[self.period_at_wall(wall_us, ambiguous, nonexistent)]
+
+    def localize(self, naive: datetime, ambiguous: str = 'earliest', nonexistent: str = 'shift_forward') -> datetime:
+        """ Attach this table's timezone to a naive datetime. See `period_at_wall` for the policies.
+
+        :param naive: a timezone-unaware datetime object
+        :type naive: datetime
+        :return: a localized datetime object
+        :rtype: datetime
+        """
+        wall_us = (naive - EPOCH) // ONE_MICROSECOND
+        i = self.period_at_wall(wall_us, ambiguous, nonexistent)
+        if i + 1 < len(self.utc) and wall_us - self.offsets[i] >= self.utc[i + 1]:
+            # shifted out of a DST gap: show the wall time after the transition
+            i += 1
+            naive += (self.offsets[i] - self.offsets[i - 1]) * ONE_MICROSECOND
+            return naive.replace(tzinfo=self.tzinfos[i])
+        return naive.replace(tzinfo=self.tzinfos[i], fold=self._fold(wall_us, i))
+
+    def from_utc_us(self, utc_us: int) -> datetime:
+        """ Build a datetime localized to this table's timezone from a UTC instant (epoch microseconds).
+
+        :param utc_us: microseconds since the epoch
+        :type utc_us: int
+        :return: a localized datetime object
+        :rtype: datetime
+        """
+        i = bisect_right(self.utc, utc_us) - 1
+        wall_us = utc_us + self.offsets[i]
+        wall = EPOCH + wall_us * ONE_MICROSECOND
+        if self._fold(wall_us, i):
+            return wall.replace(tzinfo=self.tzinfos[i], fold=1)
+        # the constructor is about twice as fast as `replace`
+        return datetime(wall.year, wall.month, wall.day, wall.hour, wall.minute, wall.second, wall.microsecond,
+                        self.tzinfos[i])
+
+    def _fold(self, wall_us: int, i: int) -> int:
+        """ `fold` for a wall time in period `i`: 1 if it is the second occurrence of a repeated wall time and the zone
+        tells occurrences apart by fold (see `self.fold`), else 0. """
+        return int(self.fold and i > 0 and wall_us - self.offsets[i - 1] < self.utc[i])
+
+    def arrays(self):
+        """ The table as numpy int64 arrays: (utc, offsets, wall). Built on first use. """
+        if self._arrays is None:
+            np = import_numpy()
+            self._arrays = tuple(np.array(values, dtype=np.int64) for values in (self.utc, self.offsets, self.wall))
+        return self._arrays
+
+    def offsets_at_utc_array(self, utc_us):
+        """ Vectorized `offset_at_utc` over an int64 array of UTC epoch microseconds. """
+        np = import_numpy()
+        utc, offsets, _ = self.arrays()
+        return offsets[np.searchsorted(utc, utc_us, side='right') - 1]
+
+    def wall_to_utc_array(self, wall_us, ambiguous: str = 'earliest', nonexistent: str = 'shift_forward'):
+        """ Vectorized `wall_to_utc` over an int64 array of local wall times as epoch microseconds. """
+        check_policies(ambiguous, nonexistent)
+        np = import_numpy()
+        utc, offsets, wall = self.arrays()
+        wall_us = np.asarray(wall_us, dtype=np.int64)
+        last = len(utc) - 1
+        i = np.searchsorted(wall, wall_us, side='right') - 1
+        previous = np.maximum(i - 1, 0)
+        following = np.minimum(i + 1, last)
+
+        is_ambiguous = (i > 0) & (wall_us - offsets[previous] < utc[i])
+        if ambiguous == 'raise' and is_ambiguous.any():
+            raise AmbiguousTimeError(f'{int(is_ambiguous.sum())} ambiguous wall time(s)')
+        if nonexistent == 'raise' and ((i < last) & (wall_us - offsets[i] >= utc[following])).any():
+            raise NonExistentTimeError('nonexistent wall time(s) found')
+
+        period = np.where(is_ambiguous & (ambiguous == 'earliest'), previous, i)
+        return wall_us - offsets[period]
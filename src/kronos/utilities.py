@@ -1,22 +1,61 @@
 import os
 import re
 import pytz
-from typing import Union, Tuple
-from datetime import datetime, timedelta, date
-from dateutil.relativedelta import relativedelta, SU, MO, TU, WE, TH, FR, SA
-
-REL_RANGE_MAP = {
-    'SUN': SU,
-    'MON': MO,
-    'TUES': TU,
-    'WED': WE,
-    'THURS': TH,
-    'FRI': FR,
-    'SAT': SA
+from typing import TYPE_CHECKING, Union, Tuple, Callable, Dict, List, Sequence, cast
+from datetime import datetime, timedelta, date, time, tzinfo
+
+from . import clock
+from ._compat import import_numpy
+from .backends import get_backend, backend_of
+from .transitions import transition_table, check_policies
+
+if TYPE_CHECKING:
+    import numpy
+
+# weekday abbreviations accepted throughout kronos, and their `date.weekday()` numbers
+WEEKDAY_NUMBERS = {
+    'SUN': 6,
+    'MON': 0,
+    'TUES': 1,
+    'WED': 2,
+    'THURS': 3,
+    'FRI': 4,
+    'SAT': 5
 }
 
 _VALID_RELATIVE_DAY_ABBRS = ['SUN', 'MON', 'TUES', 'WED', 'THURS', 'FRI', 'SAT']
 
+EPOCH = pytz.utc.localize(datetime(1970, 1, 1))
+NAIVE_EPOCH = datetime(1970, 1, 1)
+ONE_MICROSECOND = timedelta(microseconds=1)
+
+NAMED_RANGE_CACHE_SIZE = 1024
+
+_NAMED_RANGES: List[Tuple[re.Pattern, Callable]] = []  # (compiled pattern, handler), see `register_named_range`
+_named_range_cache: Dict[tuple, Tuple[datetime, datetime]] = {}
+
+
+def __getattr__(name: str):
+    """ Build `REL_RANGE_MAP` (abbreviation -> `dateutil.relativedelta` weekday) on first access, so importing kronos
+    does not import dateutil. """
+    if name == 'REL_RANGE_MAP':
+        from dateutil.relativedelta import weekday
+
+        value = globals()[name] = {abbr: weekday(number) for abbr, number in WEEKDAY_NUMBERS.items()}
+        return value
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+def to_epoch_us(dt: datetime) -> int:
+    """ Convert a timezone-aware datetime to integer microseconds since the unix epoch (exact, unlike `timestamp()`).
+
+    :param dt: a timezone-aware datetime object
+    :type dt: datetime
+    :return: microseconds since 1970-01-01 00:00:00 UTC
+    :rtype: int
+    """
+    return (dt - EPOCH) // ONE_MICROSECOND
+
 
 
 def get_default_daterange(tz: Union[pytz.BaseTzInfo, str]) -> Tuple[datetime, datetime]:
@@ -41,40 +80,118 @@ def get_default_daterange(tz: Union[pytz.BaseTzInfo, str]) -> Tuple[datetime, da
 
 
 def _get_named_daterange(range_name: str, tz: Union[pytz.BaseTzInfo, str]) -> Tuple[datetime, datetime]:
-    """ Get a valid named daterange.
+    """ Get a valid named daterange. Results are memoized per (name, timezone, local date), so resolving the same name
+    again on the same day is a dict lookup.
 
-    :param range_name: a valid daterange name (all valid values for `KRONOS_DATERANGE`) 
+    :param range_name: a valid daterange name (all valid values for `KRONOS_DATERANGE`, plus any registered with
+        `register_named_range`)
     :type range_name: str
     :param tz: either a pre-built timzeone or a valid pytz timezone name
     :type tz: Union[pytz.BaseTzInfo, str]
-    :return: (start_dt, end_dt)
+    :return: (start_dt, end_dt), or (None, None) if `range_name` is not recognized
     :rtype: Tuple[datetime, datetime]
     """
-    start_dt = end_dt = None
-    for regex, func in _VALID_DATERANGES.items():
-        match = re.match(regex, range_name)
+    timezone = make_timezone(tz)
+    now = clock.now(timezone)
+    key = (range_name, getattr(timezone, 'zone', timezone), now.date())
+    try:
+        return _named_range_cache[key]
+    except KeyError:
+        pass
+
+    for regex, func in _NAMED_RANGES:
+        match = regex.fullmatch(range_name)
         if match:
-            start_dt, end_dt = func(match, tz)
-            start_dt = start_dt.replace(hour=0, minute=0, second=0, microsecond=0)
-            end_dt = end_dt.replace(hour=23, minute=59, second=59, microsecond=999999)
-            break
+            start_dt, end_dt = func(match, now)
+            start_dt = localize(datetime.combine(start_dt.date(), time.min), timezone)
+            end_dt = localize(datetime.combine(end_dt.date(), time.max), timezone)
+            if len(_named_range_cache) >= NAMED_RANGE_CACHE_SIZE:
+                _named_range_cache.clear()
+            _named_range_cache[key] = (start_dt, end_dt)
+            return _named_range_cache[key]
     
-    return start_dt, end_dt
+    return None, None
+
+
+def register_named_range(pattern: str, func: Callable[[re.Match, datetime], Tuple[datetime, datetime]]):
+    """ Register a custom named range, usable as `Kronos(named_range=...)` or as `KRONOS_DATERANGE`. Registering a
+    pattern that already exists replaces its handler.
 
+    `func` receives the regex match and the current datetime (localized to the requested timezone) and returns the
+    (start, end) of the range. Only the dates are used: start is set to 00:00:00 and end to 23:59:59.999999. e.g.::
 
-def make_timezone(timezone: Union[pytz.BaseTzInfo, str]) -> pytz.BaseTzInfo:
-    """ Handle timezones given both as strings or as pre-made pytz.BaseTzInfo objects.
+        def last_n_weeks(match, now):
+            return now - timedelta(weeks=int(match['n'])), now
 
-    :param tz: a timezone, represented as a string or as as a pytz.timezone object.
+        register_named_range(r'LAST_(?P<n>[0-9]+)_WEEKS', last_n_weeks)
+
+    :param pattern: regex the full range name must match. named groups are available to `func` via the match
+    :type pattern: str
+    :param func: callable(match, now) -> (start datetime, end datetime)
+    :type func: Callable[[re.Match, datetime], Tuple[datetime, datetime]]
     """
-    if isinstance(timezone, pytz.BaseTzInfo):
-        # check if user already created the timezone object instead of passing a string, and handle it
-        tz = timezone
+    regex = re.compile(pattern)
+    for i, (existing, _) in enumerate(_NAMED_RANGES):
+        if existing.pattern == regex.pattern:
+            _NAMED_RANGES[i] = (regex, func)
+            break
     else:
-        # accept string
-        tz = pytz.timezone(timezone)
+        _NAMED_RANGES.append((regex, func))
+    _named_range_cache.clear()
+
 
-    return tz
+def make_timezone(timezone: Union[tzinfo, str], backend: str = None) -> tzinfo:
+    """ Handle timezones given both as strings or as pre-made timezone objects. Names are resolved by a timezone
+    backend (see `backends`): pytz zones through a bounded LRU cache, zoneinfo zones through `ZoneInfo`'s own cache.
+
+    :param timezone: a timezone, represented as a string or as a timezone object (returned as is)
+    :type timezone: Union[tzinfo, str]
+    :param backend: "pytz" or "zoneinfo" to create named zones with, defaults to the default backend
+    :type backend: str, optional
+    :return: the timezone object
+    :rtype: tzinfo
+    """
+    if isinstance(timezone, tzinfo):
+        # check if user already created the timezone object instead of passing a string, and handle it
+        return timezone
+    # accept string
+    return get_backend(backend).timezone(timezone)
+
+
+def localize(naive: datetime, tz: tzinfo, ambiguous: str = 'latest') -> datetime:
+    """ Attach `tz` to a naive datetime through the backend that made `tz`. pytz zones (and foreign tzinfo objects) are
+    localized with a binary search over the zone's cached transition table (see `transitions.transition_table`) rather
+    than pytz's `localize`; zoneinfo zones just need the right `fold`. Wall times that fall into a DST gap are shifted
+    forward by the length of the gap.
+
+    :param naive: a timezone-unaware datetime object
+    :type naive: datetime
+    :param tz: a pre-built timezone object
+    :type tz: tzinfo
+    :param ambiguous: which occurrence of a repeated wall time to use: "earliest", "latest" or "raise". defaults to
+        "latest", which matches pytz's default `is_dst=False` for ordinary fall-back transitions
+    :type ambiguous: str
+    :return: a localized datetime object
+    :rtype: datetime
+    """
+    return backend_of(tz).localize(naive, tz, ambiguous)
+
+
+def shift_instant(dt: datetime, delta: timedelta, tz: pytz.BaseTzInfo) -> datetime:
+    """ Shift a localized datetime by an absolute amount of time, keeping the result localized to `tz`.
+
+    :param dt: a datetime localized to `tz`
+    :type dt: datetime
+    :param delta: elapsed time to shift by
+    :type delta: timedelta
+    :param tz: the timezone `dt` is localized to
+    :type tz: pytz.BaseTzInfo
+    :return: the shifted, localized datetime
+    :rtype: datetime
+    """
+    if hasattr(tz, 'normalize'):
+        return tz.normalize(dt + delta)
+    return (dt.astimezone(pytz.utc) + delta).astimezone(tz)
 
 
 def convert_timezone(date_obj: datetime, in_tz: Union[pytz.BaseTzInfo, str], out_tz: Union[pytz.BaseTzInfo, str]) -> datetime:
@@ -89,97 +206,139 @@ def convert_timezone(date_obj: datetime, in_tz: Union[pytz.BaseTzInfo, str], out
     :rtype: datetime
     """
     if date_obj.tzinfo is None:
-        in_timezone = make_timezone(in_tz)
-        date_obj = in_timezone.localize(date_obj)
+        date_obj = localize(date_obj, make_timezone(in_tz))
     out_timezone = make_timezone(out_tz)
     return date_obj.astimezone(tz=out_timezone)
 
 
-def latest(match: re.Match, tz: Union[pytz.BaseTzInfo, str]) -> Tuple[datetime, datetime]:
+def convert_timezone_many(values: Union[Sequence[datetime], 'numpy.ndarray'], in_tz: Union[pytz.BaseTzInfo, str],
+                          out_tz: Union[pytz.BaseTzInfo, str], ambiguous: str = 'latest',
+                          nonexistent: str = 'shift_forward') -> Union[List[datetime], 'numpy.ndarray']:
+    """ Batch version of `convert_timezone`. Both timezones are resolved once and every value goes through a binary
+    search of their transition tables instead of a `localize` / `astimezone` per value.
+
+    :param values: datetimes (naive ones are read as wall times in `in_tz`, aware ones keep their own offset), or a
+        numpy array of wall times in `in_tz` -- datetime64 (NaT passes through), or int64 microseconds since the epoch
+        as if the wall time were UTC. pass `in_tz='UTC'` to convert an array of true UTC epochs
+    :type values: Union[Sequence[datetime], numpy.ndarray]
+    :param in_tz: timezone to convert from
+    :type in_tz: Union[pytz.BaseTzInfo, str]
+    :param out_tz: timezone to convert to
+    :type out_tz: Union[pytz.BaseTzInfo, str]
+    :param ambiguous: wall times that occur twice in `in_tz` resolve to the "earliest" or "latest" occurrence, or
+        "raise". defaults to "latest", like `convert_timezone`
+    :type ambiguous: str, optional
+    :param nonexistent: wall times skipped by `in_tz` either "shift_forward" (by the length of the gap) or "raise"
+    :type nonexistent: str, optional
+    :raises AmbiguousTimeError: for an ambiguous wall time under the "raise" policy
+    :raises NonExistentTimeError: for a nonexistent wall time under the "raise" policy
+    :return: a list of datetimes in `out_tz`, or for array input an array of wall times in `out_tz`: datetime64[us] for
+        datetime64 input (whatever its unit), int64 microseconds for int64 input
+    :rtype: Union[List[datetime], numpy.ndarray]
+    """
+    check_policies(ambiguous, nonexistent)
+    in_table = transition_table(make_timezone(in_tz))
+    out_table = transition_table(make_timezone(out_tz))
+
+    if hasattr(values, 'dtype'):
+        array = cast('numpy.ndarray', values)
+        if array.dtype.kind != 'M':
+            utc = in_table.wall_to_utc_array(array.astype('int64'), ambiguous, nonexistent)
+            return utc + out_table.offsets_at_utc_array(utc)
+        np = import_numpy()
+        wall = array.astype('datetime64[us]')
+        # NaT reads as the smallest int64, which would come out as a far-future date: convert the rest around it
+        valid = ~np.isnat(wall)
+        utc = in_table.wall_to_utc_array(wall[valid].astype('int64'), ambiguous, nonexistent)
+        converted = np.full(wall.shape, np.datetime64('NaT'), dtype='datetime64[us]')
+        converted[valid] = (utc + out_table.offsets_at_utc_array(utc)).astype('datetime64[us]')
+        return converted
+
+    converted = []
+    for value in values:
+        if value.tzinfo is None:
+            utc = in_table.wall_to_utc((value - NAIVE_EPOCH) // ONE_MICROSECOND, ambiguous, nonexistent)
+        else:
+            utc = (value - EPOCH) // ONE_MICROSECOND
+        converted.append(out_table.from_utc_us(utc))
+    return converted
+
+
+def latest(match: re.Match, now: datetime) -> Tuple[datetime, datetime]:
     """ Get default daterange of (yesterday, today)
 
     :param match: regex Match object
     :type match: re.Match
-    :param tz: either a pre-built timzeone or a valid pytz timezone name
-    :type tz: Union[pytz.BaseTzInfo, str]
+    :param now: the current datetime, localized to the requested timezone
+    :type now: datetime
     :return: (yesterday, today) as YYYY-MM-DD date strings
     :rtype: Tuple[datetime, datetime]
     """
-    timezone = make_timezone(tz)
-    now = datetime.now(tz=timezone)
-    return (now - relativedelta(days=1)), (now)
+    return (now - timedelta(days=1)), (now)
 
-def today(match: re.Match, tz: Union[pytz.BaseTzInfo, str]) -> Tuple[datetime, datetime]:
+def today(match: re.Match, now: datetime) -> Tuple[datetime, datetime]:
     """ Get just "today" a range.
 
     :param match: regex Match object
     :type match: re.Match
-    :param tz: either a pre-built timzeone or a valid pytz timezone name
-    :type tz: Union[pytz.BaseTzInfo, str]
+    :param now: the current datetime, localized to the requested timezone
+    :type now: datetime
     :return: (today, today) as YYYY-MM-DD date strings
     :rtype: Tuple[datetime, datetime]
     """
-    timezone = make_timezone(tz)
-    now = datetime.now(tz=timezone)
     return (now, now)
 
-def last_month(match: re.Match, tz: Union[pytz.BaseTzInfo, str]) -> Tuple[datetime, datetime]:
+def last_month(match: re.Match, now: datetime) -> Tuple[datetime, datetime]:
     """ Get daterange containing last month
 
     :param match: regex Match object
     :type match: re.Match
-    :param tz: either a pre-built timzeone or a valid pytz timezone name
-    :type tz: Union[pytz.BaseTzInfo, str]
+    :param now: the current datetime, localized to the requested timezone
+    :type now: datetime
     :return: last month (start, end) as YYYY-MM-DD date strings
     :rtype: Tuple[datetime, datetime]
     """
-    timezone = make_timezone(tz)
-    now = datetime.now(tz=timezone).replace(day=1)  # first day of this month
     end_dt = now.replace(day=1) - timedelta(days=1)  # last day of last month
     start_dt = end_dt.replace(day=1)
     return start_dt, end_dt
 
 
-def month_to_date(match: re.Match, tz: Union[pytz.BaseTzInfo, str]) -> Tuple[datetime, datetime]:
+def month_to_date(match: re.Match, now: datetime) -> Tuple[datetime, datetime]:
     """ Get daterange for MTD.
 
     :param match: regex Match object
     :type match: re.Match
-    :param tz: either a pre-built timzeone or a valid pytz timezone name
-    :type tz: Union[pytz.BaseTzInfo, str]
+    :param now: the current datetime, localized to the requested timezone
+    :type now: datetime
     :return: MTD (1st, today) as YYYY-MM-DD date strings
     :rtype: Tuple[datetime, datetime]
     """
-    timezone = make_timezone(tz)
-    now = datetime.now(tz=timezone)
     start_dt = now.replace(day=1)
     return start_dt, now
 
 
-def last_x_days(match: re.Match, tz: Union[pytz.BaseTzInfo, str]) -> Tuple[datetime, datetime]:
+def last_x_days(match: re.Match, now: datetime) -> Tuple[datetime, datetime]:
     """ Get date boundaries for `x` days ago until today
 
     :param match: regex Match object
     :type match: re.Match
-    :param tz: either a pre-built timzeone or a valid pytz timezone name
-    :type tz: Union[pytz.BaseTzInfo, str]
+    :param now: the current datetime, localized to the requested timezone
+    :type now: datetime
     :return: (x days ago, today) as YYYY-MM-DD date strings
     :rtype: Tuple[datetime, datetime]
     """
     match_group = match.groupdict()
-    timezone = make_timezone(tz)
-    now = datetime.now(tz=timezone)
     start_dt = now - timedelta(days=int(match_group['var']))
     return start_dt, now
 
 
-def week_to_date_starting_on(match: re.Match, tz: Union[pytz.BaseTzInfo, str]) -> Tuple[datetime, datetime]:
+def week_to_date_starting_on(match: re.Match, now: datetime) -> Tuple[datetime, datetime]:
     """ Get date boundaries for the last `weekday` until today. 
 
     :param match: regex Match object
     :type match: re.Match
-    :param tz: either a pre-built timzeone or a valid pytz timezone name
-    :type tz: Union[pytz.BaseTzInfo, str]
+    :param now: the current datetime, localized to the requested timezone
+    :type now: datetime
     :return: (last `weekday`, today) as YYYY-MM-DD date strings
     :rtype: Tuple[datetime, datetime]
     """
@@ -187,9 +346,9 @@ def week_to_date_starting_on(match: re.Match, tz: Union[pytz.BaseTzInfo, str]) -
     if weekday.upper() not in _VALID_RELATIVE_DAY_ABBRS:
         raise ValueError(f'Weekday abbreviation "{weekday}" is not accepted. Check your `KRONOS_DATERANGE` environment variable. Accepted values: {_VALID_RELATIVE_DAY_ABBRS}')
     
-    timezone = make_timezone(tz)
-    now = datetime.now(tz=timezone)
-    start_dt = now - relativedelta(weekday=REL_RANGE_MAP[weekday](-1))
+    from dateutil.relativedelta import relativedelta, weekday as relative_weekday
+
+    start_dt = now - relativedelta(weekday=relative_weekday(WEEKDAY_NUMBERS[weekday.upper()], -1))
     return start_dt, now
 
 
@@ -208,22 +367,23 @@ def handle_ambiguous_datetime(datetime_item: Union[datetime, str], timezone: Uni
     tz = make_timezone(timezone)
     if isinstance(datetime_item, datetime):
         if datetime_item.tzinfo is None:
-            ret = tz.localize(datetime_item)
+            ret = localize(datetime_item, tz)
         else:
             ret = convert_timezone(date_obj=datetime_item, in_tz=datetime_item.tzinfo, out_tz=tz)
     elif isinstance(datetime_item, str):
-        ret = tz.localize(datetime.strptime(datetime_item, fmt))
+        ret = localize(datetime.strptime(datetime_item, fmt), tz)
     
     return ret
 
 
 
-_VALID_DATERANGES = {
-    r'^LATEST$': latest,
-    r'^YESTERDAY_TODAY$': latest,
-    r'^TODAY$': today,
-    r'^LAST_MONTH$': last_month,
-    r'^MTD$': month_to_date,
-    r'^LAST_(?P<var>\d+)_DAYS$': last_x_days,
-    r'^THIS_WEEK__(?P<var>\w+)$': week_to_date_starting_on
-}
+for _pattern, _func in (
+    (r'^LATEST$', latest),
+    (r'^YESTERDAY_TODAY$', latest),
+    (r'^TODAY$', today),
+    (r'^LAST_MONTH$', last_month),
+    (r'^MTD$', month_to_date),
+    (r'^LAST_(?P<var>\d+)_DAYS$', last_x_days),
+    (r'^THIS_WEEK__(?P<var>\w+)$', week_to_date_starting_on),
+):
+    register_named_range(_pattern, _func)
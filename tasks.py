@@ -20,9 +20,12 @@ COVERAGE_DIR = ROOT_DIR.joinpath("htmlcov")
 COVERAGE_REPORT = COVERAGE_DIR.joinpath("index.html")
 SOURCE_DIR = ROOT_DIR.joinpath("src/kronos")
 TEST_DIR = ROOT_DIR.joinpath("tests")
+BENCHMARK_DIR = ROOT_DIR.joinpath("benchmarks")
+BENCHMARK_STORAGE = ROOT_DIR.joinpath(".benchmarks")
 PYTHON_TARGETS = [
     SOURCE_DIR,
     TEST_DIR,
+    BENCHMARK_DIR,
     ROOT_DIR.joinpath("noxfile.py"),
     Path(__file__),
 ]
@@ -139,6 +142,29 @@ def tests(c):
     _run(c, f"poetry run pytest {' '.join(pytest_options)} {TEST_DIR} {SOURCE_DIR}")
 
 
+@task(
+    help={
+        "compare": "Compare against the last saved run, failing on a mean regression over 10%",
+        "save": "Save the results as JSON under .benchmarks/ (default: True)",
+    }
+)
+def benchmarks(c, compare=False, save=True):
+    # type: (Context, bool, bool) -> None
+    """Run the benchmark suite."""
+    pytest_options = [
+        "-o python_files=bench_*.py",
+        "-o python_functions=bench_*",
+        "--benchmark-only",
+        f"--benchmark-storage={BENCHMARK_STORAGE}",
+        "--benchmark-columns=min,mean,stddev,rounds",
+    ]
+    if save:
+        pytest_options.append("--benchmark-autosave")
+    if compare:
+        pytest_options.extend(["--benchmark-compare", "--benchmark-compare-fail=mean:10%"])
+    _run(c, f"poetry run pytest {' '.join(pytest_options)} {BENCHMARK_DIR}")
+
+
 @task(
     help={
         "fmt": "Build a local report: report, html, json, annotate, html, xml.",
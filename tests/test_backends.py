@@ -0,0 +1,103 @@
+import pickle
+from datetime import datetime, timedelta
+
+import pytest
+import pytz
+
+from src.kronos.kronos import Kronos
+from src.kronos.backends import get_backend, set_default_backend, backend_of, zone_name, GENERIC_BACKEND
+from src.kronos.ranges import DateRange, timezone_key
+from src.kronos.transitions import transition_table
+from src.kronos.utilities import make_timezone, localize, convert_timezone_many, to_epoch_us
+
+zoneinfo = pytest.importorskip('zoneinfo')
+
+
+def test_backend_selection():
+    assert isinstance(make_timezone('America/New_York'), pytz.BaseTzInfo)
+    ny = make_timezone('America/New_York', backend='zoneinfo')
+    assert ny is zoneinfo.ZoneInfo('America/New_York')
+    assert backend_of(ny).name == 'zoneinfo' and zone_name(ny) == 'America/New_York'
+    assert backend_of(pytz.timezone('UTC')).name == 'pytz'
+
+    set_default_backend('zoneinfo')
+    try:
+        assert make_timezone('Europe/London') is zoneinfo.ZoneInfo('Europe/London')
+        assert Kronos('2023-01-01', '2023-01-02', timezone='Europe/London').backend == 'zoneinfo'
+        # plain names in a DateRange are pytz keys whatever the default backend
+        assert DateRange(0, 1, 'Europe/London').tz == 'Europe/London'
+    finally:
+        set_default_backend('pytz')
+
+    with pytest.raises(ValueError):
+        get_backend('dateutil')
+    with pytest.raises(TypeError):
+        GENERIC_BACKEND.timezone('UTC')
+
+
+@pytest.mark.parametrize('naive', [
+    datetime(2023, 11, 5, 1, 30),  # repeated
+    datetime(2023, 3, 12, 2, 30),  # skipped
+    datetime(2023, 7, 1, 12),
+])
+@pytest.mark.parametrize('ambiguous', ['earliest', 'latest'])
+def test_zoneinfo_localize_matches_pytz(naive, ambiguous):
+    expected = localize(naive, pytz.timezone('America/New_York'), ambiguous)
+    actual = localize(naive, zoneinfo.ZoneInfo('America/New_York'), ambiguous)
+    assert to_epoch_us(actual) == to_epoch_us(expected)
+    assert actual.replace(tzinfo=None) == expected.replace(tzinfo=None)
+
+
+def test_zoneinfo_localize_raises_on_ambiguous():
+    with pytest.raises(pytz.AmbiguousTimeError):
+        localize(datetime(2023, 11, 5, 1, 30), zoneinfo.ZoneInfo('America/New_York'), 'raise')
+
+
+@pytest.mark.parametrize('zone', ['America/New_York', 'Europe/London', 'Australia/Lord_Howe', 'UTC'])
+def test_zoneinfo_transition_table(zone):
+    tz = zoneinfo.ZoneInfo(zone)
+    table = transition_table(tz)
+    instant = pytz.utc.localize(datetime(1980, 1, 1))
+    while instant.year < 2080:
+        utc_us = to_epoch_us(instant)
+        assert table.offset_at_utc(utc_us) == instant.astimezone(tz).utcoffset() // timedelta(microseconds=1)
+        # the table attaches fold=1 to the second occurrence of repeated wall times
+        assert to_epoch_us(table.from_utc_us(utc_us)) == utc_us
+        instant += timedelta(days=11, hours=7)
+
+
+def test_zoneinfo_fold():
+    table = transition_table(zoneinfo.ZoneInfo('America/New_York'))
+    first = table.from_utc_us(to_epoch_us(pytz.utc.localize(datetime(2023, 11, 5, 5, 30))))
+    second = table.from_utc_us(to_epoch_us(pytz.utc.localize(datetime(2023, 11, 5, 6, 30))))
+    assert first.replace(tzinfo=None) == second.replace(tzinfo=None) == datetime(2023, 11, 5, 1, 30)
+    assert (first.fold, second.fold) == (0, 1)
+
+
+def test_kronos_with_zoneinfo_backend():
+    pytz_range = Kronos('2023-11-01', '2023-11-30', timezone='America/New_York')
+    zoneinfo_range = Kronos('2023-11-01', '2023-11-30', timezone='America/New_York', backend='zoneinfo')
+    assert zoneinfo_range.timezone == 'America/New_York' and zoneinfo_range.backend == 'zoneinfo'
+    expected = pytz_range.to_range()
+    assert zoneinfo_range.to_range() == DateRange(expected.start_us, expected.end_us, zoneinfo_range.tz)
+    assert [to_epoch_us(day._end_date) for day in zoneinfo_range.day_range()] == \
+        [to_epoch_us(day._end_date) for day in pytz_range.day_range()]
+    assert len(list(Kronos('2023-11-05', '2023-11-05', timezone='America/New_York', backend='zoneinfo').hour_range())) == 25
+    assert isinstance(zoneinfo_range.now('Europe/Paris').tzinfo, zoneinfo.ZoneInfo)
+
+
+def test_zoneinfo_range_keys():
+    tz = zoneinfo.ZoneInfo('America/New_York')
+    assert timezone_key(tz) == 'zoneinfo:America/New_York'
+    date_range = DateRange(0, 10, tz)
+    assert date_range.timezone is tz
+    assert pickle.loads(pickle.dumps(date_range)) == date_range
+    assert date_range != DateRange(0, 10, 'America/New_York')
+
+
+def test_convert_timezone_many_with_zoneinfo():
+    values = [datetime(2023, 3, 12) + timedelta(minutes=37 * i) for i in range(100)]
+    expected = convert_timezone_many(values, 'America/New_York', 'Europe/London')
+    converted = convert_timezone_many(values, zoneinfo.ZoneInfo('America/New_York'), zoneinfo.ZoneInfo('Europe/London'))
+    assert [to_epoch_us(dt) for dt in converted] == [to_epoch_us(dt) for dt in expected]
+    assert all(isinstance(dt.tzinfo, zoneinfo.ZoneInfo) for dt in converted)
@@ -0,0 +1,109 @@
+import multiprocessing
+
+import pytest
+
+from src.kronos.kronos import Kronos
+from src.kronos.backfill import Backfill
+
+
+def _kronos():
+    return Kronos('2023-03-01', '2023-03-20', timezone='America/New_York')
+
+
+def test_resumes_after_crash(tmp_path):
+    store = str(tmp_path / 'progress.db')
+    seen = []
+    with pytest.raises(RuntimeError):
+        for day in Backfill(_kronos(), store=store):
+            if day.start_date == '2023-03-05':
+                raise RuntimeError('crashed')
+            seen.append(day.start_date)
+    assert seen == ['2023-03-01', '2023-03-02', '2023-03-03', '2023-03-04']
+
+    # the failed partition was released, so the next run (a new worker name) resumes without waiting for the lease
+    backfill = Backfill(_kronos(), store=store)
+    assert backfill.progress() == (4, 20)
+    resumed = [day for day in backfill]
+    assert [day.start_date for day in resumed][:2] == ['2023-03-05', '2023-03-06']
+    assert [(d.start_date, d._start_date, d._end_date) for d in resumed] == [(d.start_date, d._start_date, d._end_date) for d in list(_kronos().day_range())[4:]]
+    assert backfill.progress() == (20, 20)
+    assert list(Backfill(_kronos(), store=store)) == []
+
+
+def test_leaving_the_loop_early_releases_the_partition(tmp_path):
+    store = str(tmp_path / 'progress.db')
+    for day in Backfill(_kronos(), store=store, worker='a'):
+        break
+
+    resumed = Backfill(_kronos(), store=store, worker='b')
+    assert resumed.progress() == (0, 20)
+    assert resumed.claim(timeout=0).start_date == '2023-03-01'
+
+
+def test_claim_waits_for_partitions_claimed_elsewhere(tmp_path):
+    store = str(tmp_path / 'progress.db')
+    kronos = Kronos('2023-03-01', '2023-03-01', timezone='America/New_York')
+    first, second = (Backfill(kronos, store=store, worker=name) for name in ('a', 'b'))
+    claimed = first.claim()
+    with pytest.raises(TimeoutError):
+        second.claim(timeout=0)
+
+    # waits for the lease to run out, then takes the partition over
+    patient = Backfill(kronos, store=store, worker='c', lease_seconds=0.2)
+    assert patient.claim(timeout=5).to_range() == claimed.to_range()
+
+    patient.complete(claimed)
+    assert second.claim(timeout=0) is None
+    assert list(second) == []
+
+
+def test_claims_and_releases(tmp_path):
+    store = str(tmp_path / 'progress.db')
+    first, second = (Backfill(_kronos(), store=store, worker=name) for name in ('a', 'b'))
+    claimed = first.claim()
+    assert claimed.start_date == '2023-03-01'
+    assert second.claim().start_date == '2023-03-02'
+
+    first.release(claimed)
+    assert second.claim().start_date == '2023-03-01'
+    second.complete(claimed)
+    assert first.progress() == (1, 20)
+
+    assert not first.complete(claimed) and not first.release(second.claim())
+
+    other = Backfill(_kronos(), store=store, granularity='week')
+    assert other.job != first.job and other.progress() == (0, 4)
+
+
+def test_stale_worker_cannot_complete(tmp_path):
+    store = str(tmp_path / 'progress.db')
+    stale, current = (Backfill(_kronos(), store=store, worker=name, lease_seconds=0) for name in ('a', 'b'))
+    claimed = stale.claim()
+    # the lease has already run out, so the other worker takes the partition over
+    assert current.claim().to_range() == claimed.to_range()
+
+    assert not stale.complete(claimed) and not stale.release(claimed)
+    assert current.progress() == (0, 20)
+    assert current.complete(claimed)
+    assert current.progress() == (1, 20)
+
+
+def _work(store, results):
+    with Backfill(_kronos(), store=store) as backfill:
+        for day in backfill:
+            results.put(day.start_date)
+
+
+def test_concurrent_workers(tmp_path):
+    store = str(tmp_path / 'progress.db')
+    Backfill(_kronos(), store=store).close()
+    results = multiprocessing.Queue()
+    workers = [multiprocessing.Process(target=_work, args=(store, results)) for _ in range(4)]
+    for worker in workers:
+        worker.start()
+    done = [results.get(timeout=30) for _ in range(20)]
+    for worker in workers:
+        worker.join(timeout=30)
+
+    assert sorted(done) == [day.start_date for day in _kronos().day_range()]
+    assert Backfill(_kronos(), store=store).progress() == (20, 20)
@@ -0,0 +1,64 @@
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from src.kronos.kronos import Kronos, ISO_FMT
+from src.kronos.calendars import HolidayCalendar
+
+
+def thanksgiving(year):
+    november = date(year, 11, 1)
+    return [november + timedelta(days=(3 - november.weekday()) % 7 + 21)]
+
+
+CALENDAR = HolidayCalendar(holidays=[date(2023, 12, 25), date(2024, 1, 1)], rules=[thanksgiving])
+
+
+HOLIDAYS = {date(2023, 12, 25), date(2024, 1, 1)}.union(*(thanksgiving(year) for year in range(2020, 2030)))
+
+
+def _is_business_day(day):
+    return day.weekday() < 5 and day not in HOLIDAYS
+
+
+def test_matches_day_by_day_filtering():
+    rnd = random.Random(3)
+    for _ in range(300):
+        start = date(2022, 1, 1) + timedelta(days=rnd.randrange(1000))
+        end = start + timedelta(days=rnd.randrange(500))
+        days = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+        expected = [day for day in days if _is_business_day(day)]
+
+        assert list(CALENDAR.business_days(start, end)) == expected
+        assert CALENDAR.count(start, end) == len(expected)
+        if expected:
+            assert CALENDAR.add(expected[0], len(expected) - 1) == expected[-1]
+            assert CALENDAR.add(expected[-1], 1 - len(expected)) == expected[0]
+
+
+def test_rolling_and_rules():
+    assert CALENDAR.add(date(2023, 11, 23), 0) == date(2023, 11, 24)
+    assert CALENDAR.add(date(2023, 12, 23), 1) == date(2023, 12, 27)
+    assert CALENDAR.add(date(2023, 12, 25), -1) == date(2023, 12, 21)
+    assert not CALENDAR.is_business_day(date(2030, 11, 28))
+
+    calendar = HolidayCalendar(weekend=['FRI', 5])
+    assert calendar.is_business_day(date(2023, 12, 24)) and not calendar.is_business_day(date(2023, 12, 22))
+    calendar.add_holidays([date(2023, 12, 24)])
+    assert not calendar.is_business_day(date(2023, 12, 24))
+    with pytest.raises(ValueError):
+        HolidayCalendar(weekend=range(7))
+
+
+def test_kronos_business_days():
+    kronos = Kronos('2023-12-20', '2024-01-03', timezone='America/New_York')
+
+    days = [k.start_date for k in kronos.business_day_range(CALENDAR)]
+    assert days == ['2023-12-20', '2023-12-21', '2023-12-22', '2023-12-26', '2023-12-27', '2023-12-28', '2023-12-29', '2024-01-02', '2024-01-03']
+    assert kronos.count_business_days(CALENDAR) == len(days)
+    assert kronos.count_business_days() == 11
+
+    shifted = Kronos('2023-12-22 09:00:00', '2023-12-22 17:00:00', date_format=ISO_FMT, timezone='America/New_York').add_business_days(1, CALENDAR)
+    assert (shifted.start_date, shifted.end_date) == ('2023-12-26 09:00:00', '2023-12-26 17:00:00')
+    assert shifted._start_date.utcoffset() == timedelta(hours=-5)
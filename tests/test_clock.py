@@ -0,0 +1,51 @@
+import threading
+from datetime import datetime
+
+import pytz
+
+from src.kronos.kronos import Kronos
+from src.kronos.clock import FrozenClock, SYSTEM_CLOCK, get_clock, set_clock, snapshot, use_clock
+
+# 2023-03-01 04:30 UTC is still February 28th in New York
+INSTANT = datetime(2023, 3, 1, 4, 30)
+
+
+def test_snapshot_freezes_now():
+    with snapshot(INSTANT) as clock:
+        kronos = Kronos(named_range='LATEST', timezone='America/New_York')
+        assert (kronos.start_date, kronos.end_date) == ('2023-02-27', '2023-02-28')
+        assert (kronos.yesterday, kronos.today) == ('2023-02-27', '2023-02-28')
+        assert kronos.now('UTC') == pytz.utc.localize(INSTANT)
+        assert Kronos('2023-02-01', timezone='America/New_York').end_date == '2023-02-28'
+        assert kronos.last_x_days(3).start_date == '2023-02-25'
+        # localized once per timezone
+        assert clock.now(kronos.tz) is clock.now(kronos.tz)
+    assert get_clock() is SYSTEM_CLOCK
+
+
+def test_snapshot_defaults_to_current_time():
+    before = datetime.now(tz=pytz.utc)
+    with snapshot() as clock:
+        assert before <= clock.instant <= datetime.now(tz=pytz.utc)
+        assert Kronos(timezone='UTC').now() == clock.instant
+
+
+def test_scoped_clocks_nest_and_override_the_global_clock():
+    set_clock(FrozenClock(datetime(2020, 1, 1)))
+    try:
+        assert Kronos(timezone='UTC').today == '2020-01-01'
+        with use_clock(FrozenClock(INSTANT)):
+            assert Kronos(timezone='UTC').today == '2023-03-01'
+            with snapshot(datetime(2021, 6, 1)):
+                assert Kronos(timezone='UTC').today == '2021-06-01'
+            assert Kronos(timezone='UTC').today == '2023-03-01'
+
+            # scoped clocks belong to the current context: other threads see the global clock
+            seen = []
+            thread = threading.Thread(target=lambda: seen.append(Kronos(timezone='UTC').today))
+            thread.start()
+            thread.join()
+            assert seen == ['2020-01-01']
+    finally:
+        set_clock()
+    assert get_clock() is SYSTEM_CLOCK
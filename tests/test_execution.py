@@ -0,0 +1,142 @@
+import asyncio
+import multiprocessing
+from datetime import timezone
+
+import pytest
+import pytz
+
+from src.kronos.execution import map_partitions, IN_FLIGHT_PER_WORKER, ORDERED_WINDOW
+from src.kronos.kronos import Kronos
+
+
+def describe(kronos):
+    return kronos.start_date, kronos.end_date, kronos.timezone, kronos._end_date.utcoffset().total_seconds()
+
+
+def fail_on_second(kronos):
+    if kronos.start_date.endswith('02'):
+        raise RuntimeError(kronos.start_date)
+    return kronos.start_date
+
+
+@pytest.mark.parametrize('chunksize', [1, 4])
+def test_map_parallel_matches_day_range(chunksize):
+    kronos = Kronos('20231101', '20231110', timezone='America/New_York', date_format='%Y%m%d')
+    expected = [describe(day) for day in kronos.day_range()]
+
+    assert list(kronos.map_parallel(describe, workers=2, chunksize=chunksize)) == expected
+    assert sorted(kronos.map_parallel(describe, workers=2, chunksize=chunksize, ordered=False)) == sorted(expected)
+
+
+@pytest.mark.parametrize('tz', [timezone.utc, pytz.FixedOffset(60)])
+def test_map_parallel_unnamed_timezone_with_spawn(monkeypatch, tz):
+    # spawned workers share nothing with this process, so unnamed timezones have to travel as tzinfo objects
+    get_context = multiprocessing.get_context
+    monkeypatch.setattr(multiprocessing, 'get_context', lambda method=None: get_context(method or 'spawn'))
+    kronos = Kronos('2023-01-01', '2023-01-03', timezone=tz)
+
+    assert list(kronos.map_parallel(describe, workers=1)) == [describe(day) for day in kronos.day_range()]
+
+
+def test_map_parallel_granularity_and_errors():
+    kronos = Kronos('2023-01-01', '2023-03-31', timezone='UTC')
+    assert list(kronos.map_parallel(describe, granularity='month', workers=1)) == [describe(m) for m in kronos.month_range()]
+
+    with pytest.raises(RuntimeError):
+        list(kronos.map_parallel(fail_on_second, workers=1))
+    with pytest.raises(ValueError):
+        list(kronos.map_parallel(describe, chunksize=0))
+
+
+@pytest.mark.parametrize('ordered', [True, False])
+def test_map_partitions_submits_a_bounded_window(ordered):
+    day = 86400 * 10 ** 6
+    consumed = []
+
+    def bounds():
+        for index in range(50):
+            consumed.append(index)
+            yield index * day, (index + 1) * day - 1
+
+    results = map_partitions(describe, bounds(), 'UTC', '%Y-%m-%d', workers=2, ordered=ordered)
+    next(results)
+    # the first chunks plus at most one refill, not all 50 partitions
+    assert len(consumed) <= IN_FLIGHT_PER_WORKER * 2 + 1
+    assert len(list(results)) == 49
+    assert len(consumed) == 50
+
+
+def test_async_iteration():
+    kronos = Kronos('2023-01-01', '2023-01-05', timezone='UTC')
+
+    async def collect():
+        days = [day.start_date async for day in kronos]
+        weeks = [week.start_date async for week in kronos.aiter_range('week')]
+        return days, weeks
+
+    assert asyncio.run(collect()) == ([day.start_date for day in kronos.day_range()], ['2023-01-01', '2023-01-02'])
+
+
+@pytest.mark.parametrize('ordered', [True, False])
+def test_amap_bounds_concurrency(ordered):
+    kronos = Kronos('2023-01-01', '2023-01-20', timezone='UTC')
+    running, peak = [0], [0]
+
+    async def fetch(day):
+        running[0] += 1
+        peak[0] = max(peak[0], running[0])
+        await asyncio.sleep(0.02 if day._start_date.day % 2 else 0.001)
+        running[0] -= 1
+        return day.start_date
+
+    async def collect():
+        return [result async for result in kronos.amap(fetch, concurrency=3, ordered=ordered)]
+
+    results = asyncio.run(collect())
+    expected = [day.start_date for day in kronos.day_range()]
+    assert results == expected if ordered else (sorted(results) == expected and results != expected)
+    assert peak[0] == 3
+
+
+@pytest.mark.parametrize('ordered', [True, False])
+def test_amap_cancels_on_error(ordered):
+    kronos = Kronos('2023-01-01', '2023-01-20', timezone='UTC')
+    started, cancelled = [], []
+
+    async def fetch(day):
+        started.append(day.start_date)
+        if day.start_date == '2023-01-02':
+            raise RuntimeError('export failed')
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            cancelled.append(day.start_date)
+            raise
+
+    async def collect():
+        return [result async for result in kronos.amap(fetch, concurrency=4, ordered=ordered)]
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(collect())
+    assert len(started) == 4 and sorted(cancelled) == ['2023-01-01', '2023-01-03', '2023-01-04']
+
+
+def test_amap_ordered_keeps_concurrency_behind_slow_partition():
+    kronos = Kronos('2023-01-01', '2023-01-20', timezone='UTC')
+    started = []
+
+    async def fetch(day):
+        started.append(day.start_date)
+        if day.start_date == '2023-01-01':
+            await asyncio.sleep(0.2)
+            # the other slots kept turning over while the first partition was running, up to the ordered window
+            # rather than through the whole range
+            assert len(started) == ORDERED_WINDOW * 4
+        else:
+            await asyncio.sleep(0.01)
+        return day.start_date
+
+    async def collect():
+        return [result async for result in kronos.amap(fetch, concurrency=4, ordered=True)]
+
+    assert asyncio.run(collect()) == [day.start_date for day in kronos.day_range()]
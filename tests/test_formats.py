@@ -0,0 +1,165 @@
+import random
+import pytest
+from datetime import datetime, timedelta
+
+import pytz
+
+from src.kronos.kronos import Kronos
+from src.kronos.formats import compile_parser, compile_formatter, DayFormatter, DATE_MEMO_SIZE
+
+FORMATS = [
+    '%Y-%m-%d', '%Y-%m-%d %H:%M:%S', '%Y-%m-%dT%H:%M:%S', '%Y%m%d', '%Y-%m-%dT%H:%M:%S.%fZ', '%Y-%m-%dT%H:%M:%S%z',
+    '%m/%d/%Y %H:%M', '%Y-%m-%dT%H:%M:%S.%f%z', '%d.%m.%Y', '%Y %j', '100%% %Y',
+]
+
+
+def _strptime(value, fmt):
+    try:
+        return datetime.strptime(value, fmt)
+    except ValueError:
+        return ValueError
+
+
+@pytest.mark.parametrize('fmt', FORMATS)
+def test_compiled_parser_matches_strptime(fmt):
+    rnd = random.Random(fmt)
+    parser = compile_parser(fmt)
+    for _ in range(300):
+        dt = datetime(2000, 1, 1) + timedelta(seconds=rnd.randrange(10 ** 9), microseconds=rnd.randrange(10 ** 6))
+        value = dt.strftime(fmt.replace('%z', rnd.choice(['Z', '+0530', '-07:00'])))
+        position = rnd.randrange(len(value))
+        for candidate in (value, value[:position] + rnd.choice('0:-x ') + value[position + 1:], value[:position], value + '0'):
+            expected = _strptime(candidate, fmt)
+            if expected is ValueError:
+                with pytest.raises(ValueError):
+                    parser.parse(candidate)
+                continue
+            parsed = parser.parse(candidate)
+            assert parsed == expected and parsed.utcoffset() == expected.utcoffset()
+            wall, offset = parser.to_wall_us(candidate)
+            assert wall == (expected.replace(tzinfo=None) - datetime(1970, 1, 1)) // timedelta(microseconds=1)
+
+
+def test_compiled_parser_fast_path_selection():
+    assert compile_parser('%Y-%m-%dT%H:%M:%S.%fZ').fast
+    assert compile_parser('%Y-%m-%d').iso
+    assert not compile_parser('%Y %j').fast
+    assert not compile_parser('%b %d %Y').fast
+    assert compile_parser('%Y-%m-%d') is compile_parser('%Y-%m-%d')
+
+
+def test_date_memo_is_bounded():
+    parser = compile_parser('%Y%m%d')
+    day = datetime(2000, 1, 1)
+    for i in range(DATE_MEMO_SIZE + 10):
+        parser.parse((day + timedelta(days=i)).strftime('%Y%m%d'))
+    assert 0 < len(parser._dates) <= DATE_MEMO_SIZE
+
+
+def test_parse_many_matches_parse_and_localize():
+    values = ['2023-03-12 01:30:00', '2023-03-12 02:30:00', '2023-11-05 01:30:00', '2023-07-04 12:00:00']
+    kronos = Kronos()
+    expected = [kronos.parse_and_localize(v, '%Y-%m-%d %H:%M:%S', in_tz='America/New_York', out_tz='Europe/London') for v in values]
+    parsed = Kronos.parse_many(values, '%Y-%m-%d %H:%M:%S', in_tz='America/New_York', out_tz='Europe/London')
+
+    assert parsed == expected
+    assert [p.tzname() for p in parsed] == [e.tzname() for e in expected]
+
+
+def test_parse_many_with_offsets_and_policies():
+    parsed = Kronos.parse_many(['2023-07-04T12:00:00+02:00', '2023-07-04T12:00:00Z'], '%Y-%m-%dT%H:%M:%S%z', out_tz='UTC')
+    assert [p.hour for p in parsed] == [10, 12]
+
+    with pytest.raises(pytz.AmbiguousTimeError):
+        Kronos.parse_many(['2023-11-05 01:30'], '%Y-%m-%d %H:%M', in_tz='America/New_York', ambiguous='raise')
+    with pytest.raises(pytz.NonExistentTimeError):
+        Kronos.parse_many(['2023-03-12 02:30'], '%Y-%m-%d %H:%M', in_tz='America/New_York', nonexistent='raise')
+    earliest, = Kronos.parse_many(['2023-11-05 01:30'], '%Y-%m-%d %H:%M', in_tz='America/New_York', out_tz='UTC', ambiguous='earliest')
+    assert earliest.hour == 5
+
+
+def test_parse_many_numpy():
+    np = pytest.importorskip('numpy')
+    values = np.array(['2023-01-01', '2023-01-02', '2023-01-02'])
+    epochs = Kronos.parse_many(values, '%Y-%m-%d', in_tz='UTC', as_epoch=True)
+
+    assert epochs.dtype == np.int64
+    assert epochs.tolist() == [1672531200 * 10 ** 6, 1672617600 * 10 ** 6, 1672617600 * 10 ** 6]
+    assert Kronos.parse_many(values.astype('S'), '%Y-%m-%d', as_epoch=True).tolist() == epochs.tolist()
+
+
+def test_convert_dates_values():
+    values = ['2023-01-02', '', '2023-01-02', None, '2023-12-31']
+    converted = Kronos.convert_dates(iter(values), '%Y-%m-%d', '%m/%d/%Y', chunk_size=2)
+
+    assert list(converted) == ['01/02/2023', '', '01/02/2023', None, '12/31/2023']
+    assert list(Kronos.convert_dates(values[:1], '%Y-%m-%d', '%d %b %Y')) == [Kronos.convert_date(values[0], '%Y-%m-%d', '%d %b %Y')]
+
+
+def test_convert_dates_rows():
+    rows = [('a', '2023-01-02 10:00:00'), ['b', '2023-01-03 11:00:00']]
+    assert list(Kronos.convert_dates(rows, '%Y-%m-%d %H:%M:%S', '%Y%m%d', columns=[1])) == [('a', '20230102'), ['b', '20230103']]
+
+    records = [{'id': 1, 'ts': '2023-01-02T10:00:00', 'seen': '2023-01-01T00:00:00'}]
+    converted, = Kronos.convert_dates(records, '%Y-%m-%dT%H:%M:%S', '%H:%M', columns=['ts', 'seen'])
+    assert converted == {'id': 1, 'ts': '10:00', 'seen': '00:00'}
+    assert records[0]['ts'] == '2023-01-02T10:00:00'
+
+
+def test_convert_dates_is_lazy():
+    def rows():
+        yield '2023-01-02'
+        raise AssertionError('read past the first chunk')
+
+    converted = Kronos.convert_dates(rows(), '%Y-%m-%d', '%Y', chunk_size=1)
+    assert next(converted) == '2023'
+    with pytest.raises(ValueError):
+        list(Kronos.convert_dates(['2023-13-01'], '%Y-%m-%d', '%Y'))
+
+
+@pytest.mark.parametrize('fmt', FORMATS + ['%b %d, %Y', '%Y %%'])
+def test_formatter_matches_strftime(fmt):
+    formatter = compile_formatter(fmt)
+    assert formatter is compile_formatter(fmt)
+    rng = random.Random(fmt)
+    tz = pytz.timezone('America/New_York')
+    for _ in range(300):
+        dt = datetime(rng.randint(1, 9999), rng.randint(1, 12), rng.randint(1, 28), rng.randint(0, 23), rng.randint(0, 59),
+                      rng.randint(0, 59), rng.choice([0, rng.randint(0, 999999)]))
+        for value in (dt, dt.date(), tz.localize(dt) if dt.year > 1900 else dt):
+            assert formatter.format(value) == value.strftime(fmt)
+
+
+def test_formatter_fast_path():
+    assert all(compile_formatter(fmt).fast for fmt in ('%Y-%m-%d', '%Y%m%d', '%Y-%m-%d %H:%M:%S', '%Y-%m-%dT%H:%M:%S.%f'))
+    assert not compile_formatter('%Y-%m-%dT%H:%M:%S%z').fast
+
+
+@pytest.mark.parametrize('fmt', FORMATS + ['%d %b %Y %H:%M', '%I:%M %p', '%H'])
+@pytest.mark.parametrize('zone', ['America/New_York', 'Australia/Lord_Howe', 'UTC'])
+def test_format_many_matches_strftime(fmt, zone):
+    tz = pytz.timezone(zone)
+    timestamps = [1667600000 + 37 * i for i in range(3000)] + [1678600000 + 41 * i for i in range(3000)]
+    expected = [datetime.fromtimestamp(ts, tz).strftime(fmt) for ts in timestamps]
+    assert Kronos.format_many(timestamps, fmt, tz=zone) == expected
+    aware = [datetime.fromtimestamp(ts, pytz.utc) for ts in timestamps[::97]]
+    assert Kronos.format_many(aware, fmt, tz=tz) == expected[::97]
+    naive = [dt.astimezone(tz).replace(tzinfo=None) for dt in aware]
+    assert Kronos.format_many(naive, fmt, tz=tz) == expected[::97]
+
+
+def test_format_many_inputs():
+    np = pytest.importorskip('numpy')
+    expected = ['2023-03-12 03:00:00.000000', None, '2023-03-12 03:00:00.500000']
+    assert Kronos.format_many([1678604400, None, 1678604400.5], '%Y-%m-%d %H:%M:%S.%f', tz='America/New_York') == expected
+    values = np.array([1678604400000, 1678604400500])
+    assert Kronos.format_many(values, '%Y-%m-%d %H:%M:%S.%f', tz='America/New_York') == expected[::2]
+    assert Kronos.format_many(values.astype('datetime64[ms]'), '%H:%M:%S.%f', tz='UTC') == ['07:00:00.000000', '07:00:00.500000']
+    with_nat = np.array(['2023-03-12T07:00', 'NaT'], dtype='datetime64[s]')
+    assert Kronos.format_many(with_nat, '%Y-%m-%d %H:%M', tz='America/New_York') == ['2023-03-12 03:00', None]
+    # a naive wall time in the DST gap is shifted forward whether or not the format takes the fast path
+    gap = [datetime(2023, 3, 12, 2, 30)]
+    assert Kronos.format_many(gap, '%Y-%m-%d %H:%M', tz='America/New_York') == ['2023-03-12 03:30']
+    assert Kronos.format_many(gap, '%Y-%m-%d %I:%M %p', tz='America/New_York') == ['2023-03-12 03:30 AM']
+    assert DayFormatter('%Y-%m-%d %H:%M:%S').fast and DayFormatter('%d %b %Y').fast
+    assert not DayFormatter('%H:%M %Y').fast and not DayFormatter('%Y-%m-%d %H:%M %z').fast
@@ -0,0 +1,31 @@
+import subprocess
+import sys
+
+import pytest
+
+import src.kronos as kronos
+
+
+def test_lazy_exports():
+    assert 'Backfill' in dir(kronos) and 'Kronos' in kronos.__all__
+    assert kronos.Kronos.__name__ == 'Kronos'
+    assert kronos.DateRangeSet is kronos.ranges.DateRangeSet
+    with pytest.raises(AttributeError):
+        kronos.NotAThing
+
+
+def test_import_does_not_load_optional_machinery():
+    script = (
+        'import sys; from src.kronos import Kronos; '
+        'list(Kronos("2023-01-01", "2023-01-31", timezone="America/New_York").week_range()); '
+        'print(",".join(m for m in ("asyncio", "concurrent.futures", "sqlite3", "dateutil.rrule", "dateutil.relativedelta") if m in sys.modules))'
+    )
+    result = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == ''
+
+
+def test_rel_range_map_is_built_on_access():
+    from dateutil.relativedelta import SU, MO
+    from src.kronos import utilities
+
+    assert utilities.REL_RANGE_MAP['SUN'] == SU and utilities.REL_RANGE_MAP['MON'] == MO
@@ -172,3 +172,159 @@ def test_from_timestamp():
     dt_local_to_utc = Kronos(date_format='%Y-%m-%d').from_timestamp(sample_unix_timestamp, in_timezone='America/New_York', out_timezone='UTC')
     assert dt_local_to_utc.tzinfo.zone == 'UTC'
     assert dt_local_to_utc.hour == 22
+
+
+def test_day_range_clamps_to_bounds():
+    kronos = Kronos('2023-03-01 12:30:00', '2023-03-03 08:00:00', date_format=ISO_FMT, timezone='UTC')
+    days = list(kronos.day_range())
+
+    assert [d.format_start(ISO_FMT) for d in days] == ['2023-03-01 12:30:00', '2023-03-02 00:00:00', '2023-03-03 00:00:00']
+    assert [d.format_end(ISO_FMT) for d in days] == ['2023-03-01 23:59:59', '2023-03-02 23:59:59', '2023-03-03 08:00:00']
+    assert days[1]._end_date.microsecond == 999999
+
+
+def test_day_range_single_day():
+    kronos = Kronos('2023-03-01', '2023-03-01', timezone='UTC')
+    days = list(kronos.day_range())
+
+    assert len(days) == 1
+    assert days[0]._start_date == kronos._start_date
+    assert days[0]._end_date == kronos._end_date
+
+
+def test_day_range_dst_transitions():
+    kronos = Kronos('2023-03-11', '2023-11-06', timezone='America/New_York')
+    days = {d.start_date: d for d in kronos.day_range()}
+
+    assert len(days) == 241
+    spring_forward, fall_back = days['2023-03-12'], days['2023-11-05']
+    assert spring_forward.end_ts - spring_forward.start_ts == pytest.approx(23 * 3600)
+    assert fall_back.end_ts - fall_back.start_ts == pytest.approx(25 * 3600)
+    assert spring_forward.timezone == 'America/New_York'
+
+
+def test_day_range_ends_on_fall_back_day():
+    kronos = Kronos('2023-11-05', '2023-11-05', timezone='America/New_York')
+    day, = kronos.day_range()
+    assert day.end_ts - day.start_ts == pytest.approx(25 * 3600)
+
+
+def test_hour_range_dst_transitions():
+    fall_back = list(Kronos('2023-11-05', '2023-11-05', timezone='America/New_York').hour_range())
+    spring_forward = list(Kronos('2023-03-12', '2023-03-12', timezone='America/New_York').hour_range())
+
+    assert len(fall_back) == 25
+    assert len(spring_forward) == 23
+    assert [h.format_start('%H') for h in fall_back[:4]] == ['00', '01', '01', '02']
+    assert all(h.end_ts - h.start_ts == pytest.approx(3600) for h in fall_back + spring_forward)
+    assert fall_back[-1].format_end(ISO_FMT) == '2023-11-05 23:59:59'
+
+
+def test_week_range():
+    kronos = Kronos('2023-03-01', '2023-03-20', timezone='UTC')
+    weeks = list(kronos.week_range())
+    assert [(w.start_date, w.end_date) for w in weeks] == [
+        ('2023-03-01', '2023-03-05'), ('2023-03-06', '2023-03-12'), ('2023-03-13', '2023-03-19'), ('2023-03-20', '2023-03-20')
+    ]
+
+    sunday_weeks = list(kronos.week_range(week_start='SUN'))
+    assert [w.start_date for w in sunday_weeks] == ['2023-03-01', '2023-03-05', '2023-03-12', '2023-03-19']
+    assert [w.start_date for w in kronos.week_range(week_start=6)] == [w.start_date for w in sunday_weeks]
+
+    with pytest.raises(ValueError):
+        list(kronos.week_range(week_start='FUNDAY'))
+
+
+def test_month_and_quarter_range():
+    kronos = Kronos('2022-11-15', '2023-05-02', timezone='America/New_York')
+    months = list(kronos.month_range())
+    assert [(m.start_date, m.end_date) for m in months] == [
+        ('2022-11-15', '2022-11-30'), ('2022-12-01', '2022-12-31'), ('2023-01-01', '2023-01-31'), ('2023-02-01', '2023-02-28'),
+        ('2023-03-01', '2023-03-31'), ('2023-04-01', '2023-04-30'), ('2023-05-01', '2023-05-02'),
+    ]
+    assert months[4].end_ts - months[4].start_ts == pytest.approx(31 * 86400 - 3600)
+
+    quarters = list(kronos.quarter_range())
+    assert [(q.start_date, q.end_date) for q in quarters] == [
+        ('2022-11-15', '2022-12-31'), ('2023-01-01', '2023-03-31'), ('2023-04-01', '2023-05-02')
+    ]
+    assert all(isinstance(q, Kronos) for q in quarters)
+
+
+def test_contains():
+    kronos = Kronos('2023-11-05', '2023-11-05', timezone='America/New_York')
+
+    assert pytz.utc.localize(datetime(2023, 11, 5, 4)) in kronos
+    assert pytz.utc.localize(datetime(2023, 11, 5, 3, 59)) not in kronos
+    assert kronos._end_date in kronos and kronos._start_date in kronos
+    assert 1699156800 in kronos and 1699156800 * 1000 in kronos and 1699156800.0 * 10 ** 9 in kronos
+    assert 1699156799 not in kronos and 1699246800 not in kronos
+    assert datetime(2023, 11, 5, 23, 30) in kronos
+    with pytest.raises(TypeError):
+        '2023-11-05' in kronos
+
+
+def test_contains_naive_policy():
+    kronos = Kronos('2023-11-05', '2023-11-05', timezone='America/New_York')
+    early = datetime(2023, 11, 5, 2)
+    assert early in kronos
+
+    kronos.naive_policy = 'utc'
+    assert early not in kronos
+    kronos.naive_policy = 'raise'
+    with pytest.raises(TypeError):
+        early in kronos
+    assert pytz.utc.localize(early) not in kronos
+
+
+def test_contains_mask():
+    np = pytest.importorskip('numpy')
+    kronos = Kronos('2023-11-05', '2023-11-05', timezone='America/New_York')
+    seconds = np.array([1699156799, 1699156800, 1699246799, 1699246800])
+    wall = np.array(['2023-11-04T23:59:59', '2023-11-05T00:00', '2023-11-05T23:59:59', '2023-11-06T00:00'], dtype='datetime64[s]')
+
+    assert kronos.contains_mask(seconds).tolist() == [False, True, True, False]
+    assert kronos.contains_mask(seconds * 10 ** 9).tolist() == [False, True, True, False]
+    assert kronos.contains_mask(wall).tolist() == [False, True, True, False]
+    assert kronos.contains_mask([kronos._start_date, datetime(2023, 11, 4, 23)]).tolist() == [True, False]
+
+    kronos.naive_policy = 'utc'
+    assert kronos.contains_mask(wall).tolist() == [False, False, True, True]
+    kronos.naive_policy = 'raise'
+    with pytest.raises(TypeError):
+        kronos.contains_mask(wall)
+
+
+def test_partition_equal_lengths():
+    kronos = Kronos('2023-01-01', '2023-01-10', timezone='America/New_York')
+    chunks = kronos.partition(3)
+
+    assert [(c.start_date, c.end_date) for c in chunks] == [('2023-01-01', '2023-01-03'), ('2023-01-04', '2023-01-07'), ('2023-01-08', '2023-01-10')]
+    assert chunks[0]._start_date == kronos._start_date and chunks[-1]._end_date == kronos._end_date
+    assert all(a._end_date + timedelta(microseconds=1) == b._start_date for a, b in zip(chunks, chunks[1:]))
+    assert len(kronos.partition(20)) == 10
+
+
+def test_partition_weighted():
+    kronos = Kronos('2023-01-01', '2023-01-31', timezone='UTC')
+    weekend_heavy = kronos.partition(2, weights=lambda start: 5 if start.weekday() >= 5 else 1)
+    assert [(c.start_date, c.end_date) for c in weekend_heavy] == [('2023-01-01', '2023-01-15'), ('2023-01-16', '2023-01-31')]
+
+    monthly = Kronos('2023-01-01', '2023-12-31', timezone='UTC').partition(2, granularity='month', weights=[9, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1])
+    assert [(c.start_date, c.end_date) for c in monthly] == [('2023-01-01', '2023-02-28'), ('2023-03-01', '2023-12-31')]
+    with pytest.raises(ValueError):
+        kronos.partition(2, weights=[1, 2])
+
+
+def test_formatted_bounds_are_cached_and_invalidated():
+    kronos = Kronos('2023-03-01 00:00:00', '2023-03-31 00:00:00', timezone='America/New_York', date_format=ISO_FMT)
+    assert kronos.start_date == '2023-03-01 00:00:00' and kronos.start_date is kronos.start_date
+    assert repr(kronos).startswith("Kronos(start_date='2023-03-01 00:00:00', end_date='2023-03-31 23:59:59'")
+
+    kronos.set_start_time(hour=6)
+    kronos.set_end_time(hour=18, minute=30)
+    assert (kronos.start_date, kronos.end_date) == ('2023-03-01 06:00:00', '2023-03-31 18:30:59')
+    kronos.date_format = '%Y%m%d %z'
+    assert kronos.start_date == '20230301 -0500'
+    kronos.change_timezone('UTC')
+    assert (kronos.start_date, kronos.end_date) == ('20230301 +0000', '20230331 +0000')
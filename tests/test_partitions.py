@@ -0,0 +1,96 @@
+import pytest
+from datetime import datetime
+
+import pytz
+
+from src.kronos.kronos import Kronos
+from src.kronos.partitions import balanced_cuts
+
+
+@pytest.mark.parametrize('granularity', ['hour', 'day', 'week', 'month', 'quarter'])
+@pytest.mark.parametrize('timezone', ['UTC', 'America/New_York', 'Asia/Kolkata', 'America/Sao_Paulo'])
+def test_boundaries_match_partition_generators(granularity, timezone):
+    np = pytest.importorskip('numpy')
+    kronos = Kronos('2018-10-29 07:30:00', '2019-02-20 18:00:00', timezone=timezone, date_format='%Y-%m-%d %H:%M:%S')
+    if granularity == 'hour':
+        kronos = Kronos('2018-11-03 07:30:00', '2018-11-05 18:00:00', timezone=timezone, date_format='%Y-%m-%d %H:%M:%S')
+    partitions = list(kronos._iter_partitions(granularity))
+
+    starts, ends = kronos.boundaries(granularity)
+
+    assert starts.dtype == np.int64 and ends.dtype == np.int64
+    assert starts.tolist() == [round(p.start_ts * 10 ** 6) for p in partitions]
+    assert ends.tolist() == [round(p.end_ts * 10 ** 6) for p in partitions]
+
+
+def test_boundaries_as_datetime64():
+    np = pytest.importorskip('numpy')
+    kronos = Kronos('2023-11-04', '2023-11-06', timezone='America/New_York')
+    starts, ends, offsets = kronos.boundaries(as_datetime64=True)
+
+    assert starts.dtype == np.dtype('datetime64[us]')
+    assert offsets.tolist() == [-4 * 3600, -4 * 3600, -5 * 3600]
+    local_starts = starts + offsets.astype('timedelta64[s]')
+    assert [str(d) for d in local_starts.astype('datetime64[D]')] == ['2023-11-04', '2023-11-05', '2023-11-06']
+    assert ends[1] - starts[1] == np.timedelta64(25 * 3600 * 10 ** 6 - 1, 'us')
+
+
+def test_boundaries_searchsorted_bucketing():
+    np = pytest.importorskip('numpy')
+    kronos = Kronos('2023-03-01', '2023-03-31', timezone='UTC')
+    starts, _ = kronos.boundaries('week', week_start='SUN')
+    events = np.array([kronos.start_ts, kronos.start_ts + 5 * 86400], dtype=np.float64) * 10 ** 6
+    assert (np.searchsorted(starts, events.astype(np.int64), side='right') - 1).tolist() == [0, 1]
+
+
+@pytest.mark.parametrize('granularity', ['hour', 'day', 'week', 'month'])
+def test_bucketize_matches_partition_loop(granularity):
+    np = pytest.importorskip('numpy')
+    kronos = Kronos('2023-03-10 06:00:00', '2023-04-02 18:00:00', date_format='%Y-%m-%d %H:%M:%S', timezone='America/New_York')
+    partitions = list(kronos._iter_partitions(granularity))
+    rng = np.random.default_rng(7)
+    events = rng.integers(int(kronos.start_ts) - 86400, int(kronos.end_ts) + 86400, size=500)
+
+    expected = []
+    for event in events.tolist():
+        matches = [i for i, p in enumerate(partitions) if p.start_ts <= event <= p.end_ts]
+        expected.append(matches[0] if matches else -1)
+    assert kronos.bucketize(events, granularity).tolist() == expected
+    assert kronos.bucketize(events * 1000, granularity).tolist() == expected
+
+
+def test_bucketize_inputs():
+    np = pytest.importorskip('numpy')
+    kronos = Kronos('2023-01-01', '2023-01-03', timezone='UTC')
+    events = [datetime(2022, 12, 31, 23, tzinfo=pytz.utc), datetime(2023, 1, 2, 5, tzinfo=pytz.utc), datetime(2023, 1, 4, tzinfo=pytz.utc)]
+
+    assert kronos.bucketize(np.array(events, dtype=object)).tolist() == [-1, 1, -1]
+    assert kronos.bucketize(np.array(['2023-01-01T00:00', '2023-01-03T23:59:59.999999'], dtype='datetime64[us]')).tolist() == [0, 2]
+
+
+def test_bucketize_reads_naive_values_like_contains_mask():
+    np = pytest.importorskip('numpy')
+    kronos = Kronos('2023-01-02', '2023-01-02', timezone='America/New_York')
+    wall = np.array(['2023-01-02T02:00', '2023-01-03T02:00'], dtype='datetime64[m]')
+    naive = [datetime(2023, 1, 2, 2), datetime(2023, 1, 3, 2)]
+
+    for policy, expected in (('localize', [True, False]), ('utc', [False, True])):
+        kronos.naive_policy = policy
+        assert kronos.contains_mask(wall).tolist() == expected
+        assert (kronos.bucketize(wall) == 0).tolist() == expected
+        assert (kronos.bucketize(np.array(naive, dtype=object)) == 0).tolist() == expected
+    kronos.naive_policy = 'raise'
+    with pytest.raises(TypeError):
+        kronos.bucketize(wall)
+
+
+def test_balanced_cuts():
+    assert balanced_cuts([1] * 10, 3) == [3, 7, 10]
+    assert balanced_cuts([1] * 2, 5) == [1, 2]
+    assert balanced_cuts([10, 0, 0, 0, 1], 3) == [1, 2, 5]
+    assert balanced_cuts([0, 0, 0, 0], 2) == [2, 4]
+    assert balanced_cuts([1, 1, 1, 1, 8], 2) == [4, 5]
+    with pytest.raises(ValueError):
+        balanced_cuts([1], 0)
+    with pytest.raises(ValueError):
+        balanced_cuts([-1, 2], 2)
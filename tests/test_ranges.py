@@ -0,0 +1,124 @@
+import pickle
+import random
+import pytest
+from datetime import datetime, timedelta, timezone
+
+import pytz
+
+from src.kronos.kronos import Kronos
+from src.kronos.ranges import DateRange, DateRangeSet
+
+
+def test_kronos_round_trip():
+    kronos = Kronos('2023-03-11', '2023-03-12', timezone='America/New_York')
+    date_range = kronos.to_range()
+
+    assert date_range.tz == 'America/New_York'
+    assert date_range.start == kronos._start_date and date_range.end == kronos._end_date
+    assert date_range.duration_us == 47 * 3600 * 10 ** 6
+
+    restored = Kronos.from_range(date_range, date_format='%Y/%m/%d')
+    assert (restored.start_date, restored.end_date) == ('2023/03/11', '2023/03/12')
+    assert restored.end_ts == kronos.end_ts
+    assert restored.to_range() == date_range
+
+
+def test_immutable_and_slotted():
+    date_range = DateRange(0, 10)
+    with pytest.raises(AttributeError):
+        date_range.start_us = 5
+    with pytest.raises(AttributeError):
+        date_range.other = 5
+    assert not hasattr(date_range, '__dict__')
+    with pytest.raises(ValueError):
+        DateRange(10, 0)
+
+
+def test_hashing_and_ordering():
+    ranges = [DateRange(5, 9, 'UTC'), DateRange(0, 9, 'UTC'), DateRange(0, 4, 'UTC'), DateRange(0, 4, 'America/New_York')]
+    assert sorted(ranges) == [ranges[3], ranges[2], ranges[1], ranges[0]]
+    assert DateRange(0, 4, pytz.utc) == ranges[2]
+    assert DateRange(0, 4, 'UTC') != ranges[3]
+    assert len({r: None for r in ranges + [DateRange(5, 9)]}) == 4
+    assert DateRange(0, 4, pytz.timezone('America/New_York')).tz is ranges[3].tz
+
+
+def test_pickle_and_unnamed_timezones():
+    date_range = DateRange.from_datetimes(datetime(2023, 1, 1, tzinfo=timezone.utc), datetime(2023, 1, 2, tzinfo=timezone.utc))
+    assert date_range.timezone is timezone.utc
+    assert pickle.loads(pickle.dumps(date_range)) == date_range
+    assert Kronos.from_range(date_range).start_date == '2023-01-01'
+    assert list(DateRangeSet([DateRange(0, 5, timezone.utc)]))[0].timezone is timezone.utc
+
+
+def test_fixed_offset_round_trip():
+    fixed = pytz.FixedOffset(60)
+    kronos = Kronos('2023-01-01', '2023-01-02', timezone=fixed)
+    date_range = kronos.to_range()
+    assert date_range.timezone is fixed
+    restored = Kronos.from_range(date_range)
+    assert (restored._start_date, restored._end_date) == (kronos._start_date, kronos._end_date)
+    assert restored._start_date.utcoffset() == timedelta(minutes=60)
+    assert pickle.loads(pickle.dumps(kronos))._end_date == kronos._end_date
+
+
+def _set(*bounds):
+    return DateRangeSet([DateRange(start, end) for start, end in bounds])
+
+
+def _brute(range_set):
+    return {i for r in range_set for i in range(r.start_us, r.end_us + 1)}
+
+
+def test_range_set_coalesces():
+    range_set = _set((10, 19), (0, 4), (5, 7), (15, 30), (40, 40))
+    assert [(r.start_us, r.end_us) for r in range_set] == [(0, 7), (10, 30), (40, 40)]
+    assert len(range_set) == 3 and range_set.duration_us == 30
+    assert not DateRangeSet()
+
+
+def test_range_set_membership_types():
+    range_set = _set((0, 4), (10, 19))
+    assert 3 in range_set and 7 not in range_set
+
+    np = pytest.importorskip('numpy')
+    assert np.int64(12) in range_set and np.uint32(5) not in range_set
+    with pytest.raises(TypeError):
+        assert '3' not in range_set
+
+
+def test_range_set_algebra_matches_python_sets():
+    rnd = random.Random(11)
+    for _ in range(200):
+        sets = []
+        for _ in range(2):
+            bounds = []
+            for _ in range(rnd.randrange(6)):
+                start = rnd.randrange(60)
+                bounds.append((start, start + rnd.randrange(8)))
+            sets.append(_set(*bounds))
+        a, b = sets
+        assert _brute(a | b) == _brute(a) | _brute(b)
+        assert _brute(a & b) == _brute(a) & _brute(b)
+        assert _brute(a - b) == _brute(a) - _brute(b)
+        assert _brute(a.complement(DateRange(10, 50))) == set(range(10, 51)) - _brute(a)
+        for result in (a | b, a & b, a - b):
+            assert result == DateRangeSet(list(result))
+
+        point = rnd.randrange(70)
+        probe = DateRange(point, point + rnd.randrange(5))
+        assert (point in a) == (point in _brute(a))
+        assert (probe in a) == (set(range(probe.start_us, probe.end_us + 1)) <= _brute(a))
+        assert a.overlaps(probe) == bool(set(range(probe.start_us, probe.end_us + 1)) & _brute(a))
+
+
+def test_range_set_with_kronos_days():
+    job = Kronos('2023-01-01', '2023-01-10', timezone='America/New_York')
+    done = DateRangeSet(day.to_range() for day in job.day_range() if day._start_date.day % 3)
+    missing = done.complement(job)
+
+    assert [Kronos.from_range(r).start_date for r in missing] == ['2023-01-03', '2023-01-06', '2023-01-09']
+    assert all(Kronos.from_range(r).end_date == Kronos.from_range(r).start_date for r in missing)
+    assert Kronos('2023-01-04', '2023-01-05', timezone='America/New_York') in done
+    assert Kronos('2023-01-05', '2023-01-06', timezone='America/New_York') not in done
+    assert datetime(2023, 1, 3, 12, tzinfo=timezone.utc) not in done
@@ -0,0 +1,88 @@
+import json
+import pickle
+from datetime import datetime, timezone
+
+import pytest
+import pytz
+
+from src.kronos.kronos import Kronos
+from src.kronos.ranges import DateRange
+from src.kronos.serialization import encode_ranges, decode_ranges, RECORD, _HEADER
+
+
+class TaggedKronos(Kronos):
+    pass
+
+
+def _bounds(kronos):
+    return kronos._start_date, kronos._end_date, kronos.timezone, kronos.date_format
+
+
+def test_pickle_round_trip():
+    kronos = Kronos('2023-11-05 00:00:00', '2023-11-05 01:30:00', timezone='America/New_York', date_format='%Y-%m-%d %H:%M:%S')
+    restored = pickle.loads(pickle.dumps(kronos))
+    assert _bounds(restored) == _bounds(kronos) and restored.end_date == kronos.end_date
+    assert restored._end_date.utcoffset() == kronos._end_date.utcoffset()
+    assert len(pickle.dumps(kronos)) < len(pickle.dumps((kronos._start_date, kronos._end_date, kronos.tz)))
+
+    tagged = TaggedKronos('2023-01-01', '2023-01-31', timezone='UTC')
+    tagged.label = 'january'
+    restored = pickle.loads(pickle.dumps(tagged))
+    assert type(restored) is TaggedKronos and restored.label == 'january' and _bounds(restored) == _bounds(tagged)
+
+    unnamed = Kronos.from_range(DateRange(0, 10 ** 9, timezone.utc))
+    assert pickle.loads(pickle.dumps(unnamed)).tz is timezone.utc
+
+
+def test_round_trip_keeps_changed_timezone():
+    kronos = Kronos('2023-01-01', '2023-01-02', timezone='UTC').change_timezone('America/New_York')
+    assert kronos.start_date == '2023-01-01' and kronos._start_date.utcoffset().total_seconds() == -5 * 3600
+
+    for restored in (pickle.loads(pickle.dumps(kronos)), Kronos.from_dict(kronos.to_dict())):
+        assert _bounds(restored) == _bounds(kronos) and restored.start_date == '2023-01-01'
+        assert restored._start_date.utcoffset() == kronos._start_date.utcoffset()
+
+
+def test_pickle_keeps_bounds_off_their_zone_period():
+    # a tzinfo attached with `replace` (pytz's LMT offset here) does not match the instant's period in the zone
+    tz = pytz.timezone('America/New_York')
+    kronos = Kronos._from_bounds(datetime(2023, 1, 1, tzinfo=tz), datetime(2023, 1, 1, 23, tzinfo=tz), tz, '%Y-%m-%d %z')
+    restored = pickle.loads(pickle.dumps(kronos))
+
+    assert (restored.start_date, restored.end_date) == (kronos.start_date, kronos.end_date) == ('2023-01-01 -0456',) * 2
+    assert restored._start_date.utcoffset() == kronos._start_date.utcoffset()
+
+
+def test_dict_round_trip():
+    kronos = Kronos('01/03/2023', '31/03/2023', timezone='Europe/London', date_format='%d/%m/%Y')
+    data = json.loads(json.dumps(kronos.to_dict()))
+    assert data['timezone'] == 'Europe/London' and data['date_format'] == '%d/%m/%Y'
+    assert _bounds(Kronos.from_dict(data)) == _bounds(kronos)
+    with pytest.raises(ValueError):
+        Kronos.from_range(DateRange(0, 10, timezone.utc)).to_dict()
+
+
+def test_bulk_round_trip():
+    days = list(Kronos('2023-01-01', '2023-12-31', timezone='America/New_York').day_range())
+    hours = list(Kronos('2023-03-26 00', '2023-03-26 23', timezone='Europe/Paris', date_format='%Y-%m-%d %H').hour_range())
+    payload = encode_ranges(days + hours)
+    assert len(payload) < _HEADER.size + 64 + RECORD.size * (len(days) + len(hours))
+
+    decoded = decode_ranges(payload)
+    assert [_bounds(k) for k in decoded] == [_bounds(k) for k in days + hours]
+    assert decode_ranges(payload, as_ranges=True) == [k.to_range() for k in days + hours]
+    assert all(type(k) is TaggedKronos for k in decode_ranges(payload, cls=TaggedKronos))
+
+
+def test_bulk_date_ranges_and_errors():
+    ranges = [DateRange(0, 10, 'UTC'), DateRange(5, 20, 'Asia/Tokyo')]
+    assert decode_ranges(encode_ranges(ranges), as_ranges=True) == ranges
+    assert [k.date_format for k in decode_ranges(encode_ranges(ranges), date_format='%Y')] == ['%Y', '%Y']
+    assert decode_ranges(encode_ranges([])) == []
+
+    with pytest.raises(ValueError):
+        encode_ranges([DateRange(0, 10, timezone.utc)])
+    with pytest.raises(ValueError):
+        decode_ranges(b'not a payload at all')
+    with pytest.raises(ValueError):
+        decode_ranges(encode_ranges(ranges)[:-1])
@@ -0,0 +1,51 @@
+import pytest
+from datetime import datetime
+
+import pytz
+
+from src.kronos.kronos import Kronos
+from src.kronos.timestamps import detect_unit, to_epoch_us_array
+
+np = pytest.importorskip('numpy')
+
+SECONDS = [0, 1678604400, 1699162200, 1702505330, -86400]
+
+
+@pytest.mark.parametrize('unit,scale', [('s', 1), ('ms', 10 ** 3), ('us', 10 ** 6), ('ns', 10 ** 9)])
+def test_unit_detection(unit, scale):
+    timestamps = np.array(SECONDS[1:], dtype=np.int64) * scale
+    assert detect_unit(timestamps) == unit
+    assert to_epoch_us_array(timestamps).tolist() == [s * 10 ** 6 for s in SECONDS[1:]]
+
+
+def test_float_and_explicit_units():
+    assert to_epoch_us_array([1.5, 2.0000005], unit='s').tolist() == [1500000, 2000000]
+    assert to_epoch_us_array(np.array([1500], dtype=np.int32), unit='ms').tolist() == [1500000]
+    with pytest.raises(ValueError):
+        to_epoch_us_array([1], unit='days')
+    with pytest.raises(ValueError):
+        to_epoch_us_array([float('nan')])
+
+
+@pytest.mark.parametrize('tz', ['UTC', 'America/New_York', 'Australia/Lord_Howe', 'Asia/Kolkata'])
+def test_from_timestamps_matches_pytz(tz):
+    zone = pytz.timezone(tz)
+    expected = [datetime.fromtimestamp(s, tz=zone) for s in SECONDS]
+
+    localized = Kronos.from_timestamps(SECONDS, tz=tz, output='datetime')
+    assert localized == expected
+    assert [d.utcoffset() for d in localized] == [e.utcoffset() for e in expected]
+
+    wall = Kronos.from_timestamps(np.array(SECONDS) * 1000, tz=tz)
+    assert wall.dtype == np.dtype('datetime64[us]')
+    assert wall.tolist() == [e.replace(tzinfo=None) for e in expected]
+
+    components = Kronos.from_timestamps(SECONDS, unit='s', tz=tz, output='components')
+    for name in ('year', 'month', 'day', 'hour', 'minute', 'second', 'microsecond'):
+        assert components[name].tolist() == [getattr(e, name) for e in expected]
+    assert components['utc_offset'].tolist() == [e.utcoffset().total_seconds() for e in expected]
+
+
+def test_from_timestamps_rejects_unknown_output():
+    with pytest.raises(ValueError):
+        Kronos.from_timestamps([0], output='pandas')
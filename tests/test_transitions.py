@@ -0,0 +1,53 @@
+import pytz
+import pytest
+from datetime import datetime, timedelta, timezone
+from dateutil.tz import gettz
+
+from src.kronos.transitions import TransitionTable, transition_table, check_policies
+from src.kronos.utilities import to_epoch_us
+
+
+def test_transition_table_is_shared_by_localized_flavors():
+    tz = pytz.timezone('America/New_York')
+    est = tz.localize(datetime(2023, 1, 1)).tzinfo
+    edt = tz.localize(datetime(2023, 7, 1)).tzinfo
+    assert transition_table(est) is transition_table(edt) is transition_table(tz)
+
+
+def test_offsets_match_pytz():
+    tz = pytz.timezone('Europe/Berlin')
+    table = transition_table(tz)
+    instant = pytz.utc.localize(datetime(1990, 1, 1))
+    while instant.year < 2030:
+        assert table.offset_at_utc(to_epoch_us(instant)) == instant.astimezone(tz).utcoffset() // timedelta(microseconds=1)
+        instant += timedelta(days=3, hours=5)
+
+
+def test_wall_to_utc_policies():
+    table = transition_table(pytz.timezone('America/New_York'))
+    hour = 3600 * 10 ** 6
+    ambiguous = to_epoch_us(pytz.utc.localize(datetime(2023, 11, 5, 1, 30)))
+    assert table.wall_to_utc(ambiguous, ambiguous='earliest') == ambiguous + 4 * hour
+    assert table.wall_to_utc(ambiguous, ambiguous='latest') == ambiguous + 5 * hour
+
+    nonexistent = to_epoch_us(pytz.utc.localize(datetime(2023, 3, 12, 2, 30)))
+    assert table.wall_to_utc(nonexistent) == nonexistent + 5 * hour
+    with pytest.raises(pytz.NonExistentTimeError):
+        table.wall_to_utc(nonexistent, nonexistent='raise')
+
+    with pytest.raises(ValueError):
+        check_policies('whichever', 'shift_forward')
+
+
+def test_fixed_offset_and_generic_tzinfo_tables(monkeypatch):
+    fixed = TransitionTable.from_timezone(timezone(timedelta(hours=5, minutes=30)))
+    assert fixed.offsets == [(5 * 3600 + 1800) * 10 ** 6]
+
+    monkeypatch.setattr('src.kronos.transitions._SCAN_START', datetime(2022, 1, 1))
+    monkeypatch.setattr('src.kronos.transitions._SCAN_END', datetime(2024, 1, 1))
+    scanned = transition_table(gettz('America/New_York'))
+    assert len(scanned.utc) == 5
+    ny = transition_table(pytz.timezone('America/New_York'))
+    instant = to_epoch_us(pytz.utc.localize(datetime(2023, 3, 12, 7)))
+    assert scanned.offset_at_utc(instant) == ny.offset_at_utc(instant)
+    assert scanned.offset_at_utc(instant - 1) == ny.offset_at_utc(instant - 1)
@@ -1,6 +1,14 @@
 import pytz
+import pytest
+from datetime import datetime, timedelta
 
-from src.kronos.utilities import make_timezone
+from src.kronos import utilities
+from src.kronos.kronos import Kronos
+from src.kronos.backends import _resolve_timezone
+from src.kronos.utilities import (
+    make_timezone, localize, convert_timezone, convert_timezone_many, register_named_range, _get_named_daterange,
+    _named_range_cache, _NAMED_RANGES
+)
 
 
 def test_make_timezone_with_str():
@@ -16,3 +24,119 @@ def test_make_timezone_with_premade_arg():
 
     assert isinstance(timezone, pytz.BaseTzInfo)
 
+
+
+def test_make_timezone_is_cached():
+    _resolve_timezone.cache_clear()
+    assert make_timezone('America/Chicago') is make_timezone('America/Chicago')
+    assert _resolve_timezone.cache_info().hits == 1
+
+    with pytest.raises(pytz.UnknownTimeZoneError):
+        make_timezone('Not/A_Zone')
+
+
+@pytest.mark.parametrize('zone', ['America/New_York', 'Europe/London', 'Australia/Sydney', 'Asia/Kolkata', 'UTC'])
+def test_localize_matches_pytz(zone):
+    tz = pytz.timezone(zone)
+    naive = datetime(2015, 1, 1, 0, 30)
+    while naive < datetime(2017, 1, 1):
+        expected = tz.normalize(tz.localize(naive))
+        assert localize(naive, tz) == expected
+        assert localize(naive, tz).utcoffset() == expected.utcoffset()
+        naive += timedelta(hours=7, minutes=13)
+
+
+def test_localize_dst_edges():
+    tz = pytz.timezone('America/New_York')
+
+    ambiguous = datetime(2023, 11, 5, 1, 30)
+    assert localize(ambiguous, tz).utcoffset() == timedelta(hours=-5)
+    assert localize(ambiguous, tz, ambiguous='earliest').utcoffset() == timedelta(hours=-4)
+    with pytest.raises(pytz.AmbiguousTimeError):
+        localize(ambiguous, tz, ambiguous='raise')
+
+    shifted = localize(datetime(2023, 3, 12, 2, 30), tz)
+    assert shifted.strftime('%H:%M') == '03:30'
+    assert shifted.utcoffset() == timedelta(hours=-4)
+
+
+def test_convert_timezone():
+    converted = convert_timezone(datetime(2023, 7, 1, 12), in_tz='America/New_York', out_tz='Europe/London')
+    assert converted.strftime('%Y-%m-%d %H:%M %Z') == '2023-07-01 17:00 BST'
+
+
+def test_convert_timezone_many_matches_convert_timezone():
+    start = datetime(2023, 3, 11)
+    values = [start + timedelta(minutes=30 * i) for i in range(24 * 2 * 240)] + [pytz.utc.localize(datetime(2023, 7, 1, 12))]
+    expected = [convert_timezone(v, in_tz='America/New_York', out_tz='Europe/London') for v in values]
+    converted = convert_timezone_many(values, 'America/New_York', 'Europe/London')
+
+    assert converted == expected
+    assert [c.tzname() for c in converted] == [e.tzname() for e in expected]
+
+
+def test_convert_timezone_many_policies():
+    with pytest.raises(pytz.AmbiguousTimeError):
+        convert_timezone_many([datetime(2023, 11, 5, 1, 30)], 'America/New_York', 'UTC', ambiguous='raise')
+    with pytest.raises(pytz.NonExistentTimeError):
+        convert_timezone_many([datetime(2023, 3, 12, 2, 30)], 'America/New_York', 'UTC', nonexistent='raise')
+    with pytest.raises(ValueError):
+        convert_timezone_many([], 'UTC', 'UTC', ambiguous='first')
+
+    earliest, latest = (convert_timezone_many([datetime(2023, 11, 5, 1, 30)], 'America/New_York', 'UTC', ambiguous=a)[0]
+                        for a in ('earliest', 'latest'))
+    assert (earliest.hour, latest.hour) == (5, 6)
+
+
+def test_convert_timezone_many_arrays():
+    np = pytest.importorskip('numpy')
+    wall = np.array(['2023-03-12T01:30', '2023-03-12T03:30', '2023-11-05T01:30'], dtype='datetime64[us]')
+    converted = convert_timezone_many(wall, 'America/New_York', 'UTC', ambiguous='earliest')
+
+    assert converted.dtype == wall.dtype
+    assert converted.astype(str).tolist() == ['2023-03-12T06:30:00.000000', '2023-03-12T07:30:00.000000', '2023-11-05T05:30:00.000000']
+
+    seconds = np.array(['2023-01-01T00:00', 'NaT'], dtype='datetime64[s]')
+    converted = convert_timezone_many(seconds, 'UTC', 'America/New_York')
+    assert converted.dtype == np.dtype('datetime64[us]')
+    assert converted.astype(str).tolist() == ['2022-12-31T19:00:00.000000', 'NaT']
+
+    epochs = np.array([0, 1688212800 * 10 ** 6], dtype=np.int64)
+    assert convert_timezone_many(epochs, 'UTC', 'America/New_York').tolist() == [-5 * 3600 * 10 ** 6, (1688212800 - 4 * 3600) * 10 ** 6]
+
+
+def test_named_range_is_memoized():
+    _named_range_cache.clear()
+    first = _get_named_daterange('LAST_7_DAYS', 'America/New_York')
+    assert len(_named_range_cache) == 1
+    assert _get_named_daterange('LAST_7_DAYS', 'America/New_York') is first
+    assert _get_named_daterange('LAST_7_DAYS', 'UTC') is not first
+    assert _get_named_daterange('NOT_A_RANGE', 'UTC') == (None, None)
+
+
+@pytest.fixture
+def named_ranges(monkeypatch):
+    """ Register named ranges on copies of the registry and its cache, leaving the real ones as they were. """
+    monkeypatch.setattr(utilities, '_NAMED_RANGES', list(_NAMED_RANGES))
+    monkeypatch.setattr(utilities, '_named_range_cache', {})
+    return utilities._NAMED_RANGES
+
+
+def test_register_named_range(named_ranges):
+    def last_n_weeks(match, now):
+        return now - timedelta(weeks=int(match['n'])), now
+
+    register_named_range(r'LAST_(?P<n>\d+)_WEEKS', last_n_weeks)
+    start_dt, end_dt = _get_named_daterange('LAST_2_WEEKS', 'UTC')
+    assert (end_dt.date() - start_dt.date()).days == 14
+    assert (start_dt.hour, end_dt.hour, end_dt.microsecond) == (0, 23, 999999)
+
+    kronos = Kronos(named_range='LAST_3_WEEKS', timezone='UTC')
+    assert len(list(kronos.day_range())) == 22
+
+    # re-registering a pattern replaces its handler (and drops memoized results)
+    register_named_range(r'LAST_(?P<n>\d+)_WEEKS', lambda match, now: (now, now))
+    start_dt, end_dt = _get_named_daterange('LAST_2_WEEKS', 'UTC')
+    assert start_dt.date() == end_dt.date()
+    assert sum(regex.pattern == r'LAST_(?P<n>\d+)_WEEKS' for regex, _ in named_ranges) == 1
+    assert all(regex.pattern != r'LAST_(?P<n>\d+)_WEEKS' for regex, _ in _NAMED_RANGES)